@@ -0,0 +1,111 @@
+"""Compares decoding Deepgram `Results` messages into pydantic models with the lean decoding path.
+
+The receiver loop decodes several interim results per second for every call, so this reports the
+per-message cost and how many concurrent calls a core could decode for.
+
+Usage: python playground/benchmarks/deepgram_result_decoding.py [--messages 20000] [--words 12]
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, List
+
+from pydantic.v1 import BaseModel
+
+from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriptionResult
+
+# roughly how many Results messages Deepgram sends per second of speech with interim results on
+RESULTS_PER_SECOND = 4
+
+
+class PydanticDeepgramTranscriptionResult(BaseModel):
+    """The model-based DeepgramTranscriptionResult that the lean path replaced."""
+
+    class TranscriptionChoice(BaseModel):
+        transcript: str
+        confidence: float
+        words: List[dict]
+
+    is_final: bool
+    speech_final: bool
+    top_choice: TranscriptionChoice
+    start: float
+    duration: float
+
+
+def create_results_message(num_words: int, idx: int) -> str:
+    words = [
+        {
+            "word": f"word{i}",
+            "start": idx + i * 0.3,
+            "end": idx + i * 0.3 + 0.25,
+            "confidence": 0.98,
+            "punctuated_word": f"Word{i}",
+        }
+        for i in range(num_words)
+    ]
+    return json.dumps(
+        {
+            "type": "Results",
+            "channel_index": [0, 1],
+            "duration": 1.02,
+            "start": float(idx),
+            "is_final": idx % 3 == 0,
+            "speech_final": False,
+            "channel": {
+                "alternatives": [
+                    {
+                        "transcript": " ".join(word["word"] for word in words),
+                        "confidence": 0.98,
+                        "words": words,
+                    }
+                ]
+            },
+            "metadata": {"request_id": "a1b2c3", "model_info": {"name": "general-nova"}},
+            "from_finalize": False,
+        }
+    )
+
+
+def decode_with_pydantic(data: dict):
+    result = PydanticDeepgramTranscriptionResult(
+        is_final=data["is_final"],
+        speech_final=data["speech_final"],
+        top_choice=data["channel"]["alternatives"][0],
+        duration=data["duration"],
+        start=data["start"],
+    )
+    return result.top_choice.transcript, result.top_choice.words[-1]["end"]
+
+
+def decode_lean(data: dict):
+    result = DeepgramTranscriptionResult.from_results_message(data)
+    return result.top_choice.transcript, result.top_choice.words[-1]["end"]
+
+
+def run(name: str, decode: Callable[[dict], object], messages: List[str]):
+    start = time.process_time()
+    for message in messages:
+        decode(json.loads(message))
+    elapsed = time.process_time() - start
+    per_message_seconds = elapsed / len(messages)
+    print(
+        f"{name:>8}: {per_message_seconds * 1e6:6.2f} us/message (including json.loads), "
+        f"~{int(1 / (per_message_seconds * RESULTS_PER_SECOND))} concurrent calls per core"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--words", type=int, default=12)
+    args = parser.parse_args()
+
+    messages = [create_results_message(args.words, idx) for idx in range(args.messages)]
+    run("pydantic", decode_with_pydantic, messages)
+    run("lean", decode_lean, messages)
+
+
+if __name__ == "__main__":
+    main()
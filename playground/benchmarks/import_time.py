@@ -0,0 +1,86 @@
+"""Measures how long a cold process takes to import vocode and the modules that telephony workers
+import at startup, each in a fresh interpreter.
+
+Appending the results to a JSON lines file with --output, along with the commit they were measured
+at, tracks the import time of each module over time:
+
+    make benchmark_import_time
+
+Usage: python playground/benchmarks/import_time.py [--repeats 5] [--output import_times.jsonl]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+MODULES = [
+    "vocode",
+    "vocode.streaming.synthesizer.default_factory",
+    "vocode.streaming.transcriber.default_factory",
+    "vocode.streaming.agent.default_factory",
+    "vocode.streaming.streaming_conversation",
+]
+
+IMPORT_TIME_CODE = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+
+def measure_import_seconds(module: str, repeats: int) -> List[float]:
+    # the first import warms the bytecode cache and the OS page cache
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True, capture_output=True)
+    return [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", IMPORT_TIME_CODE.format(module=module)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()[-1]
+        )
+        for _ in range(repeats)
+    ]
+
+
+def get_git_revision() -> str:
+    return subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+    ).stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="a JSON lines file to append the results to")
+    args = parser.parse_args()
+
+    median_seconds: Dict[str, float] = {}
+    for module in args.modules:
+        seconds = measure_import_seconds(module, args.repeats)
+        median_seconds[module] = statistics.median(seconds)
+        print(
+            f"{module:50} median {median_seconds[module] * 1e3:7.1f} ms, "
+            f"min {min(seconds) * 1e3:7.1f} ms"
+        )
+
+    if args.output:
+        with open(args.output, "a") as output_file:
+            record = {
+                "timestamp": time.time(),
+                "revision": get_git_revision(),
+                "python": sys.version.split()[0],
+                "median_seconds": median_seconds,
+            }
+            output_file.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Measures the retrieval latency and recall of the local vector index for knowledge bases of a
+few sizes, with ada-002 sized embeddings, searching every embedding and with IVF lists.
+
+Recall is measured against an exact float64 search over the original embeddings, so it shows what
+float32 storage and the memory-mapped load cost in accuracy. The latency doesn't include the query
+embedding request, which remote and local retrieval both make.
+
+Usage: python playground/benchmarks/local_vector_search.py [--sizes 1000 5000 20000] [--queries 200]
+"""
+
+import argparse
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from vocode.streaming.vector_db.local_index import DEFAULT_IVF_NUM_PROBES, LocalVectorIndex
+
+DIMENSIONS = 1536
+
+
+def create_clustered_embeddings(rng: np.random.Generator, num_embeddings: int) -> np.ndarray:
+    """Real documents cluster by topic, which makes the nearest neighbors harder to tell apart
+    than in uniformly random data."""
+    centers = rng.normal(size=(max(1, num_embeddings // 50), DIMENSIONS))
+    assignments = rng.integers(len(centers), size=num_embeddings)
+    return centers[assignments] + rng.normal(size=(num_embeddings, DIMENSIONS))
+
+
+def run(
+    num_embeddings: int,
+    num_queries: int,
+    top_k: int,
+    rng: np.random.Generator,
+    num_probes: int,
+):
+    embeddings = create_clustered_embeddings(rng, num_embeddings)
+    queries = embeddings[rng.integers(num_embeddings, size=num_queries)] + rng.normal(
+        size=(num_queries, DIMENSIONS)
+    )
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        index = LocalVectorIndex(path)
+        index.add(
+            embeddings,
+            texts=[f"document {idx}" for idx in range(num_embeddings)],
+            ids=[str(idx) for idx in range(num_embeddings)],
+        )
+        index.save()
+        print(
+            f"{num_embeddings} embeddings, ingested in {(time.perf_counter() - start) * 1e3:.1f} ms"
+        )
+        expected_rows = [np.argsort(-(normalized @ query))[:top_k] for query in queries]
+
+        exact_index = LocalVectorIndex.load(path)
+        report("exact", exact_index, queries, expected_rows, top_k, num_probes)
+
+        num_lists = int(np.sqrt(num_embeddings))
+        start = time.perf_counter()
+        index.build_ivf(num_lists)
+        index.save()
+        build_seconds = time.perf_counter() - start
+        ivf_index = LocalVectorIndex.load(path)
+        report(
+            f"ivf {num_probes}/{num_lists} lists, built in {build_seconds:.1f} s",
+            ivf_index,
+            queries,
+            expected_rows,
+            top_k,
+            num_probes,
+        )
+
+
+def report(
+    name: str,
+    index: LocalVectorIndex,
+    queries: np.ndarray,
+    expected_rows: List[np.ndarray],
+    top_k: int,
+    num_probes: int,
+):
+    latencies = []
+    num_found = 0
+    for query, expected in zip(queries, expected_rows):
+        start = time.perf_counter()
+        results = index.search(query, top_k, num_probes=num_probes)
+        latencies.append(time.perf_counter() - start)
+        num_found += len(set(expected) & {row for row, _ in results})
+    latencies_ms = np.array(latencies) * 1e3
+    print(
+        f"  p50 {np.percentile(latencies_ms, 50):6.3f} ms, "
+        f"p99 {np.percentile(latencies_ms, 99):6.3f} ms, "
+        f"recall@{top_k} {num_found / (len(queries) * top_k):.3f} ({name})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--probes", type=int, default=DEFAULT_IVF_NUM_PROBES)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for num_embeddings in args.sizes:
+        run(num_embeddings, args.queries, args.top_k, rng, args.probes)
+
+
+if __name__ == "__main__":
+    main()
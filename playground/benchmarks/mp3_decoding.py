@@ -0,0 +1,83 @@
+"""Compares the per-chunk cost of decoding a streamed MP3 utterance.
+
+The legacy approach re-decodes (and re-resamples) the whole buffer on every chunk, so its per-chunk
+cost grows with the utterance. IncrementalMP3Decoder should stay flat as utterances get longer.
+
+Usage: python playground/benchmarks/mp3_decoding.py [--mp3 path/to/file.mp3]
+"""
+
+import argparse
+import os
+import time
+from typing import Callable, List
+
+from vocode.streaming.utils import convert_wav
+from vocode.streaming.utils.mp3_helper import IncrementalMP3Decoder, decode_mp3
+
+DEFAULT_MP3_PATH = os.path.join(os.path.dirname(__file__), "../../tests/fixtures/audio/sine.mp3")
+OUTPUT_SAMPLE_RATE = 8000
+MP3_CHUNK_SIZE = 1024
+
+
+def legacy_decode(chunks: List[bytes]) -> List[float]:
+    per_chunk_seconds = []
+    current_mp3_buffer = bytearray()
+    current_wav_length = 0
+    for chunk in chunks:
+        start = time.perf_counter()
+        current_mp3_buffer.extend(chunk)
+        converted = convert_wav(
+            decode_mp3(bytes(current_mp3_buffer)), output_sample_rate=OUTPUT_SAMPLE_RATE
+        )
+        current_wav_length = len(converted)
+        per_chunk_seconds.append(time.perf_counter() - start)
+    assert current_wav_length > 0
+    return per_chunk_seconds
+
+
+def streaming_decode(chunks: List[bytes]) -> List[float]:
+    per_chunk_seconds = []
+    decoder = IncrementalMP3Decoder(OUTPUT_SAMPLE_RATE)
+    for chunk in chunks:
+        start = time.perf_counter()
+        decoder.feed(chunk)
+        decoder.decode_available()
+        per_chunk_seconds.append(time.perf_counter() - start)
+    decoder.end()
+    decoder.decode_available()
+    return per_chunk_seconds
+
+
+def report(name: str, decode: Callable[[List[bytes]], List[float]], chunks: List[bytes]):
+    per_chunk_seconds = decode(chunks)
+    quarter = max(len(per_chunk_seconds) // 4, 1)
+    first = sum(per_chunk_seconds[:quarter]) / quarter
+    last = sum(per_chunk_seconds[-quarter:]) / quarter
+    print(
+        f"{name:>10}: {len(chunks):5d} chunks, total {sum(per_chunk_seconds) * 1000:9.2f}ms, "
+        f"per chunk first quarter {first * 1e6:9.1f}us, last quarter {last * 1e6:9.1f}us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mp3", default=DEFAULT_MP3_PATH)
+    parser.add_argument("--repeats", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    with open(args.mp3, "rb") as f:
+        mp3_bytes = f.read()
+
+    for repeat in args.repeats:
+        # MP3 frames are self-delimiting, so repeating a file gives a longer valid stream
+        utterance = mp3_bytes * repeat
+        chunks = [
+            utterance[i : i + MP3_CHUNK_SIZE] for i in range(0, len(utterance), MP3_CHUNK_SIZE)
+        ]
+        print(f"utterance of {len(utterance)} mp3 bytes")
+        report("legacy", legacy_decode, chunks)
+        report("streaming", streaming_decode, chunks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Compares scanning every phrase of every phrase-triggered action with the precompiled
+PhraseMatcher, along with the goodbye and backchannel checks.
+
+The agent checks the responses of every turn against the phrase triggers and every response
+fragment against the goodbye phrases, and the transcriptions worker checks short utterances against
+the backchannel patterns while the bot is speaking.
+
+Usage: python playground/benchmarks/phrase_matching.py [--actions 300] [--phrases 3] [--messages 2000]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, List
+
+from vocode.streaming.agent.goodbye import create_goodbye_matcher, is_goodbye_simple
+from vocode.streaming.agent.phrase_trigger import (
+    create_phrase_trigger_matcher,
+    matches_phrase_trigger,
+)
+from vocode.streaming.models.actions import (
+    ActionConfig,
+    PhraseBasedActionTrigger,
+    PhraseBasedActionTriggerConfig,
+    PhraseTrigger,
+)
+from vocode.streaming.streaming_conversation import BACKCHANNEL_MATCHER, BACKCHANNEL_PATTERNS
+
+VOCABULARY = (
+    "the a to please call transfer order cancel book schedule appointment refund account "
+    "payment manager billing support agent human representative tomorrow today number"
+).split()
+GOODBYE_PHRASES = ["bye", "goodbye", "talk to you later", "have a great day", "take care"]
+
+
+class BenchmarkActionConfig(ActionConfig, type="benchmark_phrase_trigger"):
+    name: str
+
+
+def create_action_configs(num_actions: int, num_phrases: int, rng: random.Random):
+    return [
+        BenchmarkActionConfig(
+            name=f"action_{idx}",
+            action_trigger=PhraseBasedActionTrigger(
+                config=PhraseBasedActionTriggerConfig(
+                    phrase_triggers=[
+                        PhraseTrigger(
+                            phrase=" ".join(rng.choices(VOCABULARY, k=3)) + f" {idx}",
+                            conditions=["phrase_condition_type_contains"],
+                        )
+                        for _ in range(num_phrases)
+                    ]
+                )
+            ),
+        )
+        for idx in range(num_actions)
+    ]
+
+
+def scan_phrase_triggers(message: str, action_configs: List[ActionConfig]):
+    """The per-phrase scan that PhraseMatcher replaced."""
+    cleaned = re.sub(r"[^\w\s]", "", message.lower())
+    for action_config in action_configs:
+        assert isinstance(action_config.action_trigger, PhraseBasedActionTrigger)
+        for phrase_trigger in action_config.action_trigger.config.phrase_triggers:
+            lowered = phrase_trigger.phrase.lower()
+            for condition in phrase_trigger.conditions:
+                if condition == "phrase_condition_type_contains" and lowered in cleaned:
+                    return action_config
+    return None
+
+
+def scan_goodbye(message: str):
+    cleaned = re.sub(r"[^\w\s]", "", message.lower())
+    return any(phrase in cleaned for phrase in GOODBYE_PHRASES)
+
+
+def scan_backchannel(message: str):
+    cleaned = re.sub("[^\\w\\s]", "", message).strip().lower()
+    return any(re.fullmatch(regex, cleaned) for regex in BACKCHANNEL_PATTERNS)
+
+
+def run(name: str, check: Callable[[str], object], messages: List[str]) -> list:
+    start = time.process_time()
+    results = [check(message) for message in messages]
+    elapsed = time.process_time() - start
+    print(f"{name:>24}: {elapsed / len(messages) * 1e6:8.2f} us/message")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--actions", type=int, default=300)
+    parser.add_argument("--phrases", type=int, default=3)
+    parser.add_argument("--messages", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    action_configs = create_action_configs(args.actions, args.phrases, rng)
+    messages = [
+        " ".join(rng.choices(VOCABULARY, k=rng.randint(8, 30))).capitalize() + "."
+        for _ in range(args.messages)
+    ]
+    # a few responses say a trigger phrase, so some checks return early
+    for idx in range(0, len(messages), 10):
+        phrase_trigger = rng.choice(action_configs).action_trigger.config.phrase_triggers[0]
+        messages[idx] = f"{messages[idx]} {phrase_trigger.phrase}."
+    backchannels = [
+        rng.choice(["Mm-hmm.", "Yeah.", "Right.", "I see!", "Oh dear", "Makes sense", "Hold on"])
+        for _ in range(args.messages)
+    ]
+
+    start = time.process_time()
+    phrase_trigger_matcher = create_phrase_trigger_matcher(action_configs)
+    print(
+        f"built the matcher for {args.actions * args.phrases} phrases in "
+        f"{(time.process_time() - start) * 1e3:.2f} ms"
+    )
+    scanned = run(
+        "phrase triggers scan", lambda m: scan_phrase_triggers(m, action_configs), messages
+    )
+    matched = run(
+        "phrase triggers matcher",
+        lambda m: matches_phrase_trigger(
+            m, action_configs, phrase_trigger_matcher=phrase_trigger_matcher
+        ),
+        messages,
+    )
+    assert all(a is b for a, b in zip(scanned, matched))
+
+    goodbye_matcher = create_goodbye_matcher(GOODBYE_PHRASES)
+    scanned = run("goodbye scan", scan_goodbye, messages)
+    matched = run(
+        "goodbye matcher",
+        lambda m: is_goodbye_simple(m, GOODBYE_PHRASES, goodbye_matcher=goodbye_matcher),
+        messages,
+    )
+    assert scanned == matched
+
+    scanned = run("backchannel scan", scan_backchannel, backchannels)
+    matched = run(
+        "backchannel matcher",
+        lambda m: BACKCHANNEL_MATCHER.matches(re.sub(r"[^\w\s]", "", m).strip().lower()),
+        backchannels,
+    )
+    assert scanned == matched
+
+
+if __name__ == "__main__":
+    main()
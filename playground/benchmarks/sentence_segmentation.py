@@ -0,0 +1,129 @@
+"""Compares the per-token cost of splitting streamed LLM responses into sentences with the
+incremental SentenceSegmenter and with the previous collate_response_async loop, which rescanned
+the whole buffer on every token.
+
+Responses are 10k tokens of prose, of numbered lists whose items don't end in periods, and of a
+single run-on sentence, which is where rescanning the buffer costs the most.
+
+Usage: python playground/benchmarks/sentence_segmentation.py [--tokens 10000] [--repeats 3]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, Dict, Iterator, List
+
+from vocode.streaming.agent.streaming_utils import (
+    SENTENCE_ENDINGS_EXCEPT_PERIOD_PATTERN,
+    SHORT_SENTENCE_CUTOFF,
+    TOKENS_TO_GENERATE_PAST_PERIOD,
+    SentenceSegmenter,
+    split_sentences,
+)
+
+WORDS = "the a your account order will be we can you to of and it is for this that with".split()
+
+
+def create_prose(rng: random.Random, num_tokens: int) -> List[str]:
+    tokens = []
+    while len(tokens) < num_tokens:
+        tokens.append(" " + rng.choice(WORDS).capitalize())
+        tokens.extend(" " + rng.choice(WORDS) for _ in range(rng.randint(5, 25)))
+        if rng.random() < 0.3:
+            tokens.extend([",", " costing", " $", "3", ".", "20"])
+        tokens.append(rng.choice([".", ".", "?", "!"]))
+    return tokens[:num_tokens]
+
+
+def create_numbered_list(rng: random.Random, num_tokens: int) -> List[str]:
+    tokens = ["Here", " are", " the", " options", ":\n"]
+    item = 1
+    while len(tokens) < num_tokens:
+        tokens.extend([str(item), "."])
+        tokens.extend(" " + rng.choice(WORDS) for _ in range(rng.randint(3, 8)))
+        tokens.append(",")
+        item += 1
+    return tokens[:num_tokens]
+
+
+def create_run_on_sentence(rng: random.Random, num_tokens: int) -> List[str]:
+    return [" " + rng.choice(WORDS) for _ in range(num_tokens)]
+
+
+def previous_collate(tokens: List[str]) -> Iterator[str]:
+    """The string handling of collate_response_async before SentenceSegmenter."""
+    buffer = ""
+    is_post_period = False
+    tokens_since_period = 0
+    for token in tokens:
+        buffer += token
+        if len(buffer.strip().split()) < SHORT_SENTENCE_CUTOFF:
+            continue
+        if re.search(SENTENCE_ENDINGS_EXCEPT_PERIOD_PATTERN, token):
+            matches = [
+                match for match in re.finditer(SENTENCE_ENDINGS_EXCEPT_PERIOD_PATTERN, buffer)
+            ]
+            split_point = matches[-1].start() + 1
+            to_keep, to_return = buffer[split_point:], buffer[:split_point]
+            if to_return.strip():
+                yield to_return.strip()
+            buffer = to_keep
+        elif "." in token:
+            is_post_period = True
+            tokens_since_period = 0
+        if is_post_period and tokens_since_period > TOKENS_TO_GENERATE_PAST_PERIOD:
+            sentences = split_sentences(buffer)
+            if len(sentences) > 1:
+                yield " ".join(sentences[:-1])
+                buffer = sentences[-1]
+            is_post_period = False
+            tokens_since_period = 0
+        else:
+            tokens_since_period += 1
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def segment(tokens: List[str]) -> Iterator[str]:
+    segmenter = SentenceSegmenter()
+    for token in tokens:
+        yield from segmenter.add(token)
+    rest = segmenter.flush()
+    if rest:
+        yield rest
+
+
+def measure(collate: Callable[[List[str]], Iterator[str]], tokens: List[str], repeats: int):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        num_sentences = sum(1 for _ in collate(tokens))
+        best = min(best, time.perf_counter() - start)
+    return best, num_sentences
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    responses: Dict[str, List[str]] = {
+        "prose": create_prose(rng, args.tokens),
+        "numbered list": create_numbered_list(rng, args.tokens),
+        "run-on sentence": create_run_on_sentence(rng, args.tokens),
+    }
+    for name, tokens in responses.items():
+        print(f"{name}, {len(tokens)} tokens")
+        for collate_name, collate in [("previous", previous_collate), ("segmenter", segment)]:
+            seconds, num_sentences = measure(collate, tokens, args.repeats)
+            print(
+                f"  {collate_name:10} {seconds * 1e3:8.1f} ms, "
+                f"{seconds / len(tokens) * 1e6:6.2f} us/token, {num_sentences} sentences"
+            )
+
+
+if __name__ == "__main__":
+    main()
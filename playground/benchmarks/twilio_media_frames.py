@@ -0,0 +1,114 @@
+"""Measures the per-frame CPU cost of handling inbound Twilio media frames.
+
+Twilio sends a 20ms media frame 50 times a second per call. This simulates one second of audio for
+each of --calls concurrent calls and compares the legacy path (json.loads + base64.b64decode per
+frame, handed straight to the transcriber) with the fast path (parse_inbound_media_payload +
+TwilioInboundAudioBuffer coalescing). Every chunk handed to a transcriber costs a queue put and a
+send downstream, so fewer chunks is the other half of the saving.
+
+Usage: python playground/benchmarks/twilio_media_frames.py [--calls 1000] [--frames-per-chunk 5]
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+from typing import Callable, List, Tuple
+
+from vocode.streaming.telephony.constants import DEFAULT_TWILIO_INBOUND_FRAMES_PER_CHUNK
+from vocode.streaming.telephony.twilio_media_stream import (
+    TwilioInboundAudioBuffer,
+    parse_inbound_media_payload,
+)
+
+FRAMES_PER_SECOND = 50
+FRAME_SIZE = 160  # 20ms of 8kHz mulaw
+
+
+def create_media_messages(num_frames: int) -> List[str]:
+    return [
+        json.dumps(
+            {
+                "event": "media",
+                "sequenceNumber": str(i + 2),
+                "media": {
+                    "track": "inbound",
+                    "chunk": str(i + 1),
+                    "timestamp": str(i * 20),
+                    "payload": base64.b64encode(os.urandom(FRAME_SIZE)).decode("utf-8"),
+                },
+                "streamSid": "MZ18ad3ab5a668481ce02b83e7395059f0",
+            },
+            separators=(",", ":"),
+        )
+        for i in range(num_frames)
+    ]
+
+
+def legacy_handler(
+    num_calls: int, frames_per_chunk: int
+) -> Tuple[Callable[[int, str], None], List[bytes]]:
+    chunks: List[bytes] = []
+
+    def handle(call_idx: int, message: str):
+        data = json.loads(message)
+        if data["event"] == "media":
+            chunks.append(base64.b64decode(data["media"]["payload"]))
+
+    return handle, chunks
+
+
+def fast_path_handler(
+    num_calls: int, frames_per_chunk: int
+) -> Tuple[Callable[[int, str], None], List[bytes]]:
+    chunks: List[bytes] = []
+    inbound_audio_buffers = [TwilioInboundAudioBuffer(frames_per_chunk) for _ in range(num_calls)]
+
+    def handle(call_idx: int, message: str):
+        frame = parse_inbound_media_payload(message)
+        assert frame is not None
+        chunk = inbound_audio_buffers[call_idx].add_frame(frame)
+        if chunk is not None:
+            chunks.append(chunk)
+
+    return handle, chunks
+
+
+def run(
+    name: str,
+    create_handler: Callable[[int, int], Tuple[Callable[[int, str], None], List[bytes]]],
+    messages: List[str],
+    num_calls: int,
+    frames_per_chunk: int,
+):
+    handle, chunks = create_handler(num_calls, frames_per_chunk)
+    start = time.process_time()
+    # interleave the calls, the way frames arrive on a busy server
+    for message in messages:
+        for call_idx in range(num_calls):
+            handle(call_idx, message)
+    elapsed = time.process_time() - start
+    num_frames = len(messages) * num_calls
+    print(
+        f"{name:>10}: {elapsed / num_frames * 1e6:6.2f} us/frame, "
+        f"{elapsed * 100:5.1f}% of a core for {num_calls} calls, "
+        f"{len(chunks)} chunks handed to the transcribers per second"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument(
+        "--frames-per-chunk", type=int, default=DEFAULT_TWILIO_INBOUND_FRAMES_PER_CHUNK
+    )
+    args = parser.parse_args()
+
+    messages = create_media_messages(FRAMES_PER_SECOND)
+    run("legacy", legacy_handler, messages, args.calls, args.frames_per_chunk)
+    run("fast path", fast_path_handler, messages, args.calls, args.frames_per_chunk)
+
+
+if __name__ == "__main__":
+    main()
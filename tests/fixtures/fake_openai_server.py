@@ -0,0 +1,149 @@
+import asyncio
+import json
+from collections import deque
+from typing import Deque, List, Optional, Set
+
+
+class FakeOpenAIServer:
+    """A local HTTP/1.1 server for the chat completions API that answers every request with the
+    same text, streamed a word at a time if the request asks for a stream.
+
+    Connections are kept alive between requests, like the real API's, and the server counts them,
+    so tests can check whether clients reuse connections. Each request waits for the next delay in
+    `response_delays` (or `default_response_delay`) before responding.
+    """
+
+    def __init__(
+        self,
+        response_text: str = "Hello there. How can I help you today?",
+        default_response_delay: float = 0.0,
+    ):
+        self.response_text = response_text
+        self.default_response_delay = default_response_delay
+        self.response_delays: Deque[float] = deque()
+        self.num_connections = 0
+        self.request_bodies: List[dict] = []
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.connection_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def base_url(self) -> str:
+        assert self.server is not None, "the server hasn't started"
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_connection, "127.0.0.1", 0)
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            # including connections still waiting to respond to requests that were cancelled
+            for task in self.connection_tasks:
+                task.cancel()
+            await asyncio.gather(*self.connection_tasks, return_exceptions=True)
+            await self.server.wait_closed()
+
+    async def __aenter__(self) -> "FakeOpenAIServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.num_connections += 1
+        task = asyncio.current_task()
+        assert task is not None
+        self.connection_tasks.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method = request_line.split()[0].decode()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                if method != "POST":
+                    writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                    await writer.drain()
+                    continue
+                request_body = json.loads(body)
+                self.request_bodies.append(request_body)
+                delay = (
+                    self.response_delays.popleft()
+                    if self.response_delays
+                    else self.default_response_delay
+                )
+                await asyncio.sleep(delay)
+                await self._respond(writer, request_body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            self.connection_tasks.discard(task)
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, request_body: dict):
+        model = request_body.get("model", "gpt-4o")
+        if not request_body.get("stream"):
+            response = json.dumps(
+                {
+                    "id": "chatcmpl-test",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": self.response_text},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                }
+            ).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(response)}\r\n\r\n".encode()
+                + response
+            )
+            await writer.drain()
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        tokens = [
+            word if idx == 0 else f" {word}"
+            for idx, word in enumerate(self.response_text.split(" "))
+        ]
+        # like the real API, the last chunk only has the finish reason
+        deltas = (
+            [{"role": "assistant", "content": ""}] + [{"content": token} for token in tokens] + [{}]
+        )
+        for idx, delta in enumerate(deltas):
+            chunk = {
+                "id": "chatcmpl-test",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": delta,
+                        "finish_reason": "stop" if idx == len(deltas) - 1 else None,
+                    }
+                ],
+            }
+            self._write_chunk(writer, f"data: {json.dumps(chunk)}\n\n".encode())
+            await writer.drain()
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        self._write_chunk(writer, b"")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, data: bytes):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
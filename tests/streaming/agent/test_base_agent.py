@@ -147,6 +147,134 @@ async def test_generate_responses(mocker: MockerFixture):
     assert messages == [BaseMessage(text="Hi, how are you doing today?"), EndOfTurn()]
 
 
+def _mock_generate_response_to_transcript(
+    mocker: MockerFixture, agent: BaseAgent, responses_started: asyncio.Event
+) -> List[str]:
+    """Responds with what the human said according to the agent's transcript, and returns the
+    human inputs it generated responses for."""
+    human_inputs: List[str] = []
+
+    async def mock_generate_response(human_input: str, *args, **kwargs):
+        assert agent.transcript is not None
+        human_inputs.append(human_input)
+        last_message = agent.transcript.event_logs[-1]
+        yield GeneratedResponse(
+            message=BaseMessage(text=f"You said: {last_message.text}"), is_interruptible=True
+        )
+        responses_started.set()
+        await asyncio.sleep(0.01)
+        yield GeneratedResponse(message=BaseMessage(text="Anything else?"), is_interruptible=True)
+
+    mocker.patch.object(agent, "generate_response", mock_generate_response)
+    return human_inputs
+
+
+@pytest.mark.asyncio
+async def test_speculative_generation_is_committed_on_matching_final_transcript(
+    mocker: MockerFixture,
+):
+    agent = _create_agent(mocker, ChatGPTAgentConfig(prompt_preamble="Have a conversation"))
+    responses_started = asyncio.Event()
+    human_inputs = _mock_generate_response_to_transcript(mocker, agent, responses_started)
+    agent_consumer = QueueConsumer()
+    agent.agent_responses_consumer = agent_consumer
+    agent.start()
+
+    agent.speculate(
+        Transcription(message="what time is it", confidence=1.0, is_final=False),
+        conversation_id="conversation_id",
+    )
+    await responses_started.wait()
+    # the speculative generation saw the human message, the transcript doesn't have it yet
+    assert agent.transcript is not None
+    assert agent.transcript.event_logs == []
+
+    _send_transcription(
+        agent, Transcription(message="What time is it?", confidence=1.0, is_final=True)
+    )
+    agent_responses = await _consume_until_end_of_turn(agent_consumer)
+    await agent.terminate()
+
+    assert [response.message for response in agent_responses] == [
+        BaseMessage(text="You said: what time is it"),
+        BaseMessage(text="Anything else?"),
+        EndOfTurn(),
+    ]
+    assert human_inputs == ["what time is it"]
+    assert [event_log.text for event_log in agent.transcript.event_logs] == ["What time is it?"]
+    stats = agent.speculative_generation_stats
+    assert (stats.num_speculations, stats.num_hits, stats.num_misses) == (1, 1, 0)
+    assert stats.hit_rate == 1.0
+    assert stats.num_wasted_tokens == 0
+
+
+@pytest.mark.asyncio
+async def test_unused_speculative_generation_is_wasted_not_a_hit(mocker: MockerFixture):
+    agent = _create_agent(mocker, ChatGPTAgentConfig(prompt_preamble="Have a conversation"))
+    responses_started = asyncio.Event()
+    _mock_generate_response_to_transcript(mocker, agent, responses_started)
+    agent.agent_responses_consumer = QueueConsumer()
+    agent.start()
+
+    agent.speculate(
+        Transcription(message="what time is it", confidence=1.0, is_final=False),
+        conversation_id="conversation_id",
+    )
+    await responses_started.wait()
+    # e.g. the agent was muted after the speculation started
+    agent.is_muted = True
+    _send_transcription(
+        agent, Transcription(message="What time is it?", confidence=1.0, is_final=True)
+    )
+    await asyncio.sleep(0.05)
+    await agent.terminate()
+
+    stats = agent.speculative_generation_stats
+    assert (stats.num_speculations, stats.num_hits, stats.num_misses) == (1, 0, 0)
+    assert stats.num_wasted_responses == 1
+    assert stats.num_wasted_tokens > 0
+
+
+@pytest.mark.asyncio
+async def test_speculative_generation_is_discarded_on_different_final_transcript(
+    mocker: MockerFixture,
+):
+    agent = _create_agent(mocker, ChatGPTAgentConfig(prompt_preamble="Have a conversation"))
+    responses_started = asyncio.Event()
+    human_inputs = _mock_generate_response_to_transcript(mocker, agent, responses_started)
+    agent_consumer = QueueConsumer()
+    agent.agent_responses_consumer = agent_consumer
+    agent.start()
+
+    agent.speculate(
+        Transcription(message="what time", confidence=1.0, is_final=False),
+        conversation_id="conversation_id",
+    )
+    # the same interim transcript doesn't restart the generation
+    agent.speculate(
+        Transcription(message="What time", confidence=1.0, is_final=False),
+        conversation_id="conversation_id",
+    )
+    await responses_started.wait()
+    _send_transcription(
+        agent, Transcription(message="what time is it", confidence=1.0, is_final=True)
+    )
+    agent_responses = await _consume_until_end_of_turn(agent_consumer)
+    await agent.terminate()
+
+    assert [response.message for response in agent_responses] == [
+        BaseMessage(text="You said: what time is it"),
+        BaseMessage(text="Anything else?"),
+        EndOfTurn(),
+    ]
+    assert human_inputs == ["what time", "what time is it"]
+    stats = agent.speculative_generation_stats
+    assert (stats.num_speculations, stats.num_hits, stats.num_misses) == (1, 0, 1)
+    assert stats.hit_rate == 0.0
+    assert stats.num_wasted_responses == 1
+    assert stats.num_wasted_tokens > 0
+
+
 @pytest.mark.asyncio
 async def test_function_call(mocker: MockerFixture):
     # TODO: assert that when we return a function call with a user message, it sends out a message alongside
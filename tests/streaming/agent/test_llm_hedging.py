@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from tests.fixtures.fake_openai_server import FakeOpenAIServer
+from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
+from vocode.streaming.agent.llm_hedging import (
+    MIN_FIRST_TOKEN_LATENCY_SAMPLES,
+    FirstTokenLatencies,
+    LLMHedger,
+)
+from vocode.streaming.agent.openai_utils import openai_get_tokens
+from vocode.streaming.models.agent import ChatGPTAgentConfig, LLMHedge
+from vocode.streaming.utils.llm_client_pool import LLMClientPool
+from vocode.streaming.utils.singleton import Singleton
+
+CHAT_PARAMETERS = {
+    "model": "gpt-4o",
+    "messages": [{"role": "user", "content": "Hi"}],
+    "stream": True,
+}
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def cleanup_singletons():
+    for cls in (FirstTokenLatencies, LLMClientPool):
+        Singleton._instances.pop(cls, None)
+    yield
+    # the losing requests are cancelled in the background
+    await LLMClientPool().close()
+    for cls in (FirstTokenLatencies, LLMClientPool):
+        Singleton._instances.pop(cls, None)
+
+
+def _create_agent(server: FakeOpenAIServer, llm_hedge: LLMHedge) -> ChatGPTAgent:
+    return ChatGPTAgent(
+        ChatGPTAgentConfig(
+            prompt_preamble="",
+            openai_api_key="key",
+            base_url_override=server.base_url,
+            llm_hedge=llm_hedge,
+        )
+    )
+
+
+async def _get_response(agent: ChatGPTAgent) -> tuple:
+    chunks = []
+    tokens = []
+    stream = await agent._create_openai_stream(dict(CHAT_PARAMETERS))
+
+    async def record_chunks():
+        async for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+
+    async for token in openai_get_tokens(record_chunks()):
+        tokens.append(token)
+    return "".join(tokens), {chunk.model for chunk in chunks}
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_model_isnt_hedged():
+    async with FakeOpenAIServer() as server:
+        agent = _create_agent(
+            server,
+            LLMHedge(provider="openai", model_name="gpt-4o-mini", first_token_deadline_seconds=1),
+        )
+        text, models = await _get_response(agent)
+
+        assert text == server.response_text
+        assert models == {"gpt-4o"}
+        assert len(server.request_bodies) == 1
+        assert agent.llm_hedger is not None
+        assert agent.llm_hedger.stats.num_hedged == 0
+        assert FirstTokenLatencies().latencies_by_model["gpt-4o"]
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_model_is_hedged_and_backup_wins():
+    async with FakeOpenAIServer() as server:
+        server.response_delays.extend([2.0, 0.0])
+        agent = _create_agent(
+            server,
+            LLMHedge(provider="openai", model_name="gpt-4o-mini", first_token_deadline_seconds=0.1),
+        )
+        for _ in range(MIN_FIRST_TOKEN_LATENCY_SAMPLES):
+            FirstTokenLatencies().record("gpt-4o", 3.0)
+
+        start_time = asyncio.get_running_loop().time()
+        text, models = await _get_response(agent)
+
+        assert asyncio.get_running_loop().time() - start_time < 1.0
+        assert text == server.response_text
+        assert models == {"gpt-4o-mini"}
+        assert [body["model"] for body in server.request_bodies] == ["gpt-4o", "gpt-4o-mini"]
+        assert agent.llm_hedger is not None
+        stats = agent.llm_hedger.stats
+        assert stats.num_hedged == stats.num_backup_wins == 1
+        assert stats.hedge_rate == 1.0
+        assert 2.0 < stats.latency_won_seconds < 3.0
+
+
+@pytest.mark.asyncio
+async def test_primary_model_wins_if_it_streams_first_after_hedging():
+    async with FakeOpenAIServer() as server:
+        server.response_delays.extend([0.3, 2.0])
+        agent = _create_agent(
+            server,
+            LLMHedge(provider="openai", model_name="gpt-4o-mini", first_token_deadline_seconds=0.1),
+        )
+        text, models = await _get_response(agent)
+
+        assert text == server.response_text
+        assert models == {"gpt-4o"}
+        assert agent.llm_hedger is not None
+        assert agent.llm_hedger.stats.num_hedged == 1
+        assert agent.llm_hedger.stats.num_backup_wins == 0
+
+
+def test_adaptive_deadline():
+    hedger = LLMHedger(
+        LLMHedge(
+            provider="openai",
+            model_name="gpt-4o-mini",
+            first_token_deadline_seconds=0.5,
+            adaptive_percentile=0.95,
+        )
+    )
+    for idx in range(MIN_FIRST_TOKEN_LATENCY_SAMPLES - 1):
+        FirstTokenLatencies().record("gpt-4o", 1.0 + idx / 100)
+    # too few samples
+    assert hedger.get_deadline("gpt-4o") == 0.5
+
+    FirstTokenLatencies().record("gpt-4o", 2.0)
+    assert hedger.get_deadline("gpt-4o") == pytest.approx(1.18)
+
+    # never earlier than the configured deadline
+    for _ in range(MIN_FIRST_TOKEN_LATENCY_SAMPLES):
+        FirstTokenLatencies().record("gpt-4", 0.1)
+    assert hedger.get_deadline("gpt-4") == 0.5
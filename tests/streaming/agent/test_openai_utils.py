@@ -1,4 +1,13 @@
-from vocode.streaming.agent.openai_utils import format_openai_chat_messages_from_transcript
+import random
+from typing import List, Optional
+
+from vocode.streaming.agent import openai_utils
+from vocode.streaming.agent.openai_utils import (
+    format_openai_chat_messages_from_transcript,
+    get_openai_chat_messages_from_transcript,
+    merge_event_logs,
+)
+from vocode.streaming.agent.token_utils import get_chat_gpt_max_tokens, num_tokens_from_messages
 from vocode.streaming.models.actions import (
     ACTION_FINISHED_FORMAT_STRING,
     ActionConfig,
@@ -7,8 +16,15 @@ from vocode.streaming.models.actions import (
     PhraseBasedActionTrigger,
     PhraseBasedActionTriggerConfig,
 )
+from vocode.streaming.models.agent import LLM_AGENT_DEFAULT_MAX_TOKENS
 from vocode.streaming.models.events import Sender
-from vocode.streaming.models.transcript import ActionFinish, ActionStart, Message, Transcript
+from vocode.streaming.models.transcript import (
+    ActionFinish,
+    ActionStart,
+    EventLog,
+    Message,
+    Transcript,
+)
 
 
 class WeatherActionConfig(ActionConfig, type="weather"):
@@ -301,3 +317,111 @@ def test_format_openai_chat_messages_from_transcript_context_limit():
 
     for params, expected_output in test_cases:
         assert format_openai_chat_messages_from_transcript(*params) == expected_output
+
+
+def test_format_openai_chat_messages_from_transcript_memoizes_token_counts(mocker):
+    transcript = Transcript(
+        event_logs=[
+            Message(sender=Sender.BOT, text="Hello!", is_final=True),
+            Message(sender=Sender.BOT, text="How are you doing today?", is_final=True),
+            Message(sender=Sender.HUMAN, text="I'm doing well, thanks!"),
+        ]
+    )
+    num_tokens_from_message_spy = mocker.spy(openai_utils, "num_tokens_from_message")
+
+    format_openai_chat_messages_from_transcript(
+        transcript, "gpt-3.5-turbo-0613", None, "prompt preamble"
+    )
+    # the system message and the two (merged) transcript messages
+    assert num_tokens_from_message_spy.call_count == 3
+
+    transcript.event_logs.append(Message(sender=Sender.BOT, text="Glad to hear it!"))
+    num_tokens_from_message_spy.reset_mock()
+    format_openai_chat_messages_from_transcript(
+        transcript, "gpt-3.5-turbo-0613", None, "prompt preamble"
+    )
+    # only the system message and the new bot message are tokenized
+    assert num_tokens_from_message_spy.call_count == 2
+
+    transcript.event_logs[-1].text = "Glad"
+    num_tokens_from_message_spy.reset_mock()
+    assert format_openai_chat_messages_from_transcript(
+        transcript, "gpt-3.5-turbo-0613", None, "prompt preamble"
+    )[-1] == {"role": "assistant", "content": "Glad-"}
+    assert num_tokens_from_message_spy.call_count == 2
+
+
+def test_format_openai_chat_messages_from_transcript_context_size_matches_full_count():
+    event_logs: List[EventLog] = []
+    for i in range(200):
+        event_logs.append(Message(sender=Sender.HUMAN, text=f"question number {i} " * 10))
+        event_logs.append(
+            Message(sender=Sender.BOT, text=f"answer number {i} " * 10, is_final=True)
+        )
+    transcript = Transcript(event_logs=event_logs)
+
+    chat_messages = format_openai_chat_messages_from_transcript(
+        transcript, "gpt-3.5-turbo-0613", None, "prompt preamble"
+    )
+
+    max_context_size = (
+        get_chat_gpt_max_tokens("gpt-3.5-turbo-0613") - LLM_AGENT_DEFAULT_MAX_TOKENS - 50
+    )
+    assert 1 < len(chat_messages) < len(event_logs) + 1
+    assert chat_messages[0] == {"role": "system", "content": "prompt preamble"}
+    assert chat_messages[-1] == {"role": "assistant", "content": "answer number 199 " * 10}
+    assert num_tokens_from_messages(chat_messages, "gpt-3.5-turbo-0613") <= max_context_size
+    # keeping one more message would have overflowed the context window
+    one_more_message = get_openai_chat_messages_from_transcript(
+        event_logs[-len(chat_messages) :], "prompt preamble"
+    )
+    assert num_tokens_from_messages(one_more_message, "gpt-3.5-turbo-0613") > max_context_size
+
+
+def test_openai_chat_message_view_matches_full_rebuild():
+    random.seed(0)
+    transcript = Transcript()
+    last_bot_message: Optional[Message] = None
+    for _ in range(300):
+        operation = random.choice(["human", "bot", "speak", "cut_off", "action"])
+        if operation == "human":
+            transcript.add_human_message(text=f"human {random.random()}", conversation_id="test")
+        elif operation == "bot":
+            # bot messages are added empty and filled in as they are spoken
+            last_bot_message = Message(text="", sender=Sender.BOT)
+            transcript.add_message(last_bot_message, conversation_id="test")
+        elif operation == "speak" and last_bot_message is not None:
+            last_bot_message.text += f" bot {random.random()}"
+            last_bot_message.is_final = random.random() < 0.5
+        elif operation == "cut_off":
+            transcript.update_last_bot_message_on_cut_off(f"cut off {random.random()}")
+        elif operation == "action":
+            transcript.add_action_finish_log(
+                action_input=ActionInput(
+                    action_config=WeatherActionConfig(),
+                    conversation_id="test",
+                    params={},
+                ),
+                action_output=ActionOutput(action_type="weather", response={}),
+                conversation_id="test",
+            )
+
+        assert format_openai_chat_messages_from_transcript(
+            transcript, "gpt-4-turbo", None, "prompt preamble"
+        ) == get_openai_chat_messages_from_transcript(
+            merge_event_logs(transcript.event_logs), "prompt preamble"
+        )
+
+
+def test_openai_chat_message_view_only_renders_new_event_logs(mocker):
+    transcript = Transcript()
+    for i in range(10):
+        transcript.add_human_message(text=f"question {i}", conversation_id="test")
+        transcript.add_bot_message(text=f"answer {i}", conversation_id="test", is_final=True)
+    format_openai_chat_messages_from_transcript(transcript, "gpt-4-turbo", None, "prompt preamble")
+
+    render_spy = mocker.spy(openai_utils, "get_openai_chat_message_from_event_log")
+    transcript.add_human_message(text="question 10", conversation_id="test")
+    format_openai_chat_messages_from_transcript(transcript, "gpt-4-turbo", None, "prompt preamble")
+    # the last bot message (which might still be cut off) and the new human message
+    assert render_spy.call_count == 2
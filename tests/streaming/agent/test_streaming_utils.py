@@ -5,7 +5,7 @@ from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 from pydantic.v1 import BaseModel
 
 from vocode.streaming.agent.openai_utils import openai_get_tokens
-from vocode.streaming.agent.streaming_utils import collate_response_async
+from vocode.streaming.agent.streaming_utils import SentenceSegmenter, collate_response_async
 from vocode.streaming.models.actions import FunctionCall
 
 
@@ -373,3 +373,52 @@ async def test_collate_response_async(mocker):
         ):
             actual_sentences.append(sentence)
         assert actual_sentences == test_case.expected_sentences
+
+
+def segment(tokens: List[str], **kwargs) -> List[str]:
+    segmenter = SentenceSegmenter(**kwargs)
+    sentences = [sentence for token in tokens for sentence in segmenter.add(token)]
+    rest = segmenter.flush()
+    return sentences + [rest] if rest else sentences
+
+
+def test_sentence_segmenter_abbreviations_and_numbered_lists():
+    assert segment(
+        ["I", " spoke", " with", " Dr", ".", " Smith", " about", " it", ".", " He", " said"]
+        + [" it", " was", " fine", "."]
+    ) == ["I spoke with Dr. Smith about it.", "He said it was fine."]
+    assert segment(
+        ["Your", " options", " are", ":", " 1", ".", " Pay", " now", " and", " save", "."]
+        + [" 2", ".", " Pay", " later", " with", " interest", "."]
+    ) == ["Your options are: 1. Pay now and save.", "2. Pay later with interest."]
+
+
+def test_sentence_segmenter_first_clause():
+    tokens = ["Sure", ",", " I", " can", " help", " with", " that", ",", " but", " first", ","]
+    tokens += [" what", "'s", " your", " account", " number", "?"]
+    assert segment(tokens) == ["Sure, I can help with that, but first, what's your account number?"]
+    assert segment(tokens, first_clause_min_words=3) == [
+        "Sure, I can help with that,",
+        "but first, what's your account number?",
+    ]
+
+
+def test_sentence_segmenter_long_response():
+    sentence_tokens = [
+        " This",
+        " is",
+        " sentence",
+        " number",
+        " 1",
+        ",",
+        " with",
+        " $",
+        "3",
+        ".",
+        "20",
+    ]
+    sentence_tokens += [" in", " it", ".", " And"] + [" more"] * 50 + ["?"]
+    sentences = segment(sentence_tokens * 200)
+    assert len(sentences) == 400
+    assert sentences[0] == "This is sentence number 1, with $3.20 in it."
+    assert sentences[1] == "And" + " more" * 50 + "?"
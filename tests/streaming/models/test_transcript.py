@@ -0,0 +1,108 @@
+import random
+
+from vocode.streaming.models.actions import ActionConfig, ActionInput, ActionOutput
+from vocode.streaming.models.events import Sender
+from vocode.streaming.models.transcript import (
+    ActionFinish,
+    ActionStart,
+    EventLog,
+    Message,
+    Transcript,
+)
+
+
+class TranscriptTestActionConfig(ActionConfig, type="transcript_test"):
+    pass
+
+
+def scan_last_message(transcript: Transcript, sender: Sender):
+    for event_log in reversed(transcript.event_logs):
+        if isinstance(event_log, Message) and event_log.sender == sender:
+            return event_log
+    return None
+
+
+def scan_num_words(transcript: Transcript) -> int:
+    return sum(
+        len(event_log.text.split())
+        for event_log in transcript.event_logs
+        if isinstance(event_log, Message)
+    )
+
+
+def test_queries_match_scans_as_the_transcript_grows():
+    rng = random.Random(0)
+    transcript = Transcript()
+    action_input = ActionInput(
+        action_config=TranscriptTestActionConfig(), conversation_id="test", params={}
+    )
+    action_output = ActionOutput(action_type="transcript_test", response={})
+
+    for _ in range(300):
+        choice = rng.random()
+        if choice < 0.4:
+            transcript.add_human_message(
+                text=" ".join(["word"] * rng.randint(0, 5)), conversation_id="test"
+            )
+        elif choice < 0.8:
+            transcript.add_bot_message(text="", conversation_id="test")
+        elif choice < 0.9:
+            # the bot message is filled in while it's spoken
+            last_bot_message = scan_last_message(transcript, Sender.BOT)
+            if last_bot_message is not None:
+                last_bot_message.text += " more words"
+        elif choice < 0.95:
+            transcript.update_last_bot_message_on_cut_off("cut off")
+        else:
+            transcript.event_logs.append(
+                ActionStart(action_type="transcript_test", action_input=action_input)
+                if rng.random() < 0.5
+                else ActionFinish(
+                    action_type="transcript_test",
+                    action_input=action_input,
+                    action_output=action_output,
+                )
+            )
+
+        assert transcript.get_last_bot_message() is scan_last_message(transcript, Sender.BOT)
+        assert transcript.get_last_message(Sender.HUMAN) is scan_last_message(
+            transcript, Sender.HUMAN
+        )
+        assert transcript.get_num_words() == scan_num_words(transcript)
+        messages = [
+            event_log for event_log in transcript.event_logs if isinstance(event_log, Message)
+        ]
+        assert list(transcript.iter_messages_reversed()) == messages[::-1]
+        assert transcript.get_last_message() is (messages[-1] if messages else None)
+
+    action_starts = [e for e in transcript.event_logs if isinstance(e, ActionStart)]
+    action_finishes = [e for e in transcript.event_logs if isinstance(e, ActionFinish)]
+    assert transcript.get_last_action_start() is action_starts[-1]
+    assert transcript.get_last_action_finish() is action_finishes[-1]
+
+
+def test_get_last_user_message():
+    transcript = Transcript()
+    assert transcript.get_last_user_message() is None
+    transcript.add_human_message(text="hello", conversation_id="test")
+    transcript.add_bot_message(text="hi there", conversation_id="test")
+    transcript.add_bot_message(text="how are you?", conversation_id="test")
+    assert transcript.get_last_user_message() == (-3, "HUMAN: hello")
+
+
+def test_index_follows_replaced_event_logs():
+    transcript = Transcript()
+    transcript.add_bot_message(text="hi there", conversation_id="test", is_final=True)
+    assert transcript.was_last_message_interrupted()
+
+    human_message: EventLog = Message(text="hello", sender=Sender.HUMAN)
+    transcript.event_logs = [human_message]
+    assert transcript.get_last_bot_message() is None
+    assert not transcript.was_last_message_interrupted()
+    assert transcript.get_last_message() is human_message
+    assert transcript.get_num_characters() == len("hello")
+
+    copied_transcript = transcript.copy(deep=True)
+    copied_transcript.add_bot_message(text="hi", conversation_id="test")
+    assert transcript.get_last_bot_message() is None
+    assert copied_transcript.get_last_bot_message() is not None
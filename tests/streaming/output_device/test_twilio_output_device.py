@@ -153,3 +153,23 @@ def test_dtmf_tone_generator_caches(
     twilio_output_device.send_dtmf_tones([KeypadEntry.ONE, KeypadEntry.ONE])
 
     lin2ulaw_mock.assert_called_once()
+
+
+def test_messages_match_twilio_media_stream_format(twilio_output_device: TwilioOutputDevice):
+    twilio_output_device.stream_sid = 'MZ"new_stream_sid'
+    twilio_output_device._send_audio_chunk_and_mark(chunk=b"\x00\xff" * 80, chunk_id="chunk_id")
+    twilio_output_device._send_clear_message()
+
+    media_message, mark_message = twilio_output_device._twilio_events_queue.get_nowait()
+    assert json.loads(media_message) == {
+        "event": "media",
+        "streamSid": 'MZ"new_stream_sid',
+        "media": {"payload": base64.b64encode(b"\x00\xff" * 80).decode("utf-8")},
+    }
+    assert json.loads(mark_message) == {
+        "event": "mark",
+        "streamSid": 'MZ"new_stream_sid',
+        "mark": {"name": "chunk_id"},
+    }
+    (clear_message,) = twilio_output_device._twilio_events_queue.get_nowait()
+    assert json.loads(clear_message) == {"event": "clear", "streamSid": 'MZ"new_stream_sid'}
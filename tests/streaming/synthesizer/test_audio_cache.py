@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from fakeredis import FakeAsyncRedis, FakeServer
 from pytest_mock import MockerFixture
@@ -59,3 +61,129 @@ async def test_safe_create_set_and_get_disabled(mocker: MockerFixture):
     await cache.set_audio(voice_identifier, text, audio_data)
 
     assert await cache.get_audio(voice_identifier, text) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_safe_create_waits_for_ping(mocker: MockerFixture):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    server = FakeServer()
+    server.connected = False
+    fake_redis = FakeAsyncRedis(server=server)
+    ping = fake_redis.ping
+
+    async def slow_ping():
+        await asyncio.sleep(0.01)
+        return await ping()
+
+    fake_redis.ping = slow_ping
+    mocker.patch(
+        "vocode.streaming.synthesizer.audio_cache.initialize_redis_bytes", return_value=fake_redis
+    )
+
+    caches = await asyncio.gather(AudioCache.safe_create(), AudioCache.safe_create())
+
+    assert caches[0] is caches[1]
+    assert caches[0].disabled
+
+
+@pytest.mark.asyncio
+async def test_local_tier_serves_hits_and_misses_without_redis(mocker: MockerFixture):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    fake_redis = FakeAsyncRedis()
+    await fake_redis.set("audio_cache:voice_id:in redis", b"remote chunk")
+
+    mocker.patch(
+        "vocode.streaming.synthesizer.audio_cache.initialize_redis_bytes", return_value=fake_redis
+    )
+
+    cache = await AudioCache.safe_create()
+    redis_pipeline = mocker.spy(fake_redis, "pipeline")
+
+    await cache.set_audio("voice_id", "text", b"chunk")
+    assert await cache.get_audio("voice_id", "text") == b"chunk"
+
+    assert await cache.get_audio("voice_id", "in redis") == b"remote chunk"
+    assert await cache.get_audio("voice_id", "in redis") == b"remote chunk"
+
+    assert await cache.get_audio("voice_id", "missing") is None
+    assert await cache.get_audio("voice_id", "missing") is None
+
+    assert redis_pipeline.call_count == 2
+    stats = cache.get_stats()
+    assert stats.local_hits == 2
+    assert stats.redis_hits == 1
+    assert stats.misses == 1
+    assert stats.negative_hits == 1
+
+    # setting audio for a known miss makes it available right away
+    await cache.set_audio("voice_id", "missing", b"new chunk")
+    assert await cache.get_audio("voice_id", "missing") == b"new chunk"
+
+
+def test_local_audio_cache_evicts_least_recently_used_by_size():
+    from vocode.streaming.synthesizer.audio_cache import LocalAudioCache
+
+    local_cache = LocalAudioCache(max_bytes=10, max_entry_bytes=6)
+    local_cache.set("a", b"aaaa")
+    local_cache.set("b", b"bbbb")
+    assert local_cache.get("a") == b"aaaa"
+
+    local_cache.set("c", b"cccc")
+    assert local_cache.get("b") is None
+    assert local_cache.get("a") == b"aaaa"
+    assert local_cache.get("c") == b"cccc"
+    assert local_cache.size_bytes == 8
+    assert local_cache.evictions == 1
+
+    # entries over the per-entry cap are never cached locally
+    local_cache.set("d", b"d" * 7)
+    assert local_cache.get("d") is None
+    assert local_cache.size_bytes == 8
+
+
+@pytest.mark.asyncio
+async def test_local_tier_expires_entries_with_a_ttl(mocker: MockerFixture):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    fake_redis = FakeAsyncRedis()
+    await fake_redis.set("audio_cache:voice_id:in redis", b"remote chunk", ex=10)
+    mocker.patch(
+        "vocode.streaming.synthesizer.audio_cache.initialize_redis_bytes", return_value=fake_redis
+    )
+    monotonic = mocker.patch(
+        "vocode.streaming.synthesizer.audio_cache.time.monotonic", return_value=0.0
+    )
+
+    cache = await AudioCache.safe_create()
+    await cache.set_audio("voice_id", "text", b"chunk", ttl=5)
+    assert await cache.get_audio("voice_id", "in redis") == b"remote chunk"
+
+    monotonic.return_value = 6.0
+    assert cache.local_cache.get("audio_cache:voice_id:text") is None
+    assert cache.local_cache.get("audio_cache:voice_id:in redis") == b"remote chunk"
+
+    monotonic.return_value = 11.0
+    assert cache.local_cache.get("audio_cache:voice_id:in redis") is None
+    assert cache.local_cache.size_bytes == 0
+
+
+def test_local_audio_cache_bounds_misses(mocker: MockerFixture):
+    from vocode.streaming.synthesizer.audio_cache import LocalAudioCache
+
+    monotonic = mocker.patch(
+        "vocode.streaming.synthesizer.audio_cache.time.monotonic", return_value=0.0
+    )
+    local_cache = LocalAudioCache(negative_ttl_seconds=10, max_misses=3)
+    for key in ["a", "b", "c", "d"]:
+        local_cache.set_miss(key)
+    # the oldest miss is forgotten
+    assert list(local_cache.misses_expire_at) == ["b", "c", "d"]
+    assert not local_cache.is_known_miss("a")
+    assert local_cache.is_known_miss("b")
+
+    # expired misses are purged as new ones come in, whether or not they're queried again
+    monotonic.return_value = 20.0
+    local_cache.set_miss("e")
+    assert list(local_cache.misses_expire_at) == ["e"]
@@ -0,0 +1,112 @@
+import asyncio
+import ctypes
+import time
+from types import SimpleNamespace
+from typing import List, Set
+
+import pytest
+from pytest_mock import MockerFixture
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.synthesizer import AzureSynthesizerConfig
+from vocode.streaming.synthesizer.azure_synthesizer import (
+    DEFAULT_AZURE_MAX_BUFFERED_CHUNKS,
+    AzureSynthesizer,
+)
+from vocode.streaming.synthesizer.word_timeline import WordTimeline
+from vocode.streaming.utils.executor_registry import BoundedExecutor
+
+CHUNK_SIZE = 1600
+READ_SECONDS = 0.05
+
+
+class FakeAudioDataStream:
+    """Blocks in read_data like the Azure SDK does while audio is being synthesized."""
+
+    cancellation_details = None
+
+    def __init__(self, num_full_chunks: int, last_chunk_size: int):
+        self.chunk_sizes = [CHUNK_SIZE] * num_full_chunks + [last_chunk_size]
+        self.buffer_ids: Set[int] = set()
+        self.num_reads = 0
+
+    def read_data(self, audio_buffer: bytes) -> int:
+        time.sleep(READ_SECONDS)
+        self.buffer_ids.add(id(audio_buffer))
+        filled_size = (
+            self.chunk_sizes[self.num_reads] if self.num_reads < len(self.chunk_sizes) else 0
+        )
+        # the SDK fills the bytes object in place
+        ctypes.memmove(audio_buffer, bytes([self.num_reads]) * filled_size, filled_size)
+        self.num_reads += 1
+        return filled_size
+
+
+async def measure_event_loop_lag(stop: asyncio.Event, lags: List[float]):
+    interval = 0.005
+    while not stop.is_set():
+        started_at = time.monotonic()
+        await asyncio.sleep(interval)
+        lags.append(time.monotonic() - started_at - interval)
+
+
+@pytest.mark.asyncio
+async def test_azure_chunks_are_read_off_the_event_loop(mocker: MockerFixture):
+    executor = BoundedExecutor("test_azure", max_workers=2, max_queue_size=2)
+    synthesizer = AzureSynthesizer(
+        AzureSynthesizerConfig(sampling_rate=8000, audio_encoding=AudioEncoding.LINEAR16),
+        azure_speech_key="key",
+        azure_speech_region="eastus",
+        executor=executor,
+    )
+    audio_data_stream = FakeAudioDataStream(num_full_chunks=10, last_chunk_size=100)
+    mocker.patch.object(synthesizer, "synthesize_ssml", return_value=audio_data_stream)
+
+    stop = asyncio.Event()
+    lags: List[float] = []
+    lag_task = asyncio.create_task(measure_event_loop_lag(stop, lags))
+    try:
+        synthesis_result = await synthesizer.create_speech_uncached(
+            BaseMessage(text="Hello there"), chunk_size=CHUNK_SIZE
+        )
+        chunk_results = [chunk_result async for chunk_result in synthesis_result.chunk_generator]
+    finally:
+        stop.set()
+        await lag_task
+        executor.shutdown()
+
+    assert [len(chunk_result.chunk) for chunk_result in chunk_results] == [CHUNK_SIZE] * 10 + [100]
+    assert [chunk_result.is_last_chunk for chunk_result in chunk_results] == [False] * 10 + [True]
+    # every chunk was copied out of its buffer before the buffer was reused
+    assert [chunk_result.chunk[0] for chunk_result in chunk_results] == list(range(11))
+    assert len(audio_data_stream.buffer_ids) <= DEFAULT_AZURE_MAX_BUFFERED_CHUNKS
+    # 11 blocking reads of 50ms each, and the event loop never stalled for the length of one
+    assert len(lags) > 50
+    assert max(lags) < READ_SECONDS / 2
+
+
+@pytest.mark.asyncio
+async def test_azure_word_boundaries_map_to_the_message():
+    synthesizer = AzureSynthesizer(
+        AzureSynthesizerConfig(sampling_rate=8000, audio_encoding=AudioEncoding.LINEAR16),
+        azure_speech_key="key",
+        azure_speech_region="eastus",
+    )
+    message = " Fish & chips, please"
+    ssml = synthesizer.create_ssml(message)
+    word_timeline = WordTimeline(message)
+    loop = asyncio.get_running_loop()
+    for word, audio_offset in [("Fish", 0), ("chips", 5_000_000), ("please", 10_000_000)]:
+        # the SDK reports offsets into the SSML and in 100ns ticks
+        synthesizer.word_boundary_cb(
+            SimpleNamespace(text_offset=ssml.index(word), audio_offset=audio_offset),
+            word_timeline,
+            ssml,
+            loop,
+        )
+    await asyncio.sleep(0)
+
+    assert word_timeline.get_text_up_to(0.3) == " Fish & "
+    assert word_timeline.get_text_up_to(0.7) == " Fish & chips, "
+    assert word_timeline.get_text_up_to(None) == message
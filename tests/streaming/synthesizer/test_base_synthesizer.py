@@ -0,0 +1,67 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+from pytest_mock import MockerFixture
+
+from tests.fixtures.synthesizer import TestSynthesizer, TestSynthesizerConfig
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.utils.singleton import Singleton
+
+
+@pytest.fixture(autouse=True)
+def cleanup_singleton_audio_cache():
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    if AudioCache in Singleton._instances:
+        del Singleton._instances[AudioCache]
+    yield
+
+
+@pytest.mark.asyncio
+async def test_prefetch_messages_synthesizes_missing_audio(mocker: MockerFixture):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    fake_redis = FakeAsyncRedis()
+    await fake_redis.set("audio_cache:test_voice:Hello?", b"cached hello")
+    mocker.patch(
+        "vocode.streaming.synthesizer.audio_cache.initialize_redis_bytes", return_value=fake_redis
+    )
+
+    synthesizer = TestSynthesizer(
+        TestSynthesizerConfig(sampling_rate=8000, audio_encoding=AudioEncoding.LINEAR16)
+    )
+    create_speech_uncached = mocker.spy(synthesizer, "create_speech_uncached")
+
+    await synthesizer.prefetch_messages(
+        [BaseMessage(text="Hello?"), BaseMessage(text="Are you there?")], chunk_size=4
+    )
+
+    create_speech_uncached.assert_called_once()
+    assert await fake_redis.get("audio_cache:test_voice:Are you there?") == b"Are you there?"
+
+    audio_cache = await AudioCache.safe_create()
+    redis_get = mocker.spy(fake_redis, "get")
+    synthesis_result = await synthesizer.create_speech(BaseMessage(text="Hello?"), chunk_size=4)
+    assert synthesis_result.cached
+    assert redis_get.call_count == 0
+    assert audio_cache.get_stats().local_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_messages_only_loads_when_not_synthesizing(mocker: MockerFixture):
+    fake_redis = FakeAsyncRedis()
+    mocker.patch(
+        "vocode.streaming.synthesizer.audio_cache.initialize_redis_bytes", return_value=fake_redis
+    )
+
+    synthesizer = TestSynthesizer(
+        TestSynthesizerConfig(sampling_rate=8000, audio_encoding=AudioEncoding.LINEAR16)
+    )
+    create_speech_uncached = mocker.spy(synthesizer, "create_speech_uncached")
+
+    await synthesizer.prefetch_messages(
+        [BaseMessage(text="Hi there")], chunk_size=4, synthesize_missing=False
+    )
+
+    create_speech_uncached.assert_not_called()
+    assert await fake_redis.get("audio_cache:test_voice:Hi there") is None
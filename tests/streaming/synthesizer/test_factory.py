@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from unittest.mock import MagicMock, patch
 
 from pyht import AsyncClient
@@ -6,6 +8,7 @@ from pytest_mock import MockerFixture
 
 from vocode.streaming.models.audio import AudioEncoding
 from vocode.streaming.models.synthesizer import PlayHtSynthesizerConfig
+from vocode.streaming.synthesizer import play_ht_synthesizer, play_ht_synthesizer_v2
 from vocode.streaming.synthesizer.default_factory import DefaultSynthesizerFactory
 
 DEFAULT_PARAMS = {
@@ -18,10 +21,8 @@ DEFAULT_PARAMS = {
 def test_get_play_ht_synthesizer_v2_or_v1(mocker: MockerFixture):
     factory = DefaultSynthesizerFactory()
 
-    v1_constructor = mocker.patch("vocode.streaming.synthesizer.default_factory.PlayHtSynthesizer")
-    v2_constructor = mocker.patch(
-        "vocode.streaming.synthesizer.default_factory.PlayHtSynthesizerV2"
-    )
+    v1_constructor = mocker.patch.object(play_ht_synthesizer, "PlayHtSynthesizer")
+    v2_constructor = mocker.patch.object(play_ht_synthesizer_v2, "PlayHtSynthesizerV2")
 
     factory.create_synthesizer(
         PlayHtSynthesizerConfig(version="2", **DEFAULT_PARAMS.copy()),
@@ -85,3 +86,21 @@ def test_create_play_ht_synthesizer_on_prem(mocker: MockerFixture):
             advanced=advanced_options,
         )
         MockOSClient.reset_mock()
+
+
+def test_provider_sdks_are_imported_when_first_used():
+    # a fresh interpreter, since the test session has imported every provider already
+    code = """
+import sys
+from vocode.streaming.models.synthesizer import RimeSynthesizerConfig
+from vocode.streaming.synthesizer.default_factory import DefaultSynthesizerFactory
+from vocode.streaming.transcriber.default_factory import DefaultTranscriberFactory
+providers = ["azure.cognitiveservices.speech", "elevenlabs", "pyht", "cartesia", "nltk"]
+assert not [provider for provider in providers if provider in sys.modules]
+DefaultSynthesizerFactory().create_synthesizer(
+    RimeSynthesizerConfig(sampling_rate=16000, audio_encoding="linear16", speaker="young_male")
+)
+assert "vocode.streaming.synthesizer.rime_synthesizer" in sys.modules
+assert "vocode.streaming.synthesizer.azure_synthesizer" not in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
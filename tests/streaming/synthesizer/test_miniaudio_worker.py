@@ -0,0 +1,89 @@
+import asyncio
+import os
+from typing import List, Tuple
+
+import pytest
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.synthesizer import SynthesizerConfig
+from vocode.streaming.synthesizer.miniaudio_worker import MiniaudioWorker
+from vocode.streaming.utils.worker import QueueConsumer
+
+SINE_MP3_PATH = os.path.join(os.path.dirname(__file__), "../../fixtures/audio/sine.mp3")
+
+
+@pytest.fixture
+def mp3_bytes() -> bytes:
+    with open(SINE_MP3_PATH, "rb") as f:
+        return f.read()
+
+
+def split_into_chunks(data: bytes, chunk_size: int) -> List[bytes]:
+    return [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+async def collect_worker_output(
+    worker: MiniaudioWorker, consumer: QueueConsumer
+) -> List[Tuple[bytes, bool]]:
+    output = []
+    while True:
+        chunk, is_last = await asyncio.wait_for(consumer.input_queue.get(), timeout=5)
+        output.append((chunk, is_last))
+        if is_last:
+            return output
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "audio_encoding,chunk_size,expected_chunk_size",
+    [(AudioEncoding.LINEAR16, 1600, 1600), (AudioEncoding.MULAW, 800, 1600)],
+)
+async def test_miniaudio_worker_streams_chunks(
+    mp3_bytes: bytes, audio_encoding: AudioEncoding, chunk_size: int, expected_chunk_size: int
+):
+    synthesizer_config = SynthesizerConfig(sampling_rate=8000, audio_encoding=audio_encoding)
+    consumer: QueueConsumer = QueueConsumer()
+    worker = MiniaudioWorker(synthesizer_config, chunk_size)
+    worker.consumer = consumer
+    worker.start()
+
+    try:
+        for chunk in split_into_chunks(mp3_bytes, 500):
+            worker.consume_nonblocking(chunk)
+        worker.consume_nonblocking(None)
+
+        output = await collect_worker_output(worker, consumer)
+
+        assert [is_last for _, is_last in output] == [False] * (len(output) - 1) + [True]
+        assert all(len(chunk) == expected_chunk_size for chunk, _ in output[:-1])
+        assert len(output[-1][0]) < expected_chunk_size
+        total_length = sum(len(chunk) for chunk, _ in output)
+        # 1.5 seconds of LINEAR16 audio at 8kHz
+        assert abs(total_length - 1.5 * 8000 * 2) < 0.05 * 1.5 * 8000 * 2
+    finally:
+        await worker.terminate()
+
+
+@pytest.mark.asyncio
+async def test_miniaudio_worker_decodes_consecutive_utterances(mp3_bytes: bytes):
+    synthesizer_config = SynthesizerConfig(
+        sampling_rate=8000, audio_encoding=AudioEncoding.LINEAR16
+    )
+    consumer: QueueConsumer = QueueConsumer()
+    worker = MiniaudioWorker(synthesizer_config, 1600)
+    worker.consumer = consumer
+    worker.start()
+
+    try:
+        utterance_lengths = []
+        for _ in range(2):
+            for chunk in split_into_chunks(mp3_bytes, 500):
+                worker.consume_nonblocking(chunk)
+            worker.consume_nonblocking(None)
+            output = await collect_worker_output(worker, consumer)
+            utterance_lengths.append(sum(len(chunk) for chunk, _ in output))
+
+        # each utterance gets a fresh decoder
+        assert utterance_lengths[0] == utterance_lengths[1]
+    finally:
+        await worker.terminate()
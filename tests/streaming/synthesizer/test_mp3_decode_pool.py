@@ -0,0 +1,181 @@
+import asyncio
+import os
+import random
+from typing import AsyncIterator, List, Tuple
+
+import pytest
+
+from tests.fixtures.synthesizer import TestSynthesizer, TestSynthesizerConfig
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.synthesizer.mp3_decode_pool import MP3DecodePool, MP3DecodeStream
+from vocode.streaming.utils.mp3_helper import IncrementalMP3Decoder, parse_mp3_frame_header
+
+SINE_MP3_PATH = os.path.join(os.path.dirname(__file__), "../../fixtures/audio/sine.mp3")
+
+
+@pytest.fixture
+def mp3_bytes() -> bytes:
+    with open(SINE_MP3_PATH, "rb") as f:
+        return f.read()
+
+
+def decode_all(mp3_bytes: bytes, output_sample_rate: int) -> bytes:
+    decoder = IncrementalMP3Decoder(output_sample_rate)
+    decoder.feed(mp3_bytes)
+    decoder.end()
+    return decoder.decode_available()
+
+
+def split_randomly(data: bytes, rng: random.Random, max_chunk_size: int) -> List[bytes]:
+    chunks = []
+    idx = 0
+    while idx < len(data):
+        chunk_size = rng.randint(1, max_chunk_size)
+        chunks.append(data[idx : idx + chunk_size])
+        idx += chunk_size
+    return chunks
+
+
+def test_parse_mp3_frame_header(mp3_bytes: bytes):
+    header = parse_mp3_frame_header(mp3_bytes)
+    assert header is not None
+    # the fixture is MPEG 2 layer III at 22050Hz
+    assert header.sample_rate == 22050
+    assert header.samples_per_frame == 576
+    assert parse_mp3_frame_header(mp3_bytes, header.frame_length) is not None
+    assert parse_mp3_frame_header(b"ID3\x04\x00\x00\x00\x00\x00\x00") is None
+
+
+@pytest.mark.parametrize("output_sample_rate", [8000, 16000, 22050, 44100])
+@pytest.mark.parametrize("max_chunk_size", [1, 50, 500, 2000])
+def test_incremental_decoder_output_doesnt_depend_on_chunking(
+    mp3_bytes: bytes, output_sample_rate: int, max_chunk_size: int
+):
+    rng = random.Random(max_chunk_size)
+    decoder = IncrementalMP3Decoder(output_sample_rate)
+    pcm = bytearray()
+    for chunk in split_randomly(mp3_bytes, rng, max_chunk_size):
+        decoder.feed(chunk)
+        if rng.random() < 0.5:
+            pcm += decoder.decode_available()
+    pcm += decoder.decode_available()
+    num_bytes_decoded_before_end = len(pcm)
+    decoder.end()
+    pcm += decoder.decode_available()
+
+    assert decoder.finished
+    assert pcm == decode_all(mp3_bytes, output_sample_rate)
+    # only the lookahead frames are held back until the end of the stream
+    assert num_bytes_decoded_before_end > 0.9 * len(pcm)
+
+
+def test_incremental_decoder_skips_id3_tag(mp3_bytes: bytes):
+    tag_body = b"\x00" * 300
+    # 300 as a syncsafe integer
+    id3_tag = b"ID3\x04\x00\x00\x00\x00\x02\x2c" + tag_body
+    decoder = IncrementalMP3Decoder(8000)
+    decoder.feed(id3_tag + mp3_bytes[:2000])
+    assert decoder.num_decodable_frames() > 0
+
+
+def test_incremental_decoder_ends_without_audio():
+    decoder = IncrementalMP3Decoder(8000)
+    decoder.end()
+    assert decoder.decode_available() == b""
+    assert decoder.finished
+
+
+async def collect_output(stream: MP3DecodeStream) -> List[Tuple[bytes, bool]]:
+    output = []
+    while True:
+        chunk, is_last = await asyncio.wait_for(stream.output_queue.get(), timeout=5)
+        output.append((chunk, is_last))
+        if is_last:
+            return output
+
+
+async def feed_stream(stream: MP3DecodeStream, chunks: List[bytes]):
+    for chunk in chunks:
+        stream.feed(chunk)
+        await asyncio.sleep(0)
+    stream.end()
+
+
+@pytest.mark.asyncio
+async def test_pool_decodes_concurrent_streams_in_order(mp3_bytes: bytes):
+    pool = MP3DecodePool(max_workers=2)
+    rng = random.Random(0)
+    try:
+        streams = [pool.open_stream(output_sample_rate=8000, chunk_size=1600) for _ in range(20)]
+        assert pool.get_stats().num_open_streams == 20
+        for stream in streams:
+            asyncio.create_task(feed_stream(stream, split_randomly(mp3_bytes, rng, 700)))
+        outputs = await asyncio.gather(*(collect_output(stream) for stream in streams))
+
+        expected_pcm = decode_all(mp3_bytes, 8000)
+        for output in outputs:
+            assert [is_last for _, is_last in output] == [False] * (len(output) - 1) + [True]
+            assert all(len(chunk) == 1600 for chunk, _ in output[:-1])
+            assert b"".join(chunk for chunk, _ in output) == expected_pcm
+
+        for stream in streams:
+            stream.close()
+            stream.close()
+        stats = pool.get_stats()
+        assert stats.num_open_streams == 0
+        assert stats.queue_depth == 0
+        assert stats.max_queue_depth >= 1
+        assert stats.num_decode_jobs >= len(streams)
+        assert stats.average_decode_seconds > 0
+        assert stats.max_queue_wait_seconds >= stats.average_queue_wait_seconds
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_ends_stream_on_decode_error():
+    pool = MP3DecodePool(max_workers=1)
+    try:
+        stream = pool.open_stream(output_sample_rate=8000, chunk_size=1600)
+        stream.feed(b"not an mp3" * 100)
+        stream.end()
+        assert await collect_output(stream) == [(b"", True)]
+    finally:
+        pool.shutdown()
+
+
+class FakeStreamReader:
+    def __init__(self, chunks: List[bytes]):
+        self.chunks = chunks
+
+    async def iter_any(self) -> AsyncIterator[bytes]:
+        for chunk in self.chunks:
+            yield chunk
+
+
+class FakeResponse:
+    def __init__(self, chunks: List[bytes]):
+        self.content = FakeStreamReader(chunks)
+
+
+@pytest.mark.asyncio
+async def test_experimental_mp3_streaming_output_generator(mp3_bytes: bytes):
+    synthesizer = TestSynthesizer(
+        TestSynthesizerConfig(sampling_rate=8000, audio_encoding=AudioEncoding.MULAW)
+    )
+    chunks = [mp3_bytes[i : i + 500] for i in range(0, len(mp3_bytes), 500)]
+
+    chunk_results = [
+        chunk_result
+        async for chunk_result in synthesizer.experimental_mp3_streaming_output_generator(
+            FakeResponse(chunks), chunk_size=800  # type: ignore[arg-type]
+        )
+    ]
+
+    assert [chunk_result.is_last_chunk for chunk_result in chunk_results] == [False] * (
+        len(chunk_results) - 1
+    ) + [True]
+    assert all(len(chunk_result.chunk) == 800 for chunk_result in chunk_results[:-1])
+    total_length = sum(len(chunk_result.chunk) for chunk_result in chunk_results)
+    # 1.5 seconds of MULAW audio at 8kHz
+    assert abs(total_length - 1.5 * 8000) < 0.05 * 1.5 * 8000
@@ -0,0 +1,52 @@
+import pytest
+
+from vocode.streaming.synthesizer.word_timeline import WordTimeline
+
+
+@pytest.mark.parametrize(
+    "seconds, expected",
+    [
+        (0.0, ""),
+        (0.4, "Hello"),
+        (0.8, "Hello there"),
+        (1.2, "Hello there,"),
+        (2.0, "Hello there, how are"),
+        (10.0, "Hello there, how are you?"),
+        (None, "Hello there, how are you?"),
+    ],
+)
+def test_from_voice_speed(seconds, expected):
+    # 150 words per minute is 0.4 seconds per word, and punctuation counts as a word
+    timeline = WordTimeline.from_voice_speed("Hello there, how are you?", words_per_minute=150)
+    assert timeline.get_text_up_to(seconds) == expected
+
+
+def test_contractions_are_one_word():
+    timeline = WordTimeline.from_voice_speed("I don't know", words_per_minute=60)
+    assert timeline.get_text_up_to(2) == "I don't"
+
+
+def test_words_added_out_of_order():
+    timeline = WordTimeline("one two three")
+    timeline.add_word(0.0, 0)
+    timeline.add_word(1.0, 8)
+    timeline.add_word(0.5, 4)
+    assert timeline.get_text_up_to(0.2) == "one "
+    assert timeline.get_text_up_to(0.7) == "one two "
+    assert timeline.get_text_up_to(1.0) == "one two three"
+
+
+def test_append_text():
+    timeline = WordTimeline()
+    timeline.append_text("Hi there. ", 1.0)
+    timeline.append_text("How are you? ", 2.0)
+    assert timeline.get_text_up_to(0.0) == "Hi there. "
+    assert timeline.get_text_up_to(1.5) == "Hi there. How are you? "
+    assert timeline.get_text_up_to(None) == "Hi there. How are you? "
+
+
+def test_reuses_text_until_a_word_starts():
+    timeline = WordTimeline.from_voice_speed("a b c d e f", words_per_minute=60)
+    text_up_to = timeline.get_text_up_to(2.1)
+    assert timeline.get_text_up_to(2.5) is text_up_to
+    assert timeline.get_text_up_to(3.0) == "a b c"
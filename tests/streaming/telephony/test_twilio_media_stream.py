@@ -0,0 +1,82 @@
+import base64
+import json
+
+from vocode.streaming.telephony.twilio_media_stream import (
+    TwilioInboundAudioBuffer,
+    TwilioMediaStreamMessageEncoder,
+    parse_inbound_media_payload,
+)
+
+
+def create_inbound_media_message(payload: bytes, sequence_number: int = 1) -> str:
+    return json.dumps(
+        {
+            "event": "media",
+            "sequenceNumber": str(sequence_number),
+            "media": {
+                "track": "inbound",
+                "chunk": str(sequence_number),
+                "timestamp": str(sequence_number * 20),
+                "payload": base64.b64encode(payload).decode("utf-8"),
+            },
+            "streamSid": "stream_sid",
+        },
+        separators=(",", ":"),
+    )
+
+
+def test_parse_inbound_media_payload():
+    payload = bytes(range(256)) * 2
+    assert parse_inbound_media_payload(create_inbound_media_message(payload)) == payload
+
+
+def test_parse_inbound_media_payload_falls_back_on_other_messages():
+    assert (
+        parse_inbound_media_payload(
+            json.dumps({"event": "mark", "mark": {"name": "chunk_id"}}, separators=(",", ":"))
+        )
+        is None
+    )
+    # not in the compact form that Twilio sends
+    assert (
+        parse_inbound_media_payload(
+            json.dumps({"event": "media", "media": {"payload": base64.b64encode(b"a").decode()}})
+        )
+        is None
+    )
+    assert (
+        parse_inbound_media_payload('{"event":"media","media":{"payload":"YQ\\u003d\\u003d"}}')
+        is None
+    )
+
+
+def test_parse_inbound_media_payload_reads_messages_from_the_encoder():
+    encoder = TwilioMediaStreamMessageEncoder("stream_sid")
+    media_message = encoder.media_message(b"\x00\x01\x02")
+    compact_media_message = json.dumps(json.loads(media_message), separators=(",", ":"))
+    assert parse_inbound_media_payload(compact_media_message) == b"\x00\x01\x02"
+
+
+def test_inbound_audio_buffer_coalesces_frames():
+    inbound_audio_buffer = TwilioInboundAudioBuffer(frames_per_chunk=3)
+    frames = [bytes([i]) * 160 for i in range(7)]
+
+    chunks = [inbound_audio_buffer.add_frame(frame) for frame in frames]
+
+    assert chunks == [
+        None,
+        None,
+        b"".join(frames[0:3]),
+        None,
+        None,
+        b"".join(frames[3:6]),
+        None,
+    ]
+    assert inbound_audio_buffer.flush() == frames[6]
+    assert inbound_audio_buffer.flush() is None
+
+
+def test_inbound_audio_buffer_passes_frames_through():
+    inbound_audio_buffer = TwilioInboundAudioBuffer(frames_per_chunk=1)
+    assert inbound_audio_buffer.add_frame(b"\xff" * 160) == b"\xff" * 160
+    assert inbound_audio_buffer.flush() is None
@@ -1,6 +1,6 @@
 import asyncio
 import threading
-from typing import AsyncGenerator, List, Optional
+from typing import AsyncGenerator, Dict, List, Optional, Tuple, Union
 from unittest.mock import MagicMock
 
 import pytest
@@ -9,15 +9,22 @@ from pytest_mock import MockerFixture
 
 from tests.fakedata.conversation import (
     DEFAULT_CHAT_GPT_AGENT_CONFIG,
+    DEFAULT_SYNTHESIZER_CONFIG,
     DummyOutputDevice,
     create_fake_agent,
     create_fake_streaming_conversation,
+    create_fake_synthesizer,
 )
 from tests.fixtures.synthesizer import TestSynthesizer, TestSynthesizerConfig
 from tests.fixtures.transcriber import TestAsyncTranscriber, TestTranscriberConfig
+from vocode.streaming.agent.base_agent import AgentResponseMessage
 from vocode.streaming.agent.echo_agent import EchoAgent
-from vocode.streaming.models.actions import ActionInput
-from vocode.streaming.models.agent import EchoAgentConfig, InterruptSensitivity
+from vocode.streaming.models.actions import ActionInput, EndOfTurn
+from vocode.streaming.models.agent import (
+    EchoAgentConfig,
+    InterruptSensitivity,
+    SpeculativeGenerationConfig,
+)
 from vocode.streaming.models.audio import AudioEncoding
 from vocode.streaming.models.events import Sender
 from vocode.streaming.models.message import BaseMessage
@@ -408,6 +415,44 @@ async def test_transcriptions_worker_interrupts_on_interim_transcripts(
     await streaming_conversation.transcriptions_worker.terminate()
 
 
+@pytest.mark.asyncio
+async def test_transcriptions_worker_speculates_on_stable_interim_transcripts(
+    mocker: MockerFixture,
+):
+    streaming_conversation = create_fake_streaming_conversation(
+        mocker,
+        agent=create_fake_agent(
+            mocker,
+            DEFAULT_CHAT_GPT_AGENT_CONFIG.copy(
+                update={
+                    "speculative_generation_config": SpeculativeGenerationConfig(
+                        min_stable_interim_transcripts=2
+                    )
+                }
+            ),
+        ),
+    )
+    streaming_conversation.initial_message_tracker.set()
+    transcriptions_worker_consumer = QueueConsumer()
+    streaming_conversation.transcriptions_worker.consumer = transcriptions_worker_consumer
+    streaming_conversation.transcriptions_worker.start()
+    for message in ["what", "what time", "What time?", "what time", "what time is it"]:
+        streaming_conversation.transcriptions_worker.consume_nonblocking(
+            Transcription(message=message, confidence=1.0, is_final=False),
+        )
+    streaming_conversation.transcriptions_worker.consume_nonblocking(
+        Transcription(message="what time is it", confidence=1.0, is_final=True),
+    )
+
+    assert await _get_from_consumer_queue_if_exists(transcriptions_worker_consumer) is not None
+    # the interim transcript was the same twice in a row once, modulo casing and punctuation
+    speculate = streaming_conversation.agent.speculate
+    assert speculate.call_count == 1
+    assert speculate.call_args.args[0].message == "What time?"
+    assert not speculate.call_args.args[0].is_final
+    await streaming_conversation.transcriptions_worker.terminate()
+
+
 @pytest.mark.asyncio
 async def test_transcriptions_worker_interrupts_immediately_before_bot_has_begun_turn(
     mocker: MockerFixture,
@@ -584,6 +629,50 @@ async def test_send_speech_to_output_interrupted_during_playback(
     assert not transcript_message.is_final
 
 
+@pytest.mark.asyncio
+async def test_send_speech_to_output_plays_uninterruptible_message_across_interrupt(
+    mocker: MockerFixture,
+):
+    streaming_conversation = await _mock_streaming_conversation_constructor(mocker)
+    event_factory = streaming_conversation.interruptible_event_factory
+    # e.g. the initial message
+    uninterruptible_event = event_factory.create_interruptible_agent_response_event(
+        AgentResponseMessage(message=BaseMessage(text="Hi there")), is_interruptible=False
+    )
+    interruptible_event = event_factory.create_interruptible_agent_response_event(
+        AgentResponseMessage(message=BaseMessage(text="How are you?"))
+    )
+
+    async def chunk_generator():
+        yield SynthesisResult.ChunkResult(chunk=b"", is_last_chunk=False)
+        assert await streaming_conversation.broadcast_interrupt()
+        yield SynthesisResult.ChunkResult(chunk=b"", is_last_chunk=False)
+        yield SynthesisResult.ChunkResult(chunk=b"", is_last_chunk=True)
+
+    synthesis_result = _create_dummy_synthesis_result(chunk_generator_override=chunk_generator())
+    transcript_message = Message(
+        text="",
+        sender=Sender.BOT,
+    )
+
+    streaming_conversation.output_device.start()
+    message_sent, cut_off = await streaming_conversation.send_speech_to_output(
+        message="Hi there",
+        synthesis_result=synthesis_result,
+        stop_event=uninterruptible_event.interruption_event,
+        seconds_per_chunk=0.1,
+        transcript_message=transcript_message,
+    )
+    await streaming_conversation.output_device.terminate()
+
+    assert interruptible_event.is_interrupted()
+    assert not uninterruptible_event.interruption_event.is_set()
+    assert message_sent == "Hi there"
+    assert not cut_off
+    assert transcript_message.is_final
+    assert streaming_conversation.output_device.dummy_playback_queue.qsize() == 3
+
+
 @pytest.mark.asyncio
 async def test_streaming_conversation_pipeline(
     mocker: MockerFixture,
@@ -610,3 +699,115 @@ async def test_streaming_conversation_pipeline(
     assert initial_message_audio_chunk.data == b"Hi there"
     first_response_audio_chunk = await output_device.dummy_playback_queue.get()
     assert first_response_audio_chunk.data == b"test"
+
+
+async def _create_look_ahead_streaming_conversation(
+    mocker: MockerFixture, synthesis_lookahead: int
+) -> Tuple[StreamingConversation, List[str], Dict[str, asyncio.Event]]:
+    """Returns a conversation whose synthesizer only finishes a message's speech once its event
+    is set, along with the messages it started synthesizing."""
+    started: List[str] = []
+    finish_events: Dict[str, asyncio.Event] = {}
+
+    async def create_speech(message: BaseMessage, chunk_size: int, **kwargs):
+        started.append(message.text)
+        await finish_events.setdefault(message.text, asyncio.Event()).wait()
+        return _create_dummy_synthesis_result(message=message.text)
+
+    synthesizer = create_fake_synthesizer(
+        mocker,
+        DEFAULT_SYNTHESIZER_CONFIG.copy(update={"synthesis_lookahead": synthesis_lookahead}),
+    )
+    synthesizer.create_speech = create_speech
+    streaming_conversation = create_fake_streaming_conversation(mocker, synthesizer=synthesizer)
+    streaming_conversation.agent_responses_worker.consumer = QueueConsumer()
+    streaming_conversation.agent_responses_worker.start()
+    return streaming_conversation, started, finish_events
+
+
+def _send_agent_response_message(
+    streaming_conversation: StreamingConversation, message: Union[BaseMessage, EndOfTurn]
+):
+    streaming_conversation.agent_responses_worker.consume_nonblocking(
+        streaming_conversation.interruptible_event_factory.create_interruptible_agent_response_event(
+            AgentResponseMessage(message=message)
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_agent_responses_worker_synthesizes_ahead_in_order(mocker: MockerFixture):
+    streaming_conversation, started, finish_events = (
+        await _create_look_ahead_streaming_conversation(mocker, synthesis_lookahead=2)
+    )
+    consumer = streaming_conversation.agent_responses_worker.consumer
+    for text in ["one", "two", "three"]:
+        _send_agent_response_message(streaming_conversation, BaseMessage(text=text))
+    _send_agent_response_message(streaming_conversation, EndOfTurn())
+
+    await asyncio.sleep(0.05)
+    # the second message is synthesized while the first one is still being synthesized
+    assert started == ["one", "two"]
+
+    finish_events["two"].set()
+    assert await _get_from_consumer_queue_if_exists(consumer) is None
+
+    finish_events["one"].set()
+    first_message, _ = (await _get_from_consumer_queue_if_exists(consumer)).payload
+    second_message, _ = (await _get_from_consumer_queue_if_exists(consumer)).payload
+    assert [first_message.text, second_message.text] == ["one", "two"]
+    assert started == ["one", "two", "three"]
+
+    finish_events.setdefault("three", asyncio.Event()).set()
+    third_message, _ = (await _get_from_consumer_queue_if_exists(consumer)).payload
+    end_of_turn, _ = (await _get_from_consumer_queue_if_exists(consumer)).payload
+    assert third_message.text == "three"
+    assert isinstance(end_of_turn, EndOfTurn)
+
+    await streaming_conversation.agent_responses_worker.terminate()
+
+
+@pytest.mark.asyncio
+async def test_agent_responses_worker_interrupt_cancels_look_ahead_synthesis(
+    mocker: MockerFixture,
+):
+    streaming_conversation, started, finish_events = (
+        await _create_look_ahead_streaming_conversation(mocker, synthesis_lookahead=2)
+    )
+    consumer = streaming_conversation.agent_responses_worker.consumer
+    for text in ["one", "two", "three"]:
+        _send_agent_response_message(streaming_conversation, BaseMessage(text=text))
+    await asyncio.sleep(0.05)
+    assert started == ["one", "two"]
+
+    await streaming_conversation.broadcast_interrupt()
+    await asyncio.sleep(0.05)
+    assert not streaming_conversation.agent_responses_worker.pending_lookahead_outputs
+    assert started == ["one", "two"]
+
+    # the worker keeps going after the interrupt
+    _send_agent_response_message(streaming_conversation, BaseMessage(text="four"))
+    finish_events.setdefault("four", asyncio.Event()).set()
+    message, _ = (await _get_from_consumer_queue_if_exists(consumer)).payload
+    assert message.text == "four"
+
+    await streaming_conversation.agent_responses_worker.terminate()
+
+
+@pytest.mark.asyncio
+async def test_agent_responses_worker_synthesizes_one_message_at_a_time_by_default(
+    mocker: MockerFixture,
+):
+    streaming_conversation, started, finish_events = (
+        await _create_look_ahead_streaming_conversation(mocker, synthesis_lookahead=0)
+    )
+    for text in ["one", "two"]:
+        _send_agent_response_message(streaming_conversation, BaseMessage(text=text))
+    await asyncio.sleep(0.05)
+    assert started == ["one"]
+
+    finish_events["one"].set()
+    await asyncio.sleep(0.05)
+    assert started == ["one", "two"]
+
+    await streaming_conversation.agent_responses_worker.terminate()
@@ -0,0 +1,138 @@
+import asyncio
+import json
+from typing import List
+
+import pytest
+import pytest_asyncio
+import websockets
+from websockets.server import WebSocketServerProtocol
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.transcriber import (
+    DeepgramTranscriberConfig,
+    PunctuationEndpointingConfig,
+)
+from vocode.streaming.transcriber.deepgram_connection_pool import DeepgramConnectionPool
+from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
+
+EXTRA_HEADERS = {"Authorization": "Token test"}
+
+
+class DeepgramStub:
+    """Local websocket server that records connections and the messages they receive."""
+
+    def __init__(self):
+        self.connections: List[WebSocketServerProtocol] = []
+        self.messages: List[str] = []
+
+    async def handler(self, ws: WebSocketServerProtocol):
+        self.connections.append(ws)
+        async for message in ws:
+            self.messages.append(message)
+
+
+@pytest_asyncio.fixture
+async def deepgram_stub():
+    stub = DeepgramStub()
+    async with websockets.serve(stub.handler, "localhost", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        stub.url = f"ws://localhost:{port}"
+        yield stub
+
+
+async def wait_for(condition, timeout: float = 2):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_acquire_returns_prewarmed_connection(deepgram_stub: DeepgramStub):
+    pool = DeepgramConnectionPool()
+    url = f"{deepgram_stub.url}/v1/listen"
+
+    pool.prewarm(url, EXTRA_HEADERS)
+    await wait_for(lambda: pool.num_idle_connections(url, EXTRA_HEADERS) == 1)
+
+    connection = await pool.acquire(url, EXTRA_HEADERS)
+    assert connection.open
+    assert len(deepgram_stub.connections) == 1
+    assert pool.num_idle_connections(url, EXTRA_HEADERS) == 0
+
+    await connection.close()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_inflight_prewarm(deepgram_stub: DeepgramStub):
+    pool = DeepgramConnectionPool()
+    url = f"{deepgram_stub.url}/v1/listen"
+
+    pool.prewarm(url, EXTRA_HEADERS)
+    connection = await pool.acquire(url, EXTRA_HEADERS)
+
+    assert connection.open
+    assert len(deepgram_stub.connections) == 1
+
+    await connection.close()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_prewarm_is_bounded_per_key(deepgram_stub: DeepgramStub):
+    pool = DeepgramConnectionPool(max_idle_connections_per_key=2)
+    url = f"{deepgram_stub.url}/v1/listen"
+
+    pool.prewarm(url, EXTRA_HEADERS, num_connections=5)
+    pool.prewarm(url, EXTRA_HEADERS)
+    await wait_for(lambda: pool.num_idle_connections(url, EXTRA_HEADERS) == 2)
+
+    assert len(deepgram_stub.connections) == 2
+    # a different config gets its own connections
+    pool.prewarm(f"{url}?model=nova-2", EXTRA_HEADERS)
+    await wait_for(lambda: len(deepgram_stub.connections) == 3)
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_connections_are_kept_alive_and_expire(deepgram_stub: DeepgramStub):
+    pool = DeepgramConnectionPool(keepalive_interval_seconds=0.05, max_idle_seconds=0.3)
+    url = f"{deepgram_stub.url}/v1/listen"
+
+    pool.prewarm(url, EXTRA_HEADERS)
+    await wait_for(lambda: json.dumps({"type": "KeepAlive"}) in deepgram_stub.messages)
+    await wait_for(lambda: pool.num_idle_connections(url, EXTRA_HEADERS) == 0)
+
+    # the expired connection isn't handed out, a new one is dialed instead
+    connection = await pool.acquire(url, EXTRA_HEADERS)
+    assert len(deepgram_stub.connections) == 2
+
+    await connection.close()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_transcriber_uses_preconnected_connection(deepgram_stub: DeepgramStub):
+    transcriber = DeepgramTranscriber(
+        DeepgramTranscriberConfig(
+            sampling_rate=8000,
+            audio_encoding=AudioEncoding.MULAW,
+            chunk_size=160,
+            endpointing_config=PunctuationEndpointingConfig(),
+            api_key="test",
+            ws_url=deepgram_stub.url,
+        )
+    )
+
+    transcriber.preconnect()
+    await wait_for(lambda: len(deepgram_stub.connections) == 1)
+
+    async with transcriber._connect() as ws:
+        await ws.send(b"\xff" * 160)
+        await wait_for(lambda: len(deepgram_stub.messages) == 1)
+
+    assert len(deepgram_stub.connections) == 1
+    assert transcriber.preconnect_task is None
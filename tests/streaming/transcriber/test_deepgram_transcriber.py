@@ -0,0 +1,67 @@
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.transcriber import (
+    DeepgramTranscriberConfig,
+    PunctuationEndpointingConfig,
+)
+from vocode.streaming.transcriber.deepgram_transcriber import (
+    DeepgramTranscriber,
+    DeepgramTranscriptionResult,
+)
+
+
+def create_results_message(transcript: str, words: list, speech_final: bool = False) -> dict:
+    return {
+        "type": "Results",
+        "duration": 1.5,
+        "start": 2.0,
+        "is_final": True,
+        "speech_final": speech_final,
+        "channel": {
+            "alternatives": [{"transcript": transcript, "confidence": 0.9, "words": words}]
+        },
+    }
+
+
+def test_from_results_message():
+    words = [
+        {"word": "hello", "start": 2.1, "end": 2.4, "confidence": 0.9},
+        {"word": "there", "start": 2.5, "end": 2.9, "confidence": 0.9},
+    ]
+    result = DeepgramTranscriptionResult.from_results_message(
+        create_results_message("hello there", words)
+    )
+
+    assert result.is_final
+    assert not result.speech_final
+    assert result.start == 2.0
+    assert result.duration == 1.5
+    assert result.top_choice.transcript == "hello there"
+    assert result.top_choice.confidence == 0.9
+    # words aren't copied out of the message
+    assert result.top_choice.words is words
+
+
+def test_from_results_message_without_words():
+    data = create_results_message("", [])
+    del data["channel"]["alternatives"][0]["words"]
+    result = DeepgramTranscriptionResult.from_results_message(data)
+    assert result.top_choice.words == []
+
+
+def test_endpointing_with_lean_results():
+    transcriber = DeepgramTranscriber(
+        DeepgramTranscriberConfig(
+            sampling_rate=8000,
+            audio_encoding=AudioEncoding.MULAW,
+            chunk_size=160,
+            endpointing_config=PunctuationEndpointingConfig(),
+            api_key="test",
+        )
+    )
+    words = [{"word": "hello", "start": 2.1, "end": 2.4, "confidence": 0.9}]
+    result = DeepgramTranscriptionResult.from_results_message(
+        create_results_message("Hello.", words, speech_final=True)
+    )
+
+    assert transcriber.calculate_time_silent(result) == 3.5 - 2.4
+    assert transcriber.is_endpoint("Hello.", result, time_silent=0.0)
@@ -0,0 +1,109 @@
+import audioop
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.utils import convert_linear_audio, convert_wav
+from vocode.streaming.utils.audio_transcoder import (
+    AudioTranscoder,
+    AudioTranscoderBackend,
+    linear16_to_mulaw,
+    mulaw_to_linear16,
+)
+
+
+def sine_wave(sample_rate: int, seconds: float = 1.0, frequency: int = 300) -> bytes:
+    samples = np.arange(int(sample_rate * seconds))
+    return (
+        (np.sin(2 * np.pi * frequency * samples / sample_rate) * 10000).astype(np.int16).tobytes()
+    )
+
+
+def split_into_chunks(data: bytes, chunk_sizes: list[int]) -> list[bytes]:
+    chunks = []
+    idx = 0
+    while idx < len(data):
+        chunk_size = chunk_sizes[len(chunks) % len(chunk_sizes)]
+        chunks.append(data[idx : idx + chunk_size])
+        idx += chunk_size
+    return chunks
+
+
+def test_mulaw_tables_match_audioop():
+    all_mulaw_bytes = bytes(range(256))
+    assert mulaw_to_linear16(all_mulaw_bytes) == audioop.ulaw2lin(all_mulaw_bytes, 2)
+
+    all_linear16_samples = np.arange(-32768, 32768, dtype=np.int16).tobytes()
+    assert linear16_to_mulaw(all_linear16_samples) == audioop.lin2ulaw(all_linear16_samples, 2)
+
+
+@pytest.mark.parametrize("backend", list(AudioTranscoderBackend))
+@pytest.mark.parametrize(
+    "input_sample_rate,output_sample_rate",
+    [(24000, 8000), (22050, 16000), (44100, 48000)],
+)
+def test_chunked_transcoding_matches_single_pass(
+    backend: AudioTranscoderBackend, input_sample_rate: int, output_sample_rate: int
+):
+    audio = sine_wave(input_sample_rate)
+    transcoder = AudioTranscoder(input_sample_rate, output_sample_rate, backend=backend)
+
+    single_pass = np.frombuffer(transcoder.transcode(audio), dtype=np.int16)
+    transcoder.reset()
+    chunked = np.frombuffer(
+        b"".join(
+            transcoder.transcode(chunk) for chunk in split_into_chunks(audio, [202, 1600, 34])
+        ),
+        dtype=np.int16,
+    )
+
+    assert len(chunked) == len(single_pass)
+    assert abs(len(chunked) - output_sample_rate) <= 1
+    # only float rounding differences, no discontinuities at chunk boundaries
+    assert np.max(np.abs(chunked.astype(np.int32) - single_pass)) <= 2
+
+
+@pytest.mark.parametrize("backend", list(AudioTranscoderBackend))
+def test_mulaw_downsampling(backend: AudioTranscoderBackend):
+    audio = sine_wave(24000)
+    mulaw_audio = audioop.lin2ulaw(audio, 2)
+    transcoder = AudioTranscoder(
+        24000,
+        8000,
+        input_encoding=AudioEncoding.MULAW,
+        output_encoding=AudioEncoding.MULAW,
+        backend=backend,
+    )
+
+    output = b"".join(
+        transcoder.transcode(chunk) for chunk in split_into_chunks(mulaw_audio, [2400])
+    )
+
+    expected = np.frombuffer(audioop.ulaw2lin(audioop.lin2ulaw(sine_wave(8000), 2), 2), np.int16)
+    decoded_output = np.frombuffer(mulaw_to_linear16(output), dtype=np.int16)
+    assert len(output) == 8000
+    assert np.mean(np.abs(decoded_output.astype(np.int32) - expected)) < 200
+
+
+def test_passthrough():
+    transcoder = AudioTranscoder(8000, 8000, AudioEncoding.MULAW, AudioEncoding.MULAW)
+    assert transcoder.is_passthrough
+    assert transcoder.transcode(b"\x01\x02") == b"\x01\x02"
+
+
+def test_convert_wav_rejects_unsupported_sample_widths():
+    wav_file = io.BytesIO()
+    with wave.open(wav_file, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(1)
+        wav.setframerate(8000)
+        wav.writeframes(b"\x80" * 800)
+    wav_file.seek(0)
+
+    with pytest.raises(ValueError):
+        convert_wav(wav_file)
+    with pytest.raises(ValueError):
+        convert_linear_audio(b"\x00" * 800, output_sample_width=1)
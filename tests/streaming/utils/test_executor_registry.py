@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+import pytest
+
+from vocode.streaming.utils.executor_registry import BoundedExecutor, ExecutorRegistry
+from vocode.streaming.utils.singleton import Singleton
+
+
+@pytest.fixture(autouse=True)
+def cleanup_singleton_executor_registry():
+    yield
+    if ExecutorRegistry in Singleton._instances:
+        Singleton._instances.pop(ExecutorRegistry).shutdown()
+
+
+async def wait_for_stats(executor: BoundedExecutor, **expected_stats: int):
+    for _ in range(200):
+        stats = executor.get_stats()
+        if all(getattr(stats, key) == value for key, value in expected_stats.items()):
+            return
+        await asyncio.sleep(0.01)
+    stats = executor.get_stats()
+    assert {key: getattr(stats, key) for key in expected_stats} == expected_stats
+
+
+@pytest.mark.asyncio
+async def test_run_passes_args_and_kwargs():
+    executor = BoundedExecutor("test", max_workers=2, max_queue_size=2)
+    try:
+        assert await executor.run(lambda a, b=0: (a, b), 1, b=2) == (1, 2)
+        with pytest.raises(ValueError):
+            await executor.run(int, "not a number")
+        stats = executor.get_stats()
+        assert stats.num_completed == 2
+        assert stats.num_running == stats.num_queued == 0
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_applies_backpressure_when_queue_is_full():
+    executor = BoundedExecutor("test", max_workers=1, max_queue_size=1)
+    release = threading.Event()
+
+    def blocking_call(idx: int) -> int:
+        release.wait(timeout=5)
+        return idx
+
+    try:
+        tasks = [asyncio.create_task(executor.run(blocking_call, idx)) for idx in range(4)]
+        await wait_for_stats(executor, num_running=1, num_queued=1, num_waiting=2)
+        stats = executor.get_stats()
+        assert stats.saturation == 1.0
+        assert stats.num_backpressured == 2
+
+        release.set()
+        assert await asyncio.gather(*tasks) == [0, 1, 2, 3]
+        stats = executor.get_stats()
+        assert stats.num_completed == 4
+        assert stats.max_num_queued <= 2
+        assert stats.num_running == stats.num_queued == stats.num_waiting == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_callers_give_up_their_place():
+    executor = BoundedExecutor("test", max_workers=1, max_queue_size=0)
+    release = threading.Event()
+    try:
+        running = asyncio.create_task(executor.run(release.wait, 5))
+        waiting = asyncio.create_task(executor.run(lambda: "waiting"))
+        await wait_for_stats(executor, num_running=1, num_waiting=1)
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert executor.get_stats().num_waiting == 0
+
+        release.set()
+        await running
+        assert await executor.run(lambda: "next") == "next"
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_registry_shares_executors_by_name(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("VOCODE_TEST_SYNTHESIZER_EXECUTOR_MAX_WORKERS", "3")
+    registry = ExecutorRegistry()
+    executor = registry.get_executor("test_synthesizer", max_workers=1)
+
+    assert ExecutorRegistry().get_executor("test_synthesizer") is executor
+    assert executor.max_workers == 3
+    assert registry.get_executor("other", max_queue_size=5).max_queue_size == 5
+    assert set(registry.get_stats()) == {"test_synthesizer", "other"}
@@ -0,0 +1,62 @@
+import pytest
+
+from tests.fixtures.fake_openai_server import FakeOpenAIServer
+from vocode.streaming.agent.chat_gpt_agent import instantiate_openai_client
+from vocode.streaming.models.agent import ChatGPTAgentConfig
+from vocode.streaming.utils.llm_client_pool import LLMClientPool
+from vocode.streaming.utils.singleton import Singleton
+
+
+@pytest.fixture(autouse=True)
+def cleanup_llm_client_pool():
+    Singleton._instances.pop(LLMClientPool, None)
+    yield
+    Singleton._instances.pop(LLMClientPool, None)
+
+
+@pytest.mark.asyncio
+async def test_http_clients_are_shared_by_base_url_api_key_and_version():
+    llm_client_pool = LLMClientPool()
+    http_client = llm_client_pool.get_http_client("https://api.openai.com/v1/", "key")
+
+    assert llm_client_pool.get_http_client("https://api.openai.com/v1", "key") is http_client
+    assert llm_client_pool.get_http_client("https://api.openai.com/v1", "other") is not http_client
+    assert (
+        llm_client_pool.get_http_client("https://api.openai.com/v1", "key", "2024-06-01")
+        is not http_client
+    )
+    assert llm_client_pool.get_stats().num_clients == 3
+    assert llm_client_pool.get_stats().num_client_reuses == 1
+
+    await llm_client_pool.close()
+    assert http_client.is_closed
+    assert llm_client_pool.get_http_client("https://api.openai.com/v1", "key") is not http_client
+
+
+@pytest.mark.asyncio
+async def test_agents_reuse_warm_connections():
+    async with FakeOpenAIServer() as server:
+        agent_configs = [
+            ChatGPTAgentConfig(
+                prompt_preamble="",
+                openai_api_key="key",
+                base_url_override=server.base_url,
+            )
+            for _ in range(2)
+        ]
+        await LLMClientPool().prewarm(server.base_url, "key")
+        # each conversation creates its own client
+        for agent_config in agent_configs:
+            openai_client = instantiate_openai_client(agent_config)
+            for _ in range(2):
+                response = await openai_client.chat.completions.create(
+                    model="gpt-4o", messages=[{"role": "user", "content": "Hi"}]
+                )
+                assert response.choices[0].message.content == server.response_text
+
+        stats = LLMClientPool().get_stats()
+        assert server.num_connections == 1
+        # including the prewarming request
+        assert stats.num_requests == 5
+        assert stats.num_connections_opened == 1
+        await LLMClientPool().close()
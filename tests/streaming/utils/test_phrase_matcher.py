@@ -0,0 +1,129 @@
+import random
+import re
+
+import pytest
+
+from vocode.streaming.agent.phrase_trigger import matches_phrase_trigger
+from vocode.streaming.models.actions import (
+    ActionConfig,
+    PhraseBasedActionTrigger,
+    PhraseBasedActionTriggerConfig,
+    PhraseTrigger,
+)
+from vocode.streaming.streaming_conversation import BACKCHANNEL_MATCHER, BACKCHANNEL_PATTERNS
+from vocode.streaming.utils.phrase_matcher import (
+    MIN_PHRASES_FOR_AUTOMATON,
+    PhraseMatcher,
+    PhraseMatchType,
+)
+
+
+class PhraseMatcherTestActionConfig(ActionConfig, type="phrase_matcher_test"):
+    name: str
+
+
+def create_action_config(name: str, phrases):
+    return PhraseMatcherTestActionConfig(
+        name=name,
+        action_trigger=PhraseBasedActionTrigger(
+            config=PhraseBasedActionTriggerConfig(
+                phrase_triggers=[
+                    PhraseTrigger(phrase=phrase, conditions=["phrase_condition_type_contains"])
+                    for phrase in phrases
+                ]
+            )
+        ),
+    )
+
+
+@pytest.mark.parametrize("num_filler_phrases", [0, MIN_PHRASES_FOR_AUTOMATON])
+def test_first_phrase_wins_wherever_it_matches(num_filler_phrases: int):
+    filler_phrases = [(f"filler {idx}", "filler") for idx in range(num_filler_phrases)]
+    matcher = PhraseMatcher([("b c", "first"), ("ab", "second"), ("abc", "third")] + filler_phrases)
+    assert (matcher.automaton is not None) == bool(num_filler_phrases)
+    # "ab" starts before "b c", and overlaps it
+    assert matcher.search("ab c") == "first"
+    assert matcher.search("abc") == "second"
+    assert matcher.search("xyz") is None
+    assert PhraseMatcher([]).search("abc") is None
+
+
+@pytest.mark.parametrize("match_type", list(PhraseMatchType))
+def test_matches_reference_implementation(match_type: PhraseMatchType):
+    rng = random.Random(0)
+    alphabet = "ab c_"
+    for _ in range(200):
+        phrases = [
+            "".join(rng.choices(alphabet, k=rng.randint(1, 4)))
+            for _ in range(rng.choice([3, 2 * MIN_PHRASES_FOR_AUTOMATON]))
+        ]
+        matcher = PhraseMatcher([(phrase, idx) for idx, phrase in enumerate(phrases)], match_type)
+        for _ in range(5):
+            text = "".join(rng.choices(alphabet, k=rng.randint(0, 15)))
+            if match_type == PhraseMatchType.CONTAINS:
+                matched = [phrase in text for phrase in phrases]
+            elif match_type == PhraseMatchType.EXACT:
+                matched = [phrase == text for phrase in phrases]
+            else:
+                matched = [
+                    re.search(rf"(?<!\w){re.escape(phrase)}(?!\w)", text) is not None
+                    for phrase in phrases
+                ]
+            expected = matched.index(True) if any(matched) else None
+            assert matcher.search(text) == expected
+            assert matcher.matches(text) == (expected is not None)
+
+
+def test_match_types():
+    phrases = [("transfer", "transfer"), ("hang up", "hang up")]
+    contains = PhraseMatcher(phrases)
+    word_boundary = PhraseMatcher(phrases, match_type=PhraseMatchType.WORD_BOUNDARY)
+    exact = PhraseMatcher(phrases, match_type=PhraseMatchType.EXACT)
+
+    assert contains.matches("transferring you")
+    assert not word_boundary.matches("transferring you")
+    assert word_boundary.search("please hang up, transfer me") == "transfer"
+    assert not exact.matches("please hang up")
+    assert exact.search("hang up") == "hang up"
+
+
+def test_regex_phrases_with_groups():
+    matcher = PhraseMatcher(
+        [(r"(a|b)+", "ab"), (r"c(d)?", "cd")],
+        match_type=PhraseMatchType.EXACT,
+        is_regex=True,
+    )
+    assert matcher.search("abab") == "ab"
+    assert matcher.search("cd") == "cd"
+    assert matcher.search("abcd") is None
+
+
+def test_backchannel_matcher_matches_patterns():
+    for text in ["mmhm", "m-hmmm", "ohhh", "yeahh", "good heavens", "thats not bad", "", "yes sir"]:
+        assert BACKCHANNEL_MATCHER.matches(text) == any(
+            re.fullmatch(pattern, text) for pattern in BACKCHANNEL_PATTERNS
+        )
+
+
+def test_matches_phrase_trigger_matches_scan():
+    rng = random.Random(0)
+    vocabulary = ["call", "me", "back", "transfer", "now", "cancel", "order", "please"]
+    action_configs = [
+        create_action_config(
+            str(idx),
+            [" ".join(rng.choices(vocabulary, k=rng.randint(1, 2))) for _ in range(2)],
+        )
+        for idx in range(20)
+    ]
+
+    def scan(message: str):
+        cleaned = re.sub(r"[^\w\s]", "", message.lower())
+        for action_config in action_configs:
+            for phrase_trigger in action_config.action_trigger.config.phrase_triggers:
+                if phrase_trigger.phrase.lower() in cleaned:
+                    return action_config
+        return None
+
+    for _ in range(200):
+        message = " ".join(rng.choices(vocabulary, k=rng.randint(1, 6))).capitalize() + "!"
+        assert matches_phrase_trigger(message, action_configs) is scan(message)
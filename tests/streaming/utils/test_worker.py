@@ -0,0 +1,90 @@
+import asyncio
+import gc
+
+import pytest
+
+from vocode.streaming.utils.worker import (
+    InterruptEpoch,
+    InterruptibleAgentResponseEvent,
+    InterruptibleEvent,
+)
+
+
+def create_event(interrupt_epoch: InterruptEpoch, is_interruptible: bool = True):
+    return InterruptibleEvent(
+        "payload",
+        is_interruptible=is_interruptible,
+        interruption_event=interrupt_epoch.create_interruption_event(is_interruptible),
+    )
+
+
+def test_advance_interrupts_events_of_earlier_epochs():
+    interrupt_epoch = InterruptEpoch()
+    event = create_event(interrupt_epoch)
+    uninterruptible_event = create_event(interrupt_epoch, is_interruptible=False)
+    finished_event = create_event(interrupt_epoch)
+    # e.g. a worker finished processing it
+    finished_event.is_interruptible = False
+
+    assert interrupt_epoch.advance()
+    next_epoch_event = create_event(interrupt_epoch)
+
+    assert event.is_interrupted()
+    # the interruption event is what gets passed around as a stop event
+    assert event.interruption_event.is_set()
+    assert not uninterruptible_event.interruption_event.is_set()
+    assert not finished_event.interruption_event.is_set()
+    assert not next_epoch_event.is_interrupted()
+
+    # becoming uninterruptible after the interrupt doesn't undo it
+    event.is_interruptible = False
+    assert event.interruption_event.is_set()
+    assert interrupt_epoch.advance()
+    assert next_epoch_event.is_interrupted()
+
+
+def test_advance_returns_whether_anything_was_interruptible():
+    interrupt_epoch = InterruptEpoch()
+    create_event(interrupt_epoch, is_interruptible=False)
+    finished_event = create_event(interrupt_epoch)
+    finished_event.is_interruptible = False
+    interrupted_event = create_event(interrupt_epoch)
+    assert interrupted_event.interrupt()
+    assert not interrupt_epoch.advance()
+
+    create_event(interrupt_epoch)
+    gc.collect()
+    # doesn't depend on whether the garbage collector has run
+    assert interrupt_epoch.advance()
+    assert not interrupt_epoch.advance()
+
+
+def test_events_sharing_an_interruption_event_dont_make_it_uninterruptible():
+    interrupt_epoch = InterruptEpoch()
+    message_event = create_event(interrupt_epoch)
+    # like the output chunks of a message
+    chunk_event = InterruptibleEvent(
+        "chunk", is_interruptible=True, interruption_event=message_event.interruption_event
+    )
+    chunk_event.is_interruptible = False
+
+    assert interrupt_epoch.advance()
+    assert message_event.is_interrupted()
+
+
+@pytest.mark.asyncio
+async def test_advance_sets_agent_response_trackers():
+    interrupt_epoch = InterruptEpoch()
+    agent_response_tracker = asyncio.Event()
+    interrupt_epoch.track_agent_response(agent_response_tracker)
+    event = InterruptibleAgentResponseEvent(
+        "payload",
+        agent_response_tracker=agent_response_tracker,
+        is_interruptible=False,
+        interruption_event=interrupt_epoch.create_interruption_event(False),
+    )
+
+    assert not interrupt_epoch.advance()
+
+    assert not event.is_interrupted()
+    assert event.agent_response_tracker.is_set()
@@ -0,0 +1,130 @@
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from pytest_mock import MockerFixture
+
+from vocode.streaming.utils.singleton import Singleton
+from vocode.streaming.vector_db.base_vector_db import VectorDB
+from vocode.streaming.vector_db.embeddings import EmbeddingBatcher, EmbeddingCache
+
+
+@pytest.fixture(autouse=True)
+def cleanup_singletons(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("VOCODE_EMBEDDING_BATCH_WINDOW_SECONDS", "0.01")
+    for singleton_class in (EmbeddingBatcher, EmbeddingCache):
+        Singleton._instances.pop(singleton_class, None)
+    yield
+    for singleton_class in (EmbeddingBatcher, EmbeddingCache):
+        Singleton._instances.pop(singleton_class, None)
+
+
+def fake_embedding(text: str) -> List[float]:
+    return [float(len(text)), float(sum(map(ord, text)))]
+
+
+def create_vector_db(mocker: MockerFixture, requests: List[List[str]]) -> VectorDB:
+    vector_db = VectorDB(aiohttp_session=mocker.MagicMock())
+
+    async def create(input: List[str], model: str):
+        requests.append(input)
+        await asyncio.sleep(0)
+        # the API doesn't promise to return the embeddings in order
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=idx, embedding=fake_embedding(text))
+                for idx, text in reversed(list(enumerate(input)))
+            ]
+        )
+
+    mocker.patch.object(vector_db.openai_client.embeddings, "create", side_effect=create)
+    return vector_db
+
+
+@pytest.mark.asyncio
+async def test_concurrent_embeddings_are_batched_across_conversations(mocker: MockerFixture):
+    requests: List[List[str]] = []
+    first_vector_db = create_vector_db(mocker, requests)
+    second_vector_db = create_vector_db(mocker, requests)
+
+    embeddings = await asyncio.gather(
+        first_vector_db.create_openai_embedding("yes"),
+        second_vector_db.create_openai_embedding("what's your name?"),
+        second_vector_db.create_openai_embedding("yes"),
+    )
+
+    assert requests == [["yes", "what's your name?"]]
+    assert embeddings == [
+        fake_embedding("yes"),
+        fake_embedding("what's your name?"),
+        fake_embedding("yes"),
+    ]
+    assert EmbeddingBatcher().stats.num_coalesced_texts == 1
+
+    # cached now
+    assert await first_vector_db.create_openai_embeddings(["yes", "no", "yes"]) == [
+        fake_embedding("yes"),
+        fake_embedding("no"),
+        fake_embedding("yes"),
+    ]
+    assert requests == [["yes", "what's your name?"], ["no"]]
+    assert EmbeddingCache().get_stats().local_hits == 2
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_at_max_batch_size(
+    mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("VOCODE_EMBEDDING_MAX_BATCH_SIZE", "2")
+    monkeypatch.setenv("VOCODE_EMBEDDING_BATCH_WINDOW_SECONDS", "10")
+    requests: List[List[str]] = []
+    vector_db = create_vector_db(mocker, requests)
+
+    # the last batch is sent when the window closes, so this would time out
+    embeddings = await asyncio.wait_for(
+        vector_db.create_openai_embeddings(["a", "bb", "cc", "d"]), timeout=1
+    )
+
+    assert requests == [["a", "bb"], ["cc", "d"]]
+    assert embeddings == [fake_embedding(text) for text in ["a", "bb", "cc", "d"]]
+
+
+@pytest.mark.asyncio
+async def test_failed_request_fails_every_waiter(mocker: MockerFixture):
+    vector_db = VectorDB(aiohttp_session=mocker.MagicMock())
+    mocker.patch.object(
+        vector_db.openai_client.embeddings, "create", side_effect=ValueError("rate limited")
+    )
+
+    results = await asyncio.gather(
+        vector_db.create_openai_embedding("a"),
+        vector_db.create_openai_embedding("b"),
+        return_exceptions=True,
+    )
+
+    assert [str(result) for result in results] == ["rate limited", "rate limited"]
+    assert EmbeddingBatcher().batches == {}
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_between_processes(
+    mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("VOCODE_EMBEDDING_CACHE_USE_REDIS", "true")
+    mocker.patch(
+        "vocode.streaming.vector_db.embeddings.initialize_redis_bytes",
+        return_value=FakeAsyncRedis(),
+    )
+    requests: List[List[str]] = []
+    vector_db = create_vector_db(mocker, requests)
+    await vector_db.create_openai_embedding("hello")
+
+    # a new process has an empty local cache
+    Singleton._instances.pop(EmbeddingCache)
+    assert await vector_db.create_openai_embedding("hello") == fake_embedding("hello")
+
+    assert requests == [["hello"]]
+    assert EmbeddingCache().get_stats().redis_hits == 1
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from vocode.streaming.vector_db import local_index
+from vocode.streaming.vector_db.local_index import LocalVectorIndex, get_local_vector_index
+
+
+def create_index(path=None, num_embeddings: int = 50, dimensions: int = 16):
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(num_embeddings, dimensions))
+    index = LocalVectorIndex(path)
+    index.add(
+        embeddings,
+        texts=[f"text {idx}" for idx in range(num_embeddings)],
+        ids=[str(idx) for idx in range(num_embeddings)],
+        metadatas=[{"parity": idx % 2} for idx in range(num_embeddings)],
+    )
+    return index, embeddings
+
+
+def cosine_similarities(embeddings: np.ndarray, query: np.ndarray) -> np.ndarray:
+    return embeddings @ query / (np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query))
+
+
+def test_search_returns_most_similar_first():
+    index, embeddings = create_index()
+    query = embeddings[7] + 0.1
+    expected_similarities = cosine_similarities(embeddings, query)
+
+    results = index.search(query, top_k=5)
+
+    assert [row for row, _ in results] == list(np.argsort(-expected_similarities)[:5])
+    assert [score for _, score in results] == pytest.approx(
+        sorted(expected_similarities, reverse=True)[:5], abs=1e-5
+    )
+    assert len(index.search(query, top_k=100)) == 50
+
+
+def test_search_filters_by_namespace_and_metadata():
+    index, embeddings = create_index()
+    index.add([embeddings[0]], texts=["other"], ids=["other"], namespace="other")
+
+    assert index.search(embeddings[0], top_k=3, namespace="other") == [(50, pytest.approx(1.0))]
+    assert index.search(embeddings[0], top_k=3, namespace="missing") == []
+    results = index.search(embeddings[0], top_k=10, filter={"parity": {"$eq": 1}})
+    assert len(results) == 10
+    assert all(index.metadatas[row]["parity"] == 1 for row, _ in results)
+    with pytest.raises(ValueError):
+        index.search(embeddings[0], top_k=3, filter={"parity": {"$gt": 0}})
+
+
+def test_saved_index_is_memory_mapped_and_loaded_once(tmp_path):
+    index, embeddings = create_index(str(tmp_path))
+    index.save()
+
+    loaded_index = get_local_vector_index(str(tmp_path))
+
+    assert isinstance(loaded_index.embeddings, np.memmap)
+    assert loaded_index.ids == index.ids
+    assert loaded_index.search(embeddings[3], top_k=3) == index.search(embeddings[3], top_k=3)
+    assert get_local_vector_index(str(tmp_path)) is loaded_index
+    with pytest.raises(ValueError):
+        loaded_index.add([[1.0, 2.0]], texts=["wrong dimensions"], ids=["wrong"])
+
+
+def test_ivf_search_probes_the_closest_lists(tmp_path):
+    index, embeddings = create_index(str(tmp_path), num_embeddings=200)
+    exact_results = index.search(embeddings[0], top_k=5)
+    index.build_ivf(num_lists=10)
+
+    # probing every list is the same as searching every embedding
+    assert index.search(embeddings[0], top_k=5, num_probes=10) == exact_results
+    # the embedding itself is in the closest list
+    assert index.search(embeddings[0], top_k=1, num_probes=1)[0][0] == 0
+
+    index.add([embeddings[1]], texts=["copy"], ids=["copy"])
+    assert {row for row, _ in index.search(embeddings[1], top_k=2, num_probes=1)} == {1, 200}
+    index.save()
+    loaded_index = LocalVectorIndex.load(str(tmp_path))
+    assert loaded_index.ivf_assignments is not None
+    assert loaded_index.search(embeddings[1], top_k=2, num_probes=1) == index.search(
+        embeddings[1], top_k=2, num_probes=1
+    )
+
+
+def test_embeddings_added_while_building_ivf_get_lists(mocker):
+    index, embeddings = create_index(num_embeddings=200)
+    assign_to_centroids = local_index.assign_to_centroids
+
+    def add_while_training(*args):
+        # like add_texts on the event loop while build_ivf runs on a worker thread
+        if len(index) == 200:
+            index.add([embeddings[1]], texts=["copy"], ids=["copy"])
+        return assign_to_centroids(*args)
+
+    mocker.patch.object(local_index, "assign_to_centroids", side_effect=add_while_training)
+    index.build_ivf(num_lists=10)
+
+    assert index.ivf_assignments is not None
+    assert len(index.ivf_assignments) == 201
+    assert {row for row, _ in index.search(embeddings[1], top_k=2, num_probes=1)} == {1, 200}
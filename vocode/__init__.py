@@ -6,13 +6,9 @@ from uuid import UUID
 import sentry_sdk
 from loguru import logger
 
-from vocode.meta import ensure_punkt_installed
-
 environment = {}
 logger.disable("vocode")
 
-ensure_punkt_installed()
-
 
 class ContextWrapper:
     """Context Variable Wrapper."""
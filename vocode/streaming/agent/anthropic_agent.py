@@ -1,5 +1,6 @@
+import functools
 import os
-from typing import Any, AsyncGenerator, Dict
+from typing import Any, AsyncGenerator, Callable, Dict, Union
 
 import sentry_sdk
 from anthropic import AsyncAnthropic, AsyncStream
@@ -11,12 +12,15 @@ from vocode.streaming.action.default_factory import DefaultActionFactory
 from vocode.streaming.agent.anthropic_utils import format_anthropic_chat_messages_from_transcript
 from vocode.streaming.agent.base_agent import GeneratedResponse, RespondAgent, StreamedResponse
 from vocode.streaming.agent.streaming_utils import collate_response_async, stream_response_async
-from vocode.streaming.models.actions import FunctionFragment
+from vocode.streaming.models.actions import FunctionCall, FunctionFragment
 from vocode.streaming.models.agent import AnthropicAgentConfig
 from vocode.streaming.models.message import BaseMessage, LLMToken
+from vocode.streaming.utils.llm_client_pool import LLMClientPool
 from vocode.streaming.vector_db.factory import VectorDBFactory
 from vocode.utils.sentry_utils import CustomSentrySpans, sentry_create_span
 
+ANTHROPIC_DEFAULT_BASE_URL = "https://api.anthropic.com"
+
 
 class AnthropicAgent(RespondAgent[AnthropicAgentConfig]):
     anthropic_client: AsyncAnthropic
@@ -33,7 +37,13 @@ class AnthropicAgent(RespondAgent[AnthropicAgentConfig]):
             action_factory=action_factory,
             **kwargs,
         )
-        self.anthropic_client = AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+        api_key = os.environ.get("ANTHROPIC_API_KEY")
+        base_url = os.environ.get("ANTHROPIC_BASE_URL") or ANTHROPIC_DEFAULT_BASE_URL
+        self.anthropic_client = AsyncAnthropic(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=LLMClientPool().get_http_client(base_url, api_key),
+        )
 
     def get_chat_parameters(self, messages: list = [], use_functions: bool = True):
         assert self.transcript is not None
@@ -88,7 +98,12 @@ class AnthropicAgent(RespondAgent[AnthropicAgentConfig]):
             )
             raise e
 
-        response_generator = collate_response_async
+        response_generator: Callable[..., AsyncGenerator[Union[str, FunctionCall], None]] = (
+            functools.partial(
+                collate_response_async,
+                first_clause_min_words=self.agent_config.first_clause_min_words,
+            )
+        )
 
         using_input_streaming_synthesizer = (
             self.conversation_state_manager.using_input_streaming_synthesizer()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import json
 import random
 import typing
@@ -31,8 +32,18 @@ from vocode.streaming.action.phone_call_action import (
     VonagePhoneConversationAction,
 )
 from vocode.streaming.action.wait import WaitResponse, WaitVocodeActionConfig
-from vocode.streaming.agent.goodbye import is_goodbye_simple
-from vocode.streaming.agent.phrase_trigger import matches_phrase_trigger
+from vocode.streaming.agent.goodbye import create_goodbye_matcher, is_goodbye_simple
+from vocode.streaming.agent.phrase_trigger import (
+    create_phrase_trigger_matcher,
+    matches_phrase_trigger,
+)
+from vocode.streaming.agent.speculative_generation import (
+    SpeculationKey,
+    SpeculativeGeneration,
+    SpeculativeGenerationStats,
+    get_transcript_fingerprint,
+    normalize_transcript_text,
+)
 from vocode.streaming.models.actions import (
     ActionConfig,
     ActionInput,
@@ -61,6 +72,12 @@ if TYPE_CHECKING:
     from vocode.streaming.utils.state_manager import AbstractConversationStateManager
 
 AGENT_TRACE_NAME = "agent"
+
+# set in the tasks of speculative generations, see RespondAgent.speculate; keyed by agent, since
+# anything those tasks start inherits the context
+_speculative_transcript: contextvars.ContextVar[Optional[Tuple[BaseAgent, Transcript]]] = (
+    contextvars.ContextVar("speculative_transcript", default=None)
+)
 POST_QUESTION_BACKCHANNELS = [
     "Oh okay, got it.",
     "Oh, okay, got it.",
@@ -182,9 +199,17 @@ class BaseAgent(AbstractAgent[AgentConfigType], InterruptibleWorker):
             interruptible_event_factory=interruptible_event_factory,
         )
         self.action_factory = action_factory
-        self.transcript: Optional[Transcript] = None
+        self._transcript: Optional[Transcript] = None
+        self.speculative_generation: Optional[SpeculativeGeneration] = None
+        self.speculative_generation_stats = SpeculativeGenerationStats()
 
         self.functions = self.get_functions() if self.agent_config.actions else None
+        self.goodbye_matcher = create_goodbye_matcher(self.agent_config.goodbye_phrases)
+        self.phrase_trigger_matcher = (
+            create_phrase_trigger_matcher(self.agent_config.actions)
+            if self.agent_config.actions
+            else None
+        )
         self.is_muted = False
 
         self.post_question_bot_backchannel_randomizer = unrepeating_randomizer(
@@ -194,6 +219,17 @@ class BaseAgent(AbstractAgent[AgentConfigType], InterruptibleWorker):
     def get_functions(self):
         raise NotImplementedError
 
+    @property
+    def transcript(self) -> Optional[Transcript]:
+        speculative_transcript = _speculative_transcript.get()
+        if speculative_transcript is not None and speculative_transcript[0] is self:
+            return speculative_transcript[1]
+        return self._transcript
+
+    @transcript.setter
+    def transcript(self, transcript: Optional[Transcript]):
+        self._transcript = transcript
+
     def attach_transcript(self, transcript: Transcript):
         self.transcript = transcript
 
@@ -231,6 +267,11 @@ class BaseAgent(AbstractAgent[AgentConfigType], InterruptibleWorker):
 
         return num_bot_messages <= (1 if self.agent_config.initial_message is not None else 0)
 
+    def speculate(self, transcription: Transcription, conversation_id: str):
+        """Called with stable interim transcripts when speculative generation is configured.
+        Agents that can't generate responses ahead of the final transcript ignore it."""
+        pass
+
 
 class RespondAgent(BaseAgent[AgentConfigType]):
     async def _maybe_prepend_interrupt_responses(
@@ -255,19 +296,108 @@ class RespondAgent(BaseAgent[AgentConfigType]):
         async for response in responses_stream:
             yield response
 
+    def get_speculation_key(self, transcription: Transcription) -> SpeculationKey:
+        assert self.transcript is not None
+        return SpeculationKey(
+            text=normalize_transcript_text(transcription.message),
+            is_interrupt=transcription.is_interrupt,
+            bot_was_in_medias_res=transcription.bot_was_in_medias_res,
+            transcript_fingerprint=get_transcript_fingerprint(self.transcript),
+        )
+
+    def speculate(self, transcription: Transcription, conversation_id: str):
+        """Starts generating a response to an interim transcript, as if it was final. If the final
+        transcript turns out to be the same, the response is committed instead of generating a new
+        one, so the LLM's time to first token overlaps with endpointing."""
+        key = self.get_speculation_key(transcription)
+        if self.speculative_generation is not None:
+            if self.speculative_generation.key == key:
+                return
+            self.speculative_generation_stats.num_restarts += 1
+            self.discard_speculative_generation()
+        if (
+            self.is_muted
+            or not self.agent_config.generate_responses
+            or (self.current_task is not None and not self.current_task.done())
+        ):
+            return
+
+        assert self._transcript is not None
+        speculative_transcript = Transcript(
+            event_logs=list(self._transcript.event_logs),
+            start_time=self._transcript.start_time,
+        )
+        speculative_transcript.add_human_message(
+            text=transcription.message, conversation_id=conversation_id
+        )
+
+        async def generate_speculatively() -> AsyncGenerator[GeneratedResponse, None]:
+            # only visible to this generation's task
+            _speculative_transcript.set((self, speculative_transcript))
+            async for response in self.generate_response(
+                transcription.message,
+                is_interrupt=transcription.is_interrupt,
+                conversation_id=conversation_id,
+                bot_was_in_medias_res=transcription.bot_was_in_medias_res,
+            ):
+                yield response
+
+        logger.debug(f"Speculatively generating a response to: {transcription.message}")
+        self.speculative_generation_stats.num_speculations += 1
+        self.speculative_generation = SpeculativeGeneration(key, generate_speculatively())
+
+    def discard_speculative_generation(self):
+        if self.speculative_generation is None:
+            return
+        self.finish_speculative_generation(self.speculative_generation)
+        self.speculative_generation = None
+
+    def finish_speculative_generation(self, speculative_generation: SpeculativeGeneration):
+        """Cancels what's left of a speculative generation, and records whether its responses were
+        used and how much of it was generated for nothing."""
+        if speculative_generation.num_committed_responses > 0:
+            self.speculative_generation_stats.num_hits += 1
+        self.speculative_generation_stats.num_wasted_responses += len(
+            speculative_generation.uncommitted_responses
+        )
+        self.speculative_generation_stats.num_wasted_tokens += speculative_generation.cancel()
+
+    def pop_speculative_generation(
+        self, transcription: Transcription
+    ) -> Optional[SpeculativeGeneration]:
+        """Returns the speculative generation for the final `transcription`, if there's one, and
+        discards it otherwise. Must be called before the transcription is added to the transcript,
+        and the generation passed to `finish_speculative_generation` once it's been used.
+        """
+        if self.speculative_generation is None:
+            return None
+        if self.speculative_generation.key != self.get_speculation_key(transcription):
+            logger.debug("Final transcript doesn't match the speculative generation, discarding it")
+            self.speculative_generation_stats.num_misses += 1
+            self.discard_speculative_generation()
+            return None
+        speculative_generation = self.speculative_generation
+        self.speculative_generation = None
+        return speculative_generation
+
     async def handle_generate_response(
         self,
         transcription: Transcription,
         agent_input: AgentInput,
+        speculative_generation: Optional[SpeculativeGeneration] = None,
     ) -> bool:
         conversation_id = agent_input.conversation_id
         responses = self._maybe_prepend_interrupt_responses(
             transcription=transcription,
-            responses_stream=self.generate_response(
-                transcription.message,
-                is_interrupt=transcription.is_interrupt,
-                conversation_id=conversation_id,
-                bot_was_in_medias_res=transcription.bot_was_in_medias_res,
+            responses_stream=(
+                speculative_generation.commit()
+                if speculative_generation is not None
+                else self.generate_response(
+                    transcription.message,
+                    is_interrupt=transcription.is_interrupt,
+                    conversation_id=conversation_id,
+                    bot_was_in_medias_res=transcription.bot_was_in_medias_res,
+                )
             ),
         )
         is_first_response_of_turn = True
@@ -326,6 +456,7 @@ class RespondAgent(BaseAgent[AgentConfigType]):
                 if is_goodbye_simple(
                     message=generated_response.message.text,
                     phrases=self.agent_config.goodbye_phrases,
+                    goodbye_matcher=self.goodbye_matcher,
                 ):
                     logger.debug("Simple goodbye detected, ending conversation")
                     return True
@@ -348,7 +479,11 @@ class RespondAgent(BaseAgent[AgentConfigType]):
             )
 
         phrase_trigger_match_action_config = (
-            matches_phrase_trigger(responses_buffer, self.agent_config.actions)
+            matches_phrase_trigger(
+                responses_buffer,
+                self.agent_config.actions,
+                phrase_trigger_matcher=self.phrase_trigger_matcher,
+            )
             if self.agent_config.actions
             else None
         )
@@ -398,10 +533,12 @@ class RespondAgent(BaseAgent[AgentConfigType]):
 
     async def process(self, item: InterruptibleEvent[AgentInput]):
         assert self.transcript is not None
+        speculative_generation: Optional[SpeculativeGeneration] = None
         try:
             agent_input = item.payload
             if isinstance(agent_input, TranscriptionAgentInput):
                 transcription = typing.cast(TranscriptionAgentInput, agent_input).transcription
+                speculative_generation = self.pop_speculative_generation(transcription)
                 self.transcript.add_human_message(
                     text=transcription.message,
                     conversation_id=agent_input.conversation_id,
@@ -466,7 +603,9 @@ class RespondAgent(BaseAgent[AgentConfigType]):
                         sentry_callable=sentry_sdk.start_span,
                         op=CustomSentrySpans.LANGUAGE_MODEL_TIME_TO_FIRST_TOKEN,
                     )
-                should_stop = await self.handle_generate_response(transcription, agent_input)
+                should_stop = await self.handle_generate_response(
+                    transcription, agent_input, speculative_generation=speculative_generation
+                )
             else:
                 should_stop = await self.handle_respond(transcription, agent_input.conversation_id)
 
@@ -480,6 +619,13 @@ class RespondAgent(BaseAgent[AgentConfigType]):
                 return
         except asyncio.CancelledError:
             pass
+        finally:
+            if speculative_generation is not None:
+                self.finish_speculative_generation(speculative_generation)
+
+    async def terminate(self):
+        self.discard_speculative_generation()
+        return await super().terminate()
 
     def _get_action_config(self, function_name: str) -> Optional[ActionConfig]:
         if self.agent_config.actions is None:
@@ -1,27 +1,40 @@
+import functools
 import os
 import random
-from typing import Any, AsyncGenerator, Dict, List, Optional, TypeVar, Union
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 import sentry_sdk
 from loguru import logger
 from openai import DEFAULT_MAX_RETRIES as OPENAI_DEFAULT_MAX_RETRIES
-from openai import AsyncAzureOpenAI, AsyncOpenAI, NotFoundError, RateLimitError
+from openai import AsyncAzureOpenAI, AsyncOpenAI, AsyncStream, NotFoundError, RateLimitError
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from vocode import sentry_span_tags
 from vocode.streaming.action.abstract_factory import AbstractActionFactory
 from vocode.streaming.action.default_factory import DefaultActionFactory
 from vocode.streaming.agent.base_agent import GeneratedResponse, RespondAgent, StreamedResponse
+from vocode.streaming.agent.llm_hedging import LLMHedger
 from vocode.streaming.agent.openai_utils import (
     format_openai_chat_messages_from_transcript,
     openai_get_tokens,
     vector_db_result_to_openai_chat_message,
 )
 from vocode.streaming.agent.streaming_utils import collate_response_async, stream_response_async
-from vocode.streaming.models.actions import FunctionCallActionTrigger
+from vocode.streaming.agent.token_utils import num_tokens_from_functions
+from vocode.streaming.models.actions import FunctionCall, FunctionCallActionTrigger
 from vocode.streaming.models.agent import ChatGPTAgentConfig
-from vocode.streaming.models.events import Sender
 from vocode.streaming.models.message import BaseMessage, BotBackchannel, LLMToken
-from vocode.streaming.models.transcript import Message
+from vocode.streaming.utils.llm_client_pool import LLMClientPool
 from vocode.streaming.vector_db.factory import VectorDBFactory
 from vocode.utils.sentry_utils import CustomSentrySpans, sentry_create_span
 
@@ -29,22 +42,31 @@ ChatGPTAgentConfigType = TypeVar("ChatGPTAgentConfigType", bound=ChatGPTAgentCon
 
 
 def instantiate_openai_client(agent_config: ChatGPTAgentConfig, model_fallback: bool = False):
+    llm_client_pool = LLMClientPool()
     if agent_config.azure_params:
         return AsyncAzureOpenAI(
             azure_endpoint=agent_config.azure_params.base_url,
             api_key=agent_config.azure_params.api_key,
             api_version=agent_config.azure_params.api_version,
             max_retries=0 if model_fallback else OPENAI_DEFAULT_MAX_RETRIES,
+            http_client=llm_client_pool.get_http_client(
+                agent_config.azure_params.base_url,
+                agent_config.azure_params.api_key,
+                agent_config.azure_params.api_version,
+            ),
         )
     else:
         if agent_config.openai_api_key is not None:
             logger.info("Using OpenAI API key override")
         if agent_config.base_url_override is not None:
             logger.info(f"Using OpenAI base URL override: {agent_config.base_url_override}")
+        api_key = agent_config.openai_api_key or os.environ["OPENAI_API_KEY"]
+        base_url = agent_config.base_url_override or "https://api.openai.com/v1"
         return AsyncOpenAI(
-            api_key=agent_config.openai_api_key or os.environ["OPENAI_API_KEY"],
-            base_url=agent_config.base_url_override or "https://api.openai.com/v1",
+            api_key=api_key,
+            base_url=base_url,
             max_retries=0 if model_fallback else OPENAI_DEFAULT_MAX_RETRIES,
+            http_client=llm_client_pool.get_http_client(base_url, api_key),
         )
 
 
@@ -70,9 +92,24 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfigType]):
         if not self.openai_client.api_key:
             raise ValueError("OPENAI_API_KEY must be set in environment or passed in")
 
+        self.llm_hedger: Optional[LLMHedger] = None
+        # None to send hedged requests with the primary client
+        self.hedge_openai_client: Optional[AsyncOpenAI] = None
+        if self.agent_config.llm_hedge is not None:
+            self.llm_hedger = LLMHedger(self.agent_config.llm_hedge)
+            if self.agent_config.llm_hedge.provider == "azure" and not self._is_azure_model():
+                raise ValueError("Hedging with an Azure deployment requires azure_params")
+            if self.agent_config.llm_hedge.provider == "openai" and self._is_azure_model():
+                self.hedge_openai_client = instantiate_openai_client(
+                    self.agent_config.copy(update={"azure_params": None})
+                )
+
         if self.agent_config.vector_db_config:
             self.vector_db = vector_db_factory.create_vector_db(self.agent_config.vector_db_config)
 
+        # model name -> number of tokens the function schemas add to the prompt
+        self.functions_num_tokens: Dict[str, int] = {}
+
     def get_functions(self):
         assert self.agent_config.actions
         if not self.action_factory:
@@ -83,17 +120,29 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfigType]):
             if isinstance(action_config.action_trigger, FunctionCallActionTrigger)
         ]
 
-    def get_chat_parameters(self, messages: Optional[List] = None, use_functions: bool = True):
-        assert self.transcript is not None
-        is_azure = self._is_azure_model()
+    def get_functions_num_tokens(self, model_name: str) -> int:
+        if model_name not in self.functions_num_tokens:
+            self.functions_num_tokens[model_name] = num_tokens_from_functions(
+                functions=self.functions, model=model_name
+            )
+        return self.functions_num_tokens[model_name]
 
-        messages = messages or format_openai_chat_messages_from_transcript(
+    def format_openai_chat_messages(self, model_name: str) -> List[dict]:
+        assert self.transcript is not None
+        return format_openai_chat_messages_from_transcript(
             self.transcript,
-            self.get_model_name_for_tokenizer(),
+            model_name,
             self.functions,
             self.agent_config.prompt_preamble,
+            functions_num_tokens=self.get_functions_num_tokens(model_name),
         )
 
+    def get_chat_parameters(self, messages: Optional[List] = None, use_functions: bool = True):
+        assert self.transcript is not None
+        is_azure = self._is_azure_model()
+
+        messages = messages or self.format_openai_chat_messages(self.get_model_name_for_tokenizer())
+
         parameters: Dict[str, Any] = {
             "messages": messages,
             "max_tokens": self.agent_config.max_tokens,
@@ -141,7 +190,7 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfigType]):
 
     async def _create_openai_stream_with_fallback(
         self, chat_parameters: Dict[str, Any]
-    ) -> AsyncGenerator:
+    ) -> AsyncStream[ChatCompletionChunk]:
         try:
             stream = await self.openai_client.chat.completions.create(**chat_parameters)
         except (NotFoundError, RateLimitError) as e:
@@ -153,13 +202,36 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfigType]):
             stream = await self.openai_client.chat.completions.create(**chat_parameters)
         return stream
 
-    async def _create_openai_stream(self, chat_parameters: Dict[str, Any]) -> AsyncGenerator:
+    async def _create_primary_openai_stream(
+        self, chat_parameters: Dict[str, Any]
+    ) -> AsyncStream[ChatCompletionChunk]:
         if self.agent_config.llm_fallback is not None and self.openai_client.max_retries == 0:
             stream = await self._create_openai_stream_with_fallback(chat_parameters)
         else:
             stream = await self.openai_client.chat.completions.create(**chat_parameters)
         return stream
 
+    async def _create_hedge_openai_stream(
+        self, chat_parameters: Dict[str, Any]
+    ) -> AsyncStream[ChatCompletionChunk]:
+        assert self.agent_config.llm_hedge is not None
+        return await (self.hedge_openai_client or self.openai_client).chat.completions.create(
+            **{**chat_parameters, "model": self.agent_config.llm_hedge.model_name}
+        )
+
+    async def _create_openai_stream(
+        self, chat_parameters: Dict[str, Any]
+    ) -> AsyncIterable[ChatCompletionChunk]:
+        if self.llm_hedger is None:
+            return await self._create_primary_openai_stream(chat_parameters)
+        # copied, since falling back to another model changes the model in the parameters
+        primary_chat_parameters = dict(chat_parameters)
+        return await self.llm_hedger.create_stream(
+            chat_parameters["model"],
+            functools.partial(self._create_primary_openai_stream, primary_chat_parameters),
+            functools.partial(self._create_hedge_openai_stream, chat_parameters),
+        )
+
     def should_backchannel(self, human_input: str) -> bool:
         return (
             not self.is_first_response()
@@ -170,11 +242,7 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfigType]):
     def choose_backchannel(self) -> Optional[BotBackchannel]:
         backchannel = None
         if self.transcript is not None:
-            last_bot_message: Optional[Message] = None
-            for event_log in self.transcript.event_logs[::-1]:
-                if isinstance(event_log, Message) and event_log.sender == Sender.BOT:
-                    last_bot_message = event_log
-                    break
+            last_bot_message = self.transcript.get_last_bot_message()
             if last_bot_message and last_bot_message.text.strip().endswith("?"):
                 return BotBackchannel(text=self.post_question_bot_backchannel_randomizer())
         return backchannel
@@ -206,12 +274,7 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfigType]):
                 vector_db_result = (
                     f"Found {len(docs_with_scores)} similar documents:\n{docs_with_scores_str}"
                 )
-                messages = format_openai_chat_messages_from_transcript(
-                    self.transcript,
-                    self.agent_config.model_name,
-                    self.functions,
-                    self.agent_config.prompt_preamble,
-                )
+                messages = self.format_openai_chat_messages(self.agent_config.model_name)
                 messages.insert(-1, vector_db_result_to_openai_chat_message(vector_db_result))
                 chat_parameters = self.get_chat_parameters(messages)
             except Exception as e:
@@ -259,7 +322,12 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfigType]):
 
         stream = await self._create_openai_stream(chat_parameters)
 
-        response_generator = collate_response_async
+        response_generator: Callable[..., AsyncGenerator[Union[str, FunctionCall], None]] = (
+            functools.partial(
+                collate_response_async,
+                first_clause_min_words=self.agent_config.first_clause_min_words,
+            )
+        )
         using_input_streaming_synthesizer = (
             self.conversation_state_manager.using_input_streaming_synthesizer()
         )
@@ -1,13 +1,27 @@
-import re
 from typing import List, Optional
 
+from vocode.streaming.utils.phrase_matcher import PhraseMatcher, remove_punctuation
+
 _GOODBYE_PHRASES = [
     "bye",
 ]
 
 
-def is_goodbye_simple(message: str, phrases: Optional[List[str]]):
+def create_goodbye_matcher(phrases: Optional[List[str]]) -> PhraseMatcher[str]:
     if not phrases:
         phrases = _GOODBYE_PHRASES
-    cleaned = re.sub(r"[^\w\s]", "", message.lower())
-    return any(phrase in cleaned for phrase in phrases)
+    return PhraseMatcher([(phrase, phrase) for phrase in phrases])
+
+
+_DEFAULT_GOODBYE_MATCHER = create_goodbye_matcher(None)
+
+
+def is_goodbye_simple(
+    message: str,
+    phrases: Optional[List[str]],
+    goodbye_matcher: Optional[PhraseMatcher[str]] = None,
+):
+    if goodbye_matcher is None:
+        goodbye_matcher = create_goodbye_matcher(phrases) if phrases else _DEFAULT_GOODBYE_MATCHER
+    cleaned = remove_punctuation(message.lower())
+    return goodbye_matcher.matches(cleaned)
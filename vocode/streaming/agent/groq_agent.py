@@ -1,6 +1,7 @@
+import functools
 import os
 import random
-from typing import Any, AsyncGenerator, Dict, List, Optional, TypeVar, Union
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, TypeVar, Union
 
 import sentry_sdk
 from groq import AsyncGroq
@@ -17,14 +18,16 @@ from vocode.streaming.agent.openai_utils import (
     vector_db_result_to_openai_chat_message,
 )
 from vocode.streaming.agent.streaming_utils import collate_response_async, stream_response_async
-from vocode.streaming.models.actions import FunctionCallActionTrigger
+from vocode.streaming.models.actions import FunctionCall, FunctionCallActionTrigger
 from vocode.streaming.models.agent import GroqAgentConfig
-from vocode.streaming.models.events import Sender
 from vocode.streaming.models.message import BaseMessage, BotBackchannel, LLMToken
-from vocode.streaming.models.transcript import EventLog, Message, Transcript
+from vocode.streaming.models.transcript import EventLog, Transcript
+from vocode.streaming.utils.llm_client_pool import LLMClientPool
 from vocode.streaming.vector_db.factory import VectorDBFactory
 from vocode.utils.sentry_utils import CustomSentrySpans, sentry_create_span
 
+GROQ_DEFAULT_BASE_URL = "https://api.groq.com"
+
 
 class GroqAgent(RespondAgent[GroqAgentConfig]):
     groq_client: AsyncGroq
@@ -41,7 +44,13 @@ class GroqAgent(RespondAgent[GroqAgentConfig]):
             action_factory=action_factory,
             **kwargs,
         )
-        self.groq_client = AsyncGroq(api_key=os.environ.get("GROQ_API_KEY"))
+        api_key = os.environ.get("GROQ_API_KEY")
+        base_url = os.environ.get("GROQ_BASE_URL") or GROQ_DEFAULT_BASE_URL
+        self.groq_client = AsyncGroq(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=LLMClientPool().get_http_client(base_url, api_key),
+        )
 
         if not self.groq_client.api_key:
             raise ValueError("GROQ_API_KEY must be set in environment or passed in")
@@ -116,11 +125,7 @@ class GroqAgent(RespondAgent[GroqAgentConfig]):
     def choose_backchannel(self) -> Optional[BotBackchannel]:
         backchannel = None
         if self.transcript is not None:
-            last_bot_message: Optional[Message] = None
-            for event_log in self.transcript.event_logs[::-1]:
-                if isinstance(event_log, Message) and event_log.sender == Sender.BOT:
-                    last_bot_message = event_log
-                    break
+            last_bot_message = self.transcript.get_last_bot_message()
             if last_bot_message and last_bot_message.text.strip().endswith("?"):
                 return BotBackchannel(text=self.post_question_bot_backchannel_randomizer())
         return backchannel
@@ -203,7 +208,12 @@ class GroqAgent(RespondAgent[GroqAgentConfig]):
 
         stream = await self._create_groq_stream(chat_parameters)
 
-        response_generator = collate_response_async
+        response_generator: Callable[..., AsyncGenerator[Union[str, FunctionCall], None]] = (
+            functools.partial(
+                collate_response_async,
+                first_clause_min_words=self.agent_config.first_clause_min_words,
+            )
+        )
         using_input_streaming_synthesizer = (
             self.conversation_state_manager.using_input_streaming_synthesizer()
         )
@@ -1,4 +1,5 @@
-from typing import AsyncGenerator, AsyncIterator, Optional
+import functools
+from typing import AsyncGenerator, AsyncIterator, Callable, Optional, Union
 
 import sentry_sdk
 from langchain.chat_models import init_chat_model
@@ -12,6 +13,7 @@ from vocode.streaming.action.default_factory import DefaultActionFactory
 from vocode.streaming.agent.anthropic_utils import merge_bot_messages_for_langchain
 from vocode.streaming.agent.base_agent import GeneratedResponse, RespondAgent, StreamedResponse
 from vocode.streaming.agent.streaming_utils import collate_response_async, stream_response_async
+from vocode.streaming.models.actions import FunctionCall
 from vocode.streaming.models.agent import LangchainAgentConfig
 from vocode.streaming.models.events import Sender
 from vocode.streaming.models.message import BaseMessage, LLMToken
@@ -110,7 +112,12 @@ class LangchainAgent(RespondAgent[LangchainAgentConfig]):
             )
             raise e
 
-        response_generator = collate_response_async
+        response_generator: Callable[..., AsyncGenerator[Union[str, FunctionCall], None]] = (
+            functools.partial(
+                collate_response_async,
+                first_clause_min_words=self.agent_config.first_clause_min_words,
+            )
+        )
 
         using_input_streaming_synthesizer = (
             self.conversation_state_manager.using_input_streaming_synthesizer()
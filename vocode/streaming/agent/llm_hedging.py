@@ -0,0 +1,214 @@
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+from loguru import logger
+from openai import AsyncStream
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
+
+from vocode.streaming.models.agent import LLMHedge
+from vocode.streaming.utils.create_task import asyncio_create_task
+from vocode.streaming.utils.singleton import Singleton
+
+FIRST_TOKEN_LATENCY_WINDOW_SIZE = 200
+# fewer samples than this and the percentile says more about luck than about the model
+MIN_FIRST_TOKEN_LATENCY_SAMPLES = 20
+
+CreateStream = Callable[[], Awaitable[AsyncStream[ChatCompletionChunk]]]
+
+
+def chunk_has_first_token(chunk: ChatCompletionChunk) -> bool:
+    # the first chunk usually only has the assistant role, and arrives as soon as the request
+    # is accepted
+    if not chunk.choices:
+        return False
+    choice = chunk.choices[0]
+    return bool(
+        choice.delta.content
+        or choice.delta.function_call is not None
+        or choice.delta.tool_calls
+        or choice.finish_reason
+    )
+
+
+@dataclass
+class LLMHedgeStats:
+    num_requests: int = 0
+    # the primary model missed the deadline and the request was also sent to the backup
+    num_hedged: int = 0
+    num_backup_wins: int = 0
+    # estimated from the primary model's recent times to first token, see
+    # FirstTokenLatencies.estimate_remaining_seconds
+    latency_won_seconds: float = 0.0
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.num_hedged / self.num_requests if self.num_requests else 0.0
+
+
+class FirstTokenLatencies(Singleton):
+    """The recent times to first token of each model, across every conversation in the process."""
+
+    def __init__(self):
+        self.latencies_by_model: Dict[str, Deque[float]] = {}
+
+    def record(self, model: str, seconds: float):
+        latencies = self.latencies_by_model.setdefault(
+            model, deque(maxlen=FIRST_TOKEN_LATENCY_WINDOW_SIZE)
+        )
+        latencies.append(seconds)
+
+    def get_percentile(self, model: str, percentile: float) -> Optional[float]:
+        latencies = self.latencies_by_model.get(model)
+        if latencies is None or len(latencies) < MIN_FIRST_TOKEN_LATENCY_SAMPLES:
+            return None
+        sorted_latencies = sorted(latencies)
+        idx = max(math.ceil(percentile * len(sorted_latencies)) - 1, 0)
+        return sorted_latencies[min(idx, len(sorted_latencies) - 1)]
+
+    def estimate_remaining_seconds(self, model: str, elapsed_seconds: float) -> float:
+        """How much longer a request to `model` that's been silent for `elapsed_seconds` would
+        have taken to stream its first token: the mean of the slower recent latencies, less the
+        time elapsed. Requests cancelled before their first token are recorded at the time they
+        were cancelled, so this underestimates."""
+        slower_latencies = [
+            latency
+            for latency in self.latencies_by_model.get(model, ())
+            if latency > elapsed_seconds
+        ]
+        if not slower_latencies:
+            return 0.0
+        return sum(slower_latencies) / len(slower_latencies) - elapsed_seconds
+
+
+class FirstTokenStream:
+    """A chat completion stream that's been read up to its first token, which is replayed."""
+
+    def __init__(
+        self,
+        stream: AsyncStream[ChatCompletionChunk],
+        buffered_chunks: List[ChatCompletionChunk],
+        time_to_first_token: float,
+    ):
+        self.stream = stream
+        self.buffered_chunks = buffered_chunks
+        self.time_to_first_token = time_to_first_token
+
+    async def __aiter__(self) -> AsyncIterator[ChatCompletionChunk]:
+        for chunk in self.buffered_chunks:
+            yield chunk
+        async for chunk in self.stream:
+            yield chunk
+
+    async def close(self):
+        await self.stream.close()
+
+
+async def read_until_first_token(create_stream: CreateStream) -> FirstTokenStream:
+    start_time = time.monotonic()
+    stream = await create_stream()
+    buffered_chunks: List[ChatCompletionChunk] = []
+    try:
+        # not `async for`, which would close the stream when we stop reading
+        while not buffered_chunks or not chunk_has_first_token(buffered_chunks[-1]):
+            try:
+                buffered_chunks.append(await stream.__anext__())
+            except StopAsyncIteration:
+                break
+    except BaseException:
+        # give the connection back to the pool
+        await stream.close()
+        raise
+    return FirstTokenStream(stream, buffered_chunks, time.monotonic() - start_time)
+
+
+async def _discard(task: "asyncio.Task[FirstTokenStream]"):
+    task.cancel()
+    try:
+        first_token_stream = await task
+    except (asyncio.CancelledError, Exception):
+        return
+    # it streamed its first token before it could be cancelled
+    await first_token_stream.close()
+
+
+class LLMHedger:
+    """Sends a request to a backup model or deployment as well if the primary model hasn't
+    streamed its first token by the deadline, and uses whichever model streams first.
+
+    `LLMFallback` only helps when the primary model errors; a request that's slow to start holds
+    the caller in silence. The deadline is fixed, or a percentile of the primary model's recent
+    times to first token, so only the slowest requests are hedged.
+    """
+
+    def __init__(self, hedge_config: LLMHedge):
+        self.hedge_config = hedge_config
+        self.first_token_latencies = FirstTokenLatencies()
+        self.stats = LLMHedgeStats()
+
+    def get_deadline(self, model: str) -> float:
+        deadline = self.hedge_config.first_token_deadline_seconds
+        if self.hedge_config.adaptive_percentile is not None:
+            adaptive_deadline = self.first_token_latencies.get_percentile(
+                model, self.hedge_config.adaptive_percentile
+            )
+            if adaptive_deadline is not None:
+                deadline = max(deadline, adaptive_deadline)
+        return deadline
+
+    async def create_stream(
+        self,
+        model: str,
+        create_primary_stream: CreateStream,
+        create_backup_stream: CreateStream,
+    ) -> FirstTokenStream:
+        self.stats.num_requests += 1
+        start_time = time.monotonic()
+        primary_task = asyncio_create_task(read_until_first_token(create_primary_stream))
+        tasks = [primary_task]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.get_deadline(model))
+            if done:
+                tasks.remove(primary_task)
+                primary_stream = primary_task.result()
+                self.first_token_latencies.record(model, primary_stream.time_to_first_token)
+                return primary_stream
+
+            logger.info(
+                f"No first token from {model} after {time.monotonic() - start_time:.2f}s, "
+                f"hedging with {self.hedge_config.model_name}"
+            )
+            self.stats.num_hedged += 1
+            backup_task = asyncio_create_task(read_until_first_token(create_backup_stream))
+            tasks.append(backup_task)
+            winner: Optional["asyncio.Task[FirstTokenStream]"] = None
+            pending = set(tasks)
+            while winner is None and pending:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # the primary model's stream is preferred if both are ready
+                winner = next(
+                    (task for task in tasks if task.done() and task.exception() is None),
+                    None,
+                )
+            if winner is None:
+                logger.error(f"Backup request failed too: {backup_task.exception()}")
+                return primary_task.result()
+
+            elapsed_seconds = time.monotonic() - start_time
+            if winner is primary_task:
+                self.first_token_latencies.record(model, elapsed_seconds)
+            else:
+                self.stats.num_backup_wins += 1
+                self.stats.latency_won_seconds += (
+                    self.first_token_latencies.estimate_remaining_seconds(model, elapsed_seconds)
+                )
+                # the primary model took at least this long
+                self.first_token_latencies.record(model, elapsed_seconds)
+            tasks.remove(winner)
+            return winner.result()
+        finally:
+            for task in tasks:
+                asyncio_create_task(_discard(task))
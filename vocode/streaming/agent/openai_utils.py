@@ -1,13 +1,17 @@
+from bisect import bisect_left
 from copy import deepcopy
-from typing import Any, AsyncGenerator, Dict, List, Optional, Union
+from typing import Any, AsyncGenerator, AsyncIterable, Dict, List, Optional, Tuple, Union
 
 from loguru import logger
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from vocode.streaming.agent.token_utils import (
+    REPLY_PRIMING_NUM_TOKENS,
+    TokenizerInfo,
     get_chat_gpt_max_tokens,
+    get_tokenizer_info,
     num_tokens_from_functions,
-    num_tokens_from_messages,
+    num_tokens_from_message,
 )
 from vocode.streaming.models.actions import FunctionFragment, PhraseBasedActionTrigger
 from vocode.streaming.models.agent import LLM_AGENT_DEFAULT_MAX_TOKENS
@@ -37,47 +41,46 @@ def is_phrase_based_action_event_log(event_log: EventLog) -> bool:
     )
 
 
+def get_openai_chat_message_from_event_log(event_log: EventLog) -> Optional[Dict[str, Any]]:
+    """Returns the OpenAI chat message for an event log, or None if it isn't part of the prompt."""
+    if isinstance(event_log, Message):
+        if len(event_log.text.strip()) == 0:
+            return None
+        return {
+            "role": ("assistant" if event_log.sender == Sender.BOT else "user"),
+            "content": event_log.to_string(include_sender=False),
+        }
+    elif isinstance(event_log, ActionStart):
+        if is_phrase_based_action_event_log(event_log=event_log):
+            return None
+        return {
+            "role": "assistant",
+            "content": None,
+            "function_call": {
+                "name": event_log.action_type,
+                "arguments": event_log.action_input.params.json(),
+            },
+        }
+    elif isinstance(event_log, ActionFinish):
+        return {
+            "role": "function",
+            "name": event_log.action_type,
+            "content": event_log.to_string(include_header=False),
+        }
+    elif isinstance(event_log, ConferenceEvent):
+        return {"role": "user", "content": event_log.to_string(include_sender=False)}
+    return None
+
+
 def get_openai_chat_messages_from_transcript(
     merged_event_logs: List[EventLog],
     prompt_preamble: str,
 ) -> List[dict]:
     chat_messages = [{"role": "system", "content": prompt_preamble}]
     for event_log in merged_event_logs:
-        if isinstance(event_log, Message):
-            if len(event_log.text.strip()) == 0:
-                continue
-            else:
-                chat_messages.append(
-                    {
-                        "role": ("assistant" if event_log.sender == Sender.BOT else "user"),
-                        "content": event_log.to_string(include_sender=False),
-                    },
-                )
-        elif isinstance(event_log, ActionStart):
-            action_message: Dict[str, Any]
-            if is_phrase_based_action_event_log(event_log=event_log):
-                pass
-            else:
-                action_message = {
-                    "role": "assistant",
-                    "content": None,
-                    "function_call": {
-                        "name": event_log.action_type,
-                        "arguments": event_log.action_input.params.json(),
-                    },
-                }
-                chat_messages.append(action_message)
-        elif isinstance(event_log, ActionFinish):
-            action_message = {
-                "role": "function",
-                "name": event_log.action_type,
-                "content": event_log.to_string(include_header=False),
-            }
-            chat_messages.append(action_message)
-        elif isinstance(event_log, ConferenceEvent):
-            chat_messages.append(
-                {"role": "user", "content": event_log.to_string(include_sender=False)},
-            )
+        chat_message = get_openai_chat_message_from_event_log(event_log)
+        if chat_message is not None:
+            chat_messages.append(chat_message)
     return chat_messages
 
 
@@ -98,6 +101,8 @@ def merge_event_logs(event_logs: List[EventLog]) -> List[EventLog]:
         if bot_messages_buffer:
             merged_bot_message = deepcopy(bot_messages_buffer[-1])
             merged_bot_message.text = " ".join(event_log.text for event_log in bot_messages_buffer)
+            # share the token count memo, so that counts for the merged message outlive the copy
+            merged_bot_message._num_tokens_cache = bot_messages_buffer[-1]._num_tokens_cache
             new_event_logs.append(merged_bot_message)
         else:
             new_event_logs.append(current_log)
@@ -106,39 +111,195 @@ def merge_event_logs(event_logs: List[EventLog]) -> List[EventLog]:
     return new_event_logs
 
 
+def num_tokens_from_event_log_message(
+    event_log: EventLog,
+    chat_message: Dict[str, Any],
+    model_name: str,
+    tokenizer_info: TokenizerInfo,
+) -> int:
+    """Returns the token count of the chat message rendered from event_log.
+
+    The count is memoized on the event log, so each message is only tokenized once per model
+    unless its content changes (e.g. when a bot message is cut off).
+    """
+    cached = event_log._num_tokens_cache.get(model_name)
+    if cached is not None and cached[0] == chat_message:
+        return cached[1]
+    num_tokens = num_tokens_from_message(chat_message, tokenizer_info)
+    event_log._num_tokens_cache[model_name] = (chat_message, num_tokens)
+    return num_tokens
+
+
+class OpenAIChatMessageView:
+    """Incremental, append-only view of a transcript's event logs as OpenAI chat messages.
+
+    Only the last bot message can still change once it's in the transcript: it's filled in while it
+    is being spoken and rewritten by `Transcript.update_last_bot_message_on_cut_off`. Everything
+    before the group of consecutive bot messages that contains it is frozen: it's merged, rendered
+    and tokenized once, and only the (short) mutable tail is re-rendered on every turn.
+
+    The chat message dicts are shared between calls and must not be mutated.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.num_frozen_event_logs = 0
+        self.frozen_chat_messages: List[Dict[str, Any]] = []
+        # the (merged) event log each frozen chat message was rendered from
+        self.frozen_chat_message_event_logs: List[EventLog] = []
+        # model name -> cumulative token counts of the frozen chat messages, starting with 0
+        self.frozen_num_tokens_prefix_sums: Dict[str, List[int]] = {}
+        self.num_scanned_event_logs = 0
+        self.last_bot_message_index: Optional[int] = None
+
+    def _find_mutable_tail_start(self, event_logs: List[EventLog]) -> int:
+        for idx in range(self.num_scanned_event_logs, len(event_logs)):
+            event_log = event_logs[idx]
+            if isinstance(event_log, Message) and event_log.sender == Sender.BOT:
+                self.last_bot_message_index = idx
+        self.num_scanned_event_logs = len(event_logs)
+        if self.last_bot_message_index is None:
+            return len(event_logs)
+        # the last bot message is merged with the bot messages right before it
+        idx = self.last_bot_message_index
+        while (
+            idx > self.num_frozen_event_logs
+            and isinstance(event_logs[idx - 1], Message)
+            and event_logs[idx - 1].sender == Sender.BOT
+        ):
+            idx -= 1
+        return idx
+
+    @staticmethod
+    def _render(
+        event_logs: List[EventLog],
+    ) -> Tuple[List[Dict[str, Any]], List[EventLog]]:
+        chat_messages: List[Dict[str, Any]] = []
+        chat_message_event_logs: List[EventLog] = []
+        for event_log in merge_event_logs(event_logs=event_logs):
+            chat_message = get_openai_chat_message_from_event_log(event_log)
+            if chat_message is not None:
+                chat_messages.append(chat_message)
+                chat_message_event_logs.append(event_log)
+        return chat_messages, chat_message_event_logs
+
+    def get_chat_messages(
+        self, event_logs: List[EventLog]
+    ) -> Tuple[List[Dict[str, Any]], List[EventLog]]:
+        """Returns the chat messages for event_logs, without the system message, and the event
+        log each of them was rendered from. The first len(frozen_chat_messages) are frozen."""
+        if len(event_logs) < self.num_scanned_event_logs:
+            # event logs were removed, rather than appended
+            self.reset()
+        mutable_tail_start = self._find_mutable_tail_start(event_logs)
+        if mutable_tail_start > self.num_frozen_event_logs:
+            chat_messages, chat_message_event_logs = self._render(
+                event_logs[self.num_frozen_event_logs : mutable_tail_start]
+            )
+            self.frozen_chat_messages.extend(chat_messages)
+            self.frozen_chat_message_event_logs.extend(chat_message_event_logs)
+            self.num_frozen_event_logs = mutable_tail_start
+        tail_chat_messages, tail_chat_message_event_logs = self._render(
+            event_logs[self.num_frozen_event_logs :]
+        )
+        return (
+            self.frozen_chat_messages + tail_chat_messages,
+            self.frozen_chat_message_event_logs + tail_chat_message_event_logs,
+        )
+
+    def get_frozen_num_tokens_prefix_sums(
+        self, model_name: str, tokenizer_info: TokenizerInfo
+    ) -> List[int]:
+        prefix_sums = self.frozen_num_tokens_prefix_sums.setdefault(model_name, [0])
+        for idx in range(len(prefix_sums) - 1, len(self.frozen_chat_messages)):
+            prefix_sums.append(
+                prefix_sums[-1]
+                + num_tokens_from_event_log_message(
+                    event_log=self.frozen_chat_message_event_logs[idx],
+                    chat_message=self.frozen_chat_messages[idx],
+                    model_name=model_name,
+                    tokenizer_info=tokenizer_info,
+                )
+            )
+        return prefix_sums
+
+
+def get_openai_chat_message_view(transcript: Transcript) -> OpenAIChatMessageView:
+    if transcript._openai_chat_message_view is None:
+        transcript._openai_chat_message_view = OpenAIChatMessageView()
+    return transcript._openai_chat_message_view
+
+
 def format_openai_chat_messages_from_transcript(
     transcript: Transcript,
     model_name: str,
     functions: Optional[List[Dict]],
     prompt_preamble: str,
+    functions_num_tokens: Optional[int] = None,
 ) -> List[dict]:
-    # merge consecutive bot messages
-    merged_event_logs: List[EventLog] = merge_event_logs(event_logs=transcript.event_logs)
+    tokenizer_info = get_tokenizer_info(model_name)
+    if tokenizer_info is None:
+        raise NotImplementedError(
+            f"Token counting is not implemented for model {model_name}, cannot fit the prompt into the context window"
+        )
 
-    chat_messages: List[Dict[str, Optional[Any]]]
-    chat_messages = get_openai_chat_messages_from_transcript(
-        merged_event_logs=merged_event_logs,
-        prompt_preamble=prompt_preamble,
+    chat_message_view = get_openai_chat_message_view(transcript)
+    chat_messages, chat_message_event_logs = chat_message_view.get_chat_messages(
+        transcript.event_logs
     )
+    # cumulative token counts of the chat messages, so that dropping the first k messages
+    # saves num_tokens_prefix_sums[k] tokens
+    num_tokens_prefix_sums = chat_message_view.get_frozen_num_tokens_prefix_sums(
+        model_name, tokenizer_info
+    )
+    num_frozen_chat_messages = len(num_tokens_prefix_sums) - 1
+    tail_num_tokens_prefix_sums = list(num_tokens_prefix_sums[-1:])
+    for chat_message, event_log in zip(
+        chat_messages[num_frozen_chat_messages:],
+        chat_message_event_logs[num_frozen_chat_messages:],
+    ):
+        tail_num_tokens_prefix_sums.append(
+            tail_num_tokens_prefix_sums[-1]
+            + num_tokens_from_event_log_message(
+                event_log=event_log,
+                chat_message=chat_message,
+                model_name=model_name,
+                tokenizer_info=tokenizer_info,
+            )
+        )
 
-    context_size = num_tokens_from_messages(
-        messages=chat_messages,
-        model=model_name,
-    ) + num_tokens_from_functions(functions=functions, model=model_name)
+    system_message: Dict[str, Optional[Any]] = {"role": "system", "content": prompt_preamble}
+    if functions_num_tokens is None:
+        functions_num_tokens = num_tokens_from_functions(functions=functions, model=model_name)
+    context_size = (
+        num_tokens_from_message(system_message, tokenizer_info)
+        + tail_num_tokens_prefix_sums[-1]
+        + REPLY_PRIMING_NUM_TOKENS
+        + functions_num_tokens
+    )
+    # context limit includes the max tokens, and 50 for safety
+    max_context_size = get_chat_gpt_max_tokens(model_name) - LLM_AGENT_DEFAULT_MAX_TOKENS - 50
 
+    # drop the fewest oldest messages (but never the system message) so that the rest fits
     num_removed_messages = 0
-    while (
-        context_size > get_chat_gpt_max_tokens(model_name) - LLM_AGENT_DEFAULT_MAX_TOKENS - 50
-    ):  # context limit includes the max tokens, and 50 for safety
-        if len(chat_messages) <= 1:
-            logger.error(f"Prompt is too long to fit in context window, num tokens {context_size}")
-            break
-        num_removed_messages += 1
-        chat_messages.pop(1)
-        context_size = num_tokens_from_messages(
-            messages=chat_messages,
-            model=model_name,
-        ) + num_tokens_from_functions(functions=functions, model=model_name)
+    if context_size > max_context_size:
+        num_tokens_to_remove = context_size - max_context_size
+        num_removed_messages = bisect_left(num_tokens_prefix_sums, num_tokens_to_remove)
+        if num_removed_messages > num_frozen_chat_messages:
+            num_removed_messages = num_frozen_chat_messages + bisect_left(
+                tail_num_tokens_prefix_sums, num_tokens_to_remove
+            )
+        num_removed_messages = min(num_removed_messages, len(chat_messages))
+        context_size -= (
+            num_tokens_prefix_sums[num_removed_messages]
+            if num_removed_messages <= num_frozen_chat_messages
+            else tail_num_tokens_prefix_sums[num_removed_messages - num_frozen_chat_messages]
+        )
+
+    if context_size > max_context_size:
+        logger.error(f"Prompt is too long to fit in context window, num tokens {context_size}")
 
     if num_removed_messages > 0:
         logger.info(
@@ -146,11 +307,11 @@ def format_openai_chat_messages_from_transcript(
             num_removed_messages,
         )
 
-    return chat_messages
+    return [system_message] + chat_messages[num_removed_messages:]
 
 
 async def openai_get_tokens(
-    gen: AsyncGenerator[ChatCompletionChunk, None],
+    gen: AsyncIterable[ChatCompletionChunk],
 ) -> AsyncGenerator[Union[str, FunctionFragment], None]:
     async for event in gen:
         choices = event.choices
@@ -1,21 +1,29 @@
-import re
 from typing import List, Optional
 
 from vocode.streaming.models.actions import ActionConfig, PhraseBasedActionTrigger
+from vocode.streaming.utils.phrase_matcher import PhraseMatcher, PhraseMatchType, remove_punctuation
 
 
-def matches_phrase_trigger(
-    message: str,
+def create_phrase_trigger_matcher(
     action_configs: List[ActionConfig],
-) -> Optional[ActionConfig]:
-    cleaned = re.sub(r"[^\w\s]", "", message.lower())
+) -> PhraseMatcher[ActionConfig]:
+    phrases = []
     for action_config in action_configs:
         if not isinstance(action_config.action_trigger, PhraseBasedActionTrigger):
             continue
 
         for phrase_trigger in action_config.action_trigger.config.phrase_triggers:
-            lowered = phrase_trigger.phrase.lower()
-            for condition in phrase_trigger.conditions:
-                if condition == "phrase_condition_type_contains" and lowered in cleaned:
-                    return action_config
-    return None
+            if "phrase_condition_type_contains" in phrase_trigger.conditions:
+                phrases.append((phrase_trigger.phrase.lower(), action_config))
+    return PhraseMatcher(phrases, match_type=PhraseMatchType.CONTAINS)
+
+
+def matches_phrase_trigger(
+    message: str,
+    action_configs: List[ActionConfig],
+    phrase_trigger_matcher: Optional[PhraseMatcher[ActionConfig]] = None,
+) -> Optional[ActionConfig]:
+    if phrase_trigger_matcher is None:
+        phrase_trigger_matcher = create_phrase_trigger_matcher(action_configs)
+    cleaned = remove_punctuation(message.lower())
+    return phrase_trigger_matcher.search(cleaned)
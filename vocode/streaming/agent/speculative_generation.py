@@ -0,0 +1,124 @@
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncGenerator, List, NamedTuple, Optional
+
+import tiktoken
+
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.transcript import Message, Transcript
+from vocode.streaming.utils.create_task import asyncio_create_task
+
+if TYPE_CHECKING:
+    from vocode.streaming.agent.base_agent import GeneratedResponse
+
+_token_encoding: Optional[tiktoken.Encoding] = None
+
+
+def num_tokens_from_text(text: str) -> int:
+    """Counts tokens with cl100k_base, which is exact for OpenAI models and an approximation for
+    other providers."""
+    global _token_encoding
+    if _token_encoding is None:
+        _token_encoding = tiktoken.get_encoding("cl100k_base")
+    return len(_token_encoding.encode(text))
+
+
+def normalize_transcript_text(text: str) -> str:
+    """Interim and final transcripts often only differ in casing and punctuation."""
+    return " ".join(re.sub(r"[^\w\s]", "", text).lower().split())
+
+
+def get_transcript_fingerprint(transcript: Transcript) -> tuple:
+    """Changes whenever the messages an agent would build its prompt from change: event logs are
+    only appended, and only the text of the last message is still filled in after it's added."""
+    last_message_text = next(
+        (
+            event_log.text
+            for event_log in reversed(transcript.event_logs)
+            if isinstance(event_log, Message)
+        ),
+        None,
+    )
+    return (len(transcript.event_logs), last_message_text)
+
+
+class SpeculationKey(NamedTuple):
+    text: str
+    is_interrupt: bool
+    bot_was_in_medias_res: bool
+    transcript_fingerprint: tuple
+
+
+@dataclass
+class SpeculativeGenerationStats:
+    # generations started on an interim transcript
+    num_speculations: int = 0
+    # the final transcript matched and the speculative responses were used
+    num_hits: int = 0
+    # the final transcript didn't match
+    num_misses: int = 0
+    # the interim transcript changed before it was final
+    num_restarts: int = 0
+    num_wasted_responses: int = 0
+    num_wasted_tokens: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.num_hits / self.num_speculations if self.num_speculations else 0.0
+
+
+class SpeculativeGeneration:
+    """Generates responses to an interim transcript in the background and buffers them until the
+    final transcript either commits them, so they're sent as if they were generated just now, or
+    cancels them."""
+
+    def __init__(self, key: SpeculationKey, responses: AsyncGenerator["GeneratedResponse", None]):
+        self.key = key
+        self.buffered_responses: List["GeneratedResponse"] = []
+        self.num_committed_responses = 0
+        self.error: Optional[Exception] = None
+        self.new_response_event = asyncio.Event()
+        self.task = asyncio_create_task(self._generate(responses))
+
+    async def _generate(self, responses: AsyncGenerator["GeneratedResponse", None]):
+        try:
+            async for response in responses:
+                self.buffered_responses.append(response)
+                self.new_response_event.set()
+        except Exception as e:
+            # raised to whoever commits the generation, like a generation that wasn't speculative
+            self.error = e
+        finally:
+            self.new_response_event.set()
+
+    async def commit(self) -> AsyncGenerator["GeneratedResponse", None]:
+        """Yields the buffered responses, then the rest of the responses as they're generated."""
+        try:
+            while True:
+                self.new_response_event.clear()
+                while self.num_committed_responses < len(self.buffered_responses):
+                    response = self.buffered_responses[self.num_committed_responses]
+                    self.num_committed_responses += 1
+                    yield response
+                if self.task.done():
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await self.new_response_event.wait()
+        finally:
+            self.task.cancel()
+
+    def cancel(self) -> int:
+        """Stops generating and returns the number of tokens that were generated for nothing, i.e.
+        that weren't committed."""
+        self.task.cancel()
+        return sum(
+            num_tokens_from_text(response.message.text)
+            for response in self.uncommitted_responses
+            if isinstance(response.message, BaseMessage)
+        )
+
+    @property
+    def uncommitted_responses(self) -> List["GeneratedResponse"]:
+        return self.buffered_responses[self.num_committed_responses :]
@@ -1,5 +1,5 @@
 import re
-from typing import AsyncGenerator, AsyncIterable, List, Literal, Optional, Union
+from typing import AsyncGenerator, AsyncIterable, List, Literal, Optional, Tuple, Union
 
 from sentry_sdk.tracing import Span
 
@@ -7,6 +7,16 @@ from vocode.streaming.models.actions import FunctionCall, FunctionFragment
 
 TOKENS_TO_GENERATE_PAST_PERIOD = 3
 SENTENCE_ENDINGS_EXCEPT_PERIOD_PATTERN = r"[?!\n\t\r]"
+SENTENCE_ENDINGS_EXCEPT_PERIOD = "?!\n\t\r"
+CLAUSE_ENDINGS = ",;:—"
+# periods after these don't end sentences
+ABBREVIATIONS = frozenset(
+    ["mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "e.g", "i.e", "approx", "inc", "ltd"]
+)
+MAX_ABBREVIATION_LENGTH = max(len(abbreviation) for abbreviation in ABBREVIATIONS)
+
+_PUNCTUATION_REGEX = re.compile(rf"[.{re.escape(SENTENCE_ENDINGS_EXCEPT_PERIOD + CLAUSE_ENDINGS)}]")
+_WORD_START_REGEX = re.compile(r"(?<!\S)\S")
 
 
 SHORT_SENTENCE_CUTOFF = 3
@@ -37,20 +47,195 @@ def split_sentences(text: str) -> List[str]:
     return [sentence for sentence in final_split if sentence]
 
 
+class SentenceSegmenter:
+    """Splits a stream of LLM tokens into sentences to synthesize, in time linear in the length of
+    the response.
+
+    Each token is scanned once when it arrives, keeping a running word count and the offsets where
+    sentences (and clauses) end, so nothing is rescanned until a sentence is emitted. Like
+    `split_sentences`:
+
+    - sentences are emitted once they have at least `min_words` words, so short ones like "Hello."
+      are merged into the next
+    - a sentence ending in ?, ! or a newline is emitted as soon as it arrives
+    - a period only ends a sentence when it's followed by whitespace, and only once
+      `tokens_past_period` more tokens have arrived, so "$3.20" isn't split
+    - numbers at the start of a sentence or clause, like the "1." of a numbered list, and
+      abbreviations like "Dr." don't end sentences
+
+    If `first_clause_min_words` is set, the first chunk of the response is emitted as soon as a
+    clause of at least that many words ends in a comma, semicolon, colon or dash, so the
+    synthesizer can start on it before the first sentence is done.
+    """
+
+    def __init__(
+        self,
+        min_words: int = SHORT_SENTENCE_CUTOFF,
+        tokens_past_period: int = TOKENS_TO_GENERATE_PAST_PERIOD,
+        first_clause_min_words: Optional[int] = None,
+    ):
+        self.min_words = min_words
+        self.tokens_past_period = tokens_past_period
+        self.first_clause_min_words = first_clause_min_words
+        self.has_emitted = False
+        self.tokens_since_period: Optional[int] = None
+        self._reset("")
+
+    def _reset(self, text: str):
+        self.pieces: List[str] = []
+        self.length = 0
+        self.word_count = 0
+        self.in_word = False
+        # the word being scanned, up to the length of the longest abbreviation
+        self.current_word = ""
+        self.words_since_ending = 0
+        self.last_non_whitespace_end = 0
+        self.last_sentence_ending_except_period: Optional[int] = None
+        # offsets just past the sentence and clause endings, with the number of words before them
+        self.sentence_ends: List[Tuple[int, int]] = []
+        self.clause_ends: List[Tuple[int, int]] = []
+        # a period or clause ending at the end of the last token, which needs the next character to
+        # tell whether it ends anything
+        self.unresolved_ending: Optional[Tuple[str, int, int]] = None
+        if text:
+            self._scan(text)
+
+    def _scan(self, token: str) -> bool:
+        """Updates the state with `token` and returns whether it has a sentence ending other than
+        a period."""
+        offset = self.length
+        self.pieces.append(token)
+        self.length += len(token)
+        if self.unresolved_ending is not None:
+            self._resolve_ending(*self.unresolved_ending, token[0].isspace())
+            self.unresolved_ending = None
+
+        has_sentence_ending_except_period = False
+        scanned_up_to = 0
+        for match in _PUNCTUATION_REGEX.finditer(token):
+            idx = match.start()
+            self._scan_words(token[scanned_up_to:idx], offset + idx)
+            scanned_up_to = idx
+            char = match.group()
+            if char in SENTENCE_ENDINGS_EXCEPT_PERIOD:
+                has_sentence_ending_except_period = True
+                self.last_sentence_ending_except_period = offset + idx + 1
+                self.words_since_ending = 0
+            elif char == "." and (
+                self.current_word.lstrip("(\"'").lower() in ABBREVIATIONS
+                or (self.words_since_ending == 1 and self.current_word.isdigit())
+            ):
+                pass
+            elif idx + 1 < len(token):
+                self._resolve_ending(
+                    char, offset + idx + 1, self.word_count, token[idx + 1].isspace()
+                )
+            else:
+                self.unresolved_ending = (char, offset + idx + 1, self.word_count)
+        self._scan_words(token[scanned_up_to:], self.length)
+        return has_sentence_ending_except_period
+
+    def _scan_words(self, chunk: str, end: int):
+        """Counts the words in `chunk`, which ends at offset `end`."""
+        if not chunk:
+            return
+        words = chunk.split()
+        if not words:
+            self.in_word = False
+            self.current_word = ""
+            return
+        continues_word = self.in_word and not chunk[0].isspace()
+        self.word_count += len(words) - continues_word
+        self.words_since_ending += len(words) - continues_word
+        if chunk[-1].isspace():
+            self.in_word = False
+            self.current_word = ""
+            self.last_non_whitespace_end = end - (len(chunk) - len(chunk.rstrip()))
+            return
+        self.in_word = True
+        self.last_non_whitespace_end = end
+        if continues_word and len(words) == 1:
+            if len(self.current_word) <= MAX_ABBREVIATION_LENGTH:
+                self.current_word += chunk[: MAX_ABBREVIATION_LENGTH + 1]
+        else:
+            self.current_word = words[-1][: MAX_ABBREVIATION_LENGTH + 1]
+
+    def _resolve_ending(
+        self, char: str, end: int, word_count: int, is_followed_by_whitespace: bool
+    ):
+        if not is_followed_by_whitespace:
+            return
+        if char == ".":
+            self.sentence_ends.append((end, word_count))
+        else:
+            self.clause_ends.append((end, word_count))
+        self.words_since_ending = 0
+
+    def _emit(self, end: int) -> List[str]:
+        text = "".join(self.pieces)
+        self._reset(text[end:].lstrip())
+        to_return = text[:end].strip()
+        if not to_return:
+            return []
+        self.has_emitted = True
+        return [to_return]
+
+    def add(self, token: str) -> List[str]:
+        """Returns the sentences that `token` completed."""
+        if not token:
+            return []
+        has_sentence_ending_except_period = self._scan(token)
+        if self.word_count < self.min_words:
+            return []
+        sentences = []
+        if has_sentence_ending_except_period:
+            assert self.last_sentence_ending_except_period is not None
+            sentences.extend(self._emit(self.last_sentence_ending_except_period))
+        elif "." in token:
+            self.tokens_since_period = 0
+
+        if (
+            self.tokens_since_period is not None
+            and self.tokens_since_period > self.tokens_past_period
+        ):
+            # the last sentence stays in the buffer, unless nothing has come after it
+            for end, _ in reversed(self.sentence_ends):
+                if end < self.last_non_whitespace_end:
+                    sentences.extend(self._emit(end))
+                    break
+            self.tokens_since_period = None
+        elif self.tokens_since_period is not None:
+            self.tokens_since_period += 1
+
+        if self.first_clause_min_words is not None and not self.has_emitted:
+            # the last ending has the most words before it
+            first_clause_end, word_count = max(
+                self.sentence_ends[-1:] + self.clause_ends[-1:], default=(0, 0)
+            )
+            if word_count >= self.first_clause_min_words:
+                sentences.extend(self._emit(first_clause_end))
+        return sentences
+
+    def flush(self) -> str:
+        """Returns the rest of the response."""
+        text = "".join(self.pieces).strip()
+        self._reset("")
+        return text
+
+
 async def collate_response_async(
     conversation_id: str,
     gen: AsyncIterable[Union[str, FunctionFragment]],
     get_functions: Literal[True, False] = False,
     sentry_span: Optional[Span] = None,
+    first_clause_min_words: Optional[int] = None,
 ) -> AsyncGenerator[
     Union[str, FunctionCall],
     None,
 ]:  # tuple of message to send and whether it's the final message
-    buffer = ""
+    segmenter = SentenceSegmenter(first_clause_min_words=first_clause_min_words)
     function_name_buffer = ""
     function_args_buffer = ""
-    is_post_period = False
-    tokens_since_period = 0
     is_first = True
     async for token in gen:
         if is_first:
@@ -60,38 +245,13 @@ async def collate_response_async(
         if not token:
             continue
         if isinstance(token, str):
-            buffer += token
-            if len(buffer.strip().split()) < SHORT_SENTENCE_CUTOFF:
-                continue
-            if re.search(SENTENCE_ENDINGS_EXCEPT_PERIOD_PATTERN, token):
-                # split on last occurrence of sentence ending
-                matches = [
-                    match for match in re.finditer(SENTENCE_ENDINGS_EXCEPT_PERIOD_PATTERN, buffer)
-                ]
-                last_match = matches[-1]
-                split_point = last_match.start() + 1
-                to_keep, to_return = buffer[split_point:], buffer[:split_point]
-                if to_return.strip():
-                    yield to_return.strip()
-                buffer = to_keep
-            elif "." in token:
-                is_post_period = True
-                tokens_since_period = 0
-
-            if is_post_period and tokens_since_period > TOKENS_TO_GENERATE_PAST_PERIOD:
-                sentences = split_sentences(buffer)
-                if len(sentences) > 1:
-                    yield " ".join(sentences[:-1])
-                    buffer = sentences[-1]
-                is_post_period = False
-                tokens_since_period = 0
-            else:
-                tokens_since_period += 1
+            for sentence in segmenter.add(token):
+                yield sentence
 
         elif isinstance(token, FunctionFragment):
             function_name_buffer += token.name
             function_args_buffer += token.arguments
-    to_return = buffer.strip()
+    to_return = segmenter.flush()
     if to_return:
         yield to_return
     if function_name_buffer and get_functions:
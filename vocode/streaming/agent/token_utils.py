@@ -156,6 +156,21 @@ def num_tokens_from_messages(messages: List[dict], model: str = "gpt-3.5-turbo-0
 
 # END OF OPENAI COOKBOOK CODE AND GIVEN MIT LICENSE.
 
+# every reply is primed with <|start|>assistant<|message|>
+REPLY_PRIMING_NUM_TOKENS = 3
+
+
+def num_tokens_from_message(message: dict, tokenizer_info: TokenizerInfo) -> int:
+    """Return the number of tokens used by a single message, excluding the reply priming.
+
+    num_tokens_from_messages(messages) == sum of num_tokens_from_message + REPLY_PRIMING_NUM_TOKENS
+    """
+    return tokenizer_info.tokens_per_message + tokens_from_dict(
+        encoding=tokenizer_info.encoding,
+        d=message,
+        tokens_per_name=tokenizer_info.tokens_per_name,
+    )
+
 
 def tokens_from_dict(encoding: tiktoken.Encoding, d: Dict[str, Any], tokens_per_name: int) -> int:
     """Return the number of OpenAI tokens in a dict."""
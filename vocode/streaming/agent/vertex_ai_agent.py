@@ -1,6 +1,4 @@
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import Tuple
+from typing import Optional, Tuple
 
 from langchain import ConversationChain
 from langchain.memory import ConversationBufferMemory
@@ -11,12 +9,14 @@ from loguru import logger
 
 from vocode.streaming.agent.base_agent import RespondAgent
 from vocode.streaming.models.agent import ChatVertexAIAgentConfig
+from vocode.streaming.utils.executor_registry import BoundedExecutor, ExecutorRegistry
 
 
 class ChatVertexAIAgent(RespondAgent[ChatVertexAIAgentConfig]):
     def __init__(
         self,
         agent_config: ChatVertexAIAgentConfig,
+        executor: Optional[BoundedExecutor] = None,
     ):
         super().__init__(agent_config=agent_config)
 
@@ -37,7 +37,7 @@ class ChatVertexAIAgent(RespondAgent[ChatVertexAIAgentConfig]):
         self.conversation = ConversationChain(memory=self.memory, prompt=self.prompt, llm=self.llm)
         if agent_config.initial_message:
             raise NotImplementedError("initial_message not supported for Vertex AI")
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        self.executor = executor or ExecutorRegistry().get_executor("vertex_ai_agent")
 
     async def respond(
         self,
@@ -46,8 +46,7 @@ class ChatVertexAIAgent(RespondAgent[ChatVertexAIAgentConfig]):
         is_interrupt: bool = False,
     ) -> Tuple[str, bool]:
         # Vertex AI doesn't allow async, so we run in a separate thread
-        text = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor,
+        text = await self.executor.run(
             lambda input: self.conversation.predict(input=input),
             human_input,
         )
@@ -90,6 +90,12 @@ class CutOffResponse(BaseModel):
     messages: List[BaseMessage] = [BaseMessage(text="Sorry?")]
 
 
+class SpeculativeGenerationConfig(BaseModel):
+    # how many interim transcripts in a row need to have the same text before we start generating
+    # a response to it
+    min_stable_interim_transcripts: int = 2
+
+
 class AgentConfig(TypedModel, type=AgentType.BASE.value):  # type: ignore
     initial_message: Optional[BaseMessage] = None
     generate_responses: bool = True
@@ -104,6 +110,12 @@ class AgentConfig(TypedModel, type=AgentType.BASE.value):  # type: ignore
     goodbye_phrases: Optional[List[str]] = None
     interrupt_sensitivity: InterruptSensitivity = "low"
     cut_off_response: Optional[CutOffResponse] = None
+    # generate responses to stable interim transcripts before they're final, see
+    # RespondAgent.speculate
+    speculative_generation_config: Optional[SpeculativeGenerationConfig] = None
+    # send the first clause of a response to the synthesizer once it has this many words, rather
+    # than waiting for the first sentence, see SentenceSegmenter
+    first_clause_min_words: Optional[int] = None
 
 
 class LLMAgentConfig(AgentConfig, type=AgentType.LLM.value):  # type: ignore
@@ -118,6 +130,18 @@ class LLMFallback(BaseModel):
     model_name: str
 
 
+class LLMHedge(BaseModel):
+    """A backup model or deployment that's also sent the request if the primary model hasn't
+    streamed its first token by the deadline. Whichever streams first is used."""
+
+    provider: Literal["openai", "azure"]
+    model_name: str
+    first_token_deadline_seconds: float = 1.0
+    # hedge after this percentile of the model's recent times to first token instead, once enough
+    # have been observed, but never before first_token_deadline_seconds
+    adaptive_percentile: Optional[float] = None
+
+
 class ChatGPTAgentConfig(AgentConfig, type=AgentType.CHAT_GPT.value):  # type: ignore
     openai_api_key: Optional[str] = None
     prompt_preamble: str
@@ -132,6 +156,7 @@ class ChatGPTAgentConfig(AgentConfig, type=AgentType.CHAT_GPT.value):  # type: i
     backchannel_probability: float = 0.7
     first_response_filler_message: Optional[str] = None
     llm_fallback: Optional[LLMFallback] = None
+    llm_hedge: Optional[LLMHedge] = None
 
 
 class AnthropicAgentConfig(AgentConfig, type=AgentType.ANTHROPIC.value):  # type: ignore
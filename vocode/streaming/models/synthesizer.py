@@ -42,6 +42,9 @@ class SynthesizerConfig(TypedModel, type=SynthesizerType.BASE.value):  # type: i
     audio_encoding: AudioEncoding
     should_encode_as_wav: bool = False
     sentiment_config: Optional[SentimentConfig] = None
+    # how many upcoming messages to synthesize while the current one plays, 0 synthesizes them one
+    # at a time. Helps synthesizers that only return audio once the whole message is synthesized.
+    synthesis_lookahead: int = 0
 
     class Config:
         arbitrary_types_allowed = True
@@ -1,8 +1,9 @@
 import time
+import typing
 from datetime import datetime
-from typing import List, Literal, Optional
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
 
-from pydantic.v1 import BaseModel, Field
+from pydantic.v1 import BaseModel, Field, PrivateAttr
 
 from vocode.streaming.models.actions import ActionInput, ActionOutput
 from vocode.streaming.models.events import ActionEvent, Event, EventType, Sender
@@ -12,6 +13,8 @@ from vocode.streaming.utils.events_manager import EventsManager
 class EventLog(BaseModel):
     sender: Sender
     timestamp: float = Field(default_factory=time.time)
+    # model name -> (the chat message this log was last rendered to, its token count)
+    _num_tokens_cache: Dict[str, Tuple[dict, int]] = PrivateAttr(default_factory=dict)
 
     def to_string(self, include_timestamp: bool = False) -> str:
         raise NotImplementedError
@@ -116,10 +119,80 @@ class TranscriptEvent(Event, type=EventType.TRANSCRIPT):  # type: ignore
         return f"{self.sender.name}: {self.text}"
 
 
+class TranscriptIndex:
+    """Positions of the event logs that transcript queries look for, kept up to date as event logs
+    are appended so that the queries don't scan the transcript.
+
+    Only positions are stored, so messages whose text is changed in place are seen as they are now.
+    The word and character counts are the exception: they're running totals for the messages before
+    the last bot message, which can't change anymore (see openai_utils.OpenAIChatMessageView), and
+    the rest are counted when asked for.
+    """
+
+    def __init__(self, event_logs: List[EventLog]):
+        self.event_logs = event_logs
+        self.num_indexed_event_logs = 0
+        self.message_indices: List[int] = []
+        self.last_message_index_by_sender: Dict[Sender, int] = {}
+        self.last_action_start_index: Optional[int] = None
+        self.last_action_finish_index: Optional[int] = None
+        # totals for the messages before `num_counted_event_logs`
+        self.num_counted_event_logs = 0
+        self.num_counted_words = 0
+        self.num_counted_characters = 0
+
+    def is_valid_for(self, event_logs: List[EventLog]) -> bool:
+        # event logs are only ever appended, unless the list is replaced or truncated
+        return event_logs is self.event_logs and len(event_logs) >= self.num_indexed_event_logs
+
+    def update(self):
+        event_logs = self.event_logs
+        for idx in range(self.num_indexed_event_logs, len(event_logs)):
+            event_log = event_logs[idx]
+            if isinstance(event_log, Message):
+                self.message_indices.append(idx)
+                self.last_message_index_by_sender[event_log.sender] = idx
+            elif isinstance(event_log, ActionStart):
+                self.last_action_start_index = idx
+            elif isinstance(event_log, ActionFinish):
+                self.last_action_finish_index = idx
+        self.num_indexed_event_logs = len(event_logs)
+        last_bot_message_index = self.last_message_index_by_sender.get(Sender.BOT)
+        if last_bot_message_index is not None:
+            self._count_messages_until(last_bot_message_index)
+
+    def _count_messages_until(self, end: int):
+        for idx in range(self.num_counted_event_logs, end):
+            event_log = self.event_logs[idx]
+            if isinstance(event_log, Message):
+                self.num_counted_words += len(event_log.text.split())
+                self.num_counted_characters += len(event_log.text)
+        self.num_counted_event_logs = max(self.num_counted_event_logs, end)
+
+    def get_num_words(self) -> int:
+        return self.num_counted_words + sum(
+            len(message.text.split()) for message in self._uncounted_messages()
+        )
+
+    def get_num_characters(self) -> int:
+        return self.num_counted_characters + sum(
+            len(message.text) for message in self._uncounted_messages()
+        )
+
+    def _uncounted_messages(self) -> Iterator[Message]:
+        for idx in range(self.num_counted_event_logs, len(self.event_logs)):
+            event_log = self.event_logs[idx]
+            if isinstance(event_log, Message):
+                yield event_log
+
+
 class Transcript(BaseModel):
     event_logs: List[EventLog] = []
     start_time: float = Field(default_factory=time.time)
     events_manager: Optional[EventsManager] = None
+    # incremental OpenAI chat message view of event_logs, see openai_utils.OpenAIChatMessageView
+    _openai_chat_message_view: Optional[Any] = PrivateAttr(default=None)
+    _index: Optional[TranscriptIndex] = PrivateAttr(default=None)
 
     class Config:
         arbitrary_types_allowed = True
@@ -208,10 +281,49 @@ class Transcript(BaseModel):
             is_final=is_final,
         )
 
+    def get_index(self) -> TranscriptIndex:
+        if self._index is None or not self._index.is_valid_for(self.event_logs):
+            self._index = TranscriptIndex(self.event_logs)
+        self._index.update()
+        return self._index
+
+    def get_last_message(self, sender: Optional[Sender] = None) -> Optional[Message]:
+        index = self.get_index()
+        if sender is None:
+            idx = index.message_indices[-1] if index.message_indices else None
+        else:
+            idx = index.last_message_index_by_sender.get(sender)
+        return typing.cast(Message, self.event_logs[idx]) if idx is not None else None
+
+    def get_last_bot_message(self) -> Optional[Message]:
+        return self.get_last_message(Sender.BOT)
+
+    def iter_messages_reversed(self) -> Iterator[Message]:
+        """The messages, most recent first"""
+        index = self.get_index()
+        for idx in reversed(index.message_indices):
+            yield typing.cast(Message, self.event_logs[idx])
+
+    def get_last_action_start(self) -> Optional[ActionStart]:
+        idx = self.get_index().last_action_start_index
+        return typing.cast(ActionStart, self.event_logs[idx]) if idx is not None else None
+
+    def get_last_action_finish(self) -> Optional[ActionFinish]:
+        idx = self.get_index().last_action_finish_index
+        return typing.cast(ActionFinish, self.event_logs[idx]) if idx is not None else None
+
+    def get_num_words(self) -> int:
+        """The number of words in the messages"""
+        return self.get_index().get_num_words()
+
+    def get_num_characters(self) -> int:
+        """The number of characters in the messages"""
+        return self.get_index().get_num_characters()
+
     def get_last_user_message(self):
-        for idx, message in enumerate(self.event_logs[::-1]):
-            if message.sender == Sender.HUMAN:
-                return -1 * (idx + 1), message.to_string()
+        idx = self.get_index().last_message_index_by_sender.get(Sender.HUMAN)
+        if idx is not None:
+            return idx - len(self.event_logs), self.event_logs[idx].to_string()
 
     def add_action_start_log(self, action_input: ActionInput, conversation_id: str):
         timestamp = time.time()
@@ -256,19 +368,13 @@ class Transcript(BaseModel):
 
     def update_last_bot_message_on_cut_off(self, text: str):
         # TODO: figure out what to do for the event
-        for event_log in reversed(self.event_logs):
-            if isinstance(event_log, Message) and event_log.sender == Sender.BOT:
-                event_log.text = text
-                break
+        last_bot_message = self.get_last_bot_message()
+        if last_bot_message is not None:
+            last_bot_message.text = text
 
     def was_last_message_interrupted(self):
-        bot_messages = [
-            message
-            for message in self.event_logs
-            if isinstance(message, Message) and message.sender == Sender.BOT
-        ]
-        if len(bot_messages) > 0:
-            last_bot_message = bot_messages[-1]
+        last_bot_message = self.get_last_bot_message()
+        if last_bot_message is not None:
             return not last_bot_message.is_final or not last_bot_message.is_end_of_turn
         return False
 
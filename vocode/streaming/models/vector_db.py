@@ -9,6 +9,7 @@ DEFAULT_EMBEDDINGS_MODEL = "text-embedding-ada-002"
 class VectorDBType(str, Enum):
     BASE = "vector_db_base"
     PINECONE = "vector_db_pinecone"
+    LOCAL = "vector_db_local"
 
 
 class VectorDBConfig(TypedModel, type=VectorDBType.BASE.value):  # type: ignore
@@ -20,3 +21,13 @@ class PineconeConfig(VectorDBConfig, type=VectorDBType.PINECONE.value):  # type:
     api_key: Optional[str]
     api_environment: Optional[str]
     top_k: int = 3
+
+
+class LocalVectorDBConfig(VectorDBConfig, type=VectorDBType.LOCAL.value):  # type: ignore
+    # the directory the index is saved in, loaded once per process and shared by every agent
+    path: str
+    top_k: int = 3
+    # searches every embedding when None; for large knowledge bases, the number of k-means lists
+    # to build when texts are added, of which `ivf_num_probes` are searched per query
+    ivf_num_lists: Optional[int] = None
+    ivf_num_probes: int = 8
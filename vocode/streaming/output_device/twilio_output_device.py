@@ -2,9 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import audioop
-import base64
-import json
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketState
@@ -14,6 +12,7 @@ from pydantic import BaseModel
 from vocode.streaming.output_device.abstract_output_device import AbstractOutputDevice
 from vocode.streaming.output_device.audio_chunk import AudioChunk, ChunkState
 from vocode.streaming.telephony.constants import DEFAULT_AUDIO_ENCODING, DEFAULT_SAMPLING_RATE
+from vocode.streaming.telephony.twilio_media_stream import TwilioMediaStreamMessageEncoder
 from vocode.streaming.utils.create_task import asyncio_create_task
 from vocode.streaming.utils.dtmf_utils import DTMFToneGenerator, KeypadEntry
 from vocode.streaming.utils.worker import InterruptibleEvent
@@ -33,12 +32,22 @@ class TwilioOutputDevice(AbstractOutputDevice):
         self.stream_sid = stream_sid
         self.active = True
 
-        self._twilio_events_queue: asyncio.Queue[str] = asyncio.Queue()
+        # each item is a group of messages that are sent back-to-back, e.g. a chunk and its mark
+        self._twilio_events_queue: asyncio.Queue[Tuple[str, ...]] = asyncio.Queue()
         self._mark_message_queue: asyncio.Queue[MarkMessage] = asyncio.Queue()
         self._unprocessed_audio_chunks_queue: asyncio.Queue[InterruptibleEvent[AudioChunk]] = (
             asyncio.Queue()
         )
 
+    @property
+    def stream_sid(self) -> Optional[str]:
+        return self._stream_sid
+
+    @stream_sid.setter
+    def stream_sid(self, stream_sid: Optional[str]):
+        self._stream_sid = stream_sid
+        self._message_encoder = TwilioMediaStreamMessageEncoder(stream_sid)
+
     def consume_nonblocking(self, item: InterruptibleEvent[AudioChunk]):
         if not item.is_interrupted():
             self._send_audio_chunk_and_mark(
@@ -63,22 +72,18 @@ class TwilioOutputDevice(AbstractOutputDevice):
             dtmf_tone = tone_generator.generate(
                 keypad_entry, sampling_rate=self.sampling_rate, audio_encoding=self.audio_encoding
             )
-            dtmf_message = {
-                "event": "media",
-                "streamSid": self.stream_sid,
-                "media": {"payload": base64.b64encode(dtmf_tone).decode("utf-8")},
-            }
-            self._twilio_events_queue.put_nowait(json.dumps(dtmf_message))
+            self._twilio_events_queue.put_nowait((self._message_encoder.media_message(dtmf_tone),))
 
     async def _send_twilio_messages(self):
         while True:
             try:
-                twilio_event = await self._twilio_events_queue.get()
+                twilio_events = await self._twilio_events_queue.get()
             except asyncio.CancelledError:
                 return
             if self.ws.application_state == WebSocketState.DISCONNECTED:
                 break
-            await self.ws.send_text(twilio_event)
+            for twilio_event in twilio_events:
+                await self.ws.send_text(twilio_event)
 
     async def _process_mark_messages(self):
         while True:
@@ -115,24 +120,14 @@ class TwilioOutputDevice(AbstractOutputDevice):
         await asyncio.gather(send_twilio_messages_task, process_mark_messages_task)
 
     def _send_audio_chunk_and_mark(self, chunk: bytes, chunk_id: str):
-        media_message = {
-            "event": "media",
-            "streamSid": self.stream_sid,
-            "media": {"payload": base64.b64encode(chunk).decode("utf-8")},
-        }
-        self._twilio_events_queue.put_nowait(json.dumps(media_message))
-        mark_message = {
-            "event": "mark",
-            "streamSid": self.stream_sid,
-            "mark": {
-                "name": chunk_id,
-            },
-        }
-        self._twilio_events_queue.put_nowait(json.dumps(mark_message))
+        # Twilio expects one JSON message per websocket frame, so the media and mark messages are
+        # still written separately, but they're queued (and awaited) together
+        self._twilio_events_queue.put_nowait(
+            (
+                self._message_encoder.media_message(chunk),
+                self._message_encoder.mark_message(chunk_id),
+            )
+        )
 
     def _send_clear_message(self):
-        clear_message = {
-            "event": "clear",
-            "streamSid": self.stream_sid,
-        }
-        self._twilio_events_queue.put_nowait(json.dumps(clear_message))
+        self._twilio_events_queue.put_nowait((self._message_encoder.clear_message,))
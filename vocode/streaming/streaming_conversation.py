@@ -1,9 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-import queue
 import random
-import re
 import threading
 import time
 import typing
@@ -37,6 +35,7 @@ from vocode.streaming.agent.base_agent import (
     TranscriptionAgentInput,
 )
 from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
+from vocode.streaming.agent.speculative_generation import normalize_transcript_text
 from vocode.streaming.constants import (
     ALLOWED_IDLE_TIME,
     CHECK_HUMAN_PRESENT_MESSAGE_CHOICES,
@@ -66,11 +65,13 @@ from vocode.streaming.utils import (
 from vocode.streaming.utils.audio_pipeline import AudioPipeline, OutputDeviceType
 from vocode.streaming.utils.create_task import asyncio_create_task
 from vocode.streaming.utils.events_manager import EventsManager
+from vocode.streaming.utils.phrase_matcher import PhraseMatcher, PhraseMatchType, remove_punctuation
 from vocode.streaming.utils.speed_manager import SpeedManager
 from vocode.streaming.utils.state_manager import ConversationStateManager
 from vocode.streaming.utils.worker import (
     AbstractWorker,
     AsyncQueueWorker,
+    InterruptEpoch,
     InterruptibleAgentResponseEvent,
     InterruptibleAgentResponseWorker,
     InterruptibleEvent,
@@ -107,11 +108,19 @@ BACKCHANNEL_PATTERNS = [
     r"yeah+",
     "makes sense",
 ]
+BACKCHANNEL_MATCHER = PhraseMatcher(
+    [(pattern, pattern) for pattern in BACKCHANNEL_PATTERNS],
+    match_type=PhraseMatchType.EXACT,
+    is_regex=True,
+)
 LOW_INTERRUPT_SENSITIVITY_BACKCHANNEL_UTTERANCE_LENGTH_THRESHOLD = 2
 
 
 class StreamingConversation(AudioPipeline[OutputDeviceType]):
     class QueueingInterruptibleEventFactory(InterruptibleEventFactory):
+        """Creates events in the conversation's current InterruptEpoch, so broadcast_interrupt
+        interrupts them"""
+
         def __init__(self, conversation: "StreamingConversation"):
             self.conversation = conversation
 
@@ -120,12 +129,13 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
             payload: Any,
             is_interruptible: bool = True,
         ) -> InterruptibleEvent[Any]:
-            interruptible_event: InterruptibleEvent = super().create_interruptible_event(
+            return InterruptibleEvent(
                 payload,
-                is_interruptible,
+                is_interruptible=is_interruptible,
+                interruption_event=self.conversation.interrupt_epoch.create_interruption_event(
+                    is_interruptible
+                ),
             )
-            self.conversation.interruptible_events.put_nowait(interruptible_event)
-            return interruptible_event
 
         def create_interruptible_agent_response_event(
             self,
@@ -133,13 +143,16 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
             is_interruptible: bool = True,
             agent_response_tracker: Optional[asyncio.Event] = None,
         ) -> InterruptibleAgentResponseEvent:
-            interruptible_event = super().create_interruptible_agent_response_event(
+            agent_response_tracker = agent_response_tracker or asyncio.Event()
+            self.conversation.interrupt_epoch.track_agent_response(agent_response_tracker)
+            return InterruptibleAgentResponseEvent(
                 payload,
                 is_interruptible=is_interruptible,
                 agent_response_tracker=agent_response_tracker,
+                interruption_event=self.conversation.interrupt_epoch.create_interruption_event(
+                    is_interruptible
+                ),
             )
-            self.conversation.interruptible_events.put_nowait(interruptible_event)
-            return interruptible_event
 
     class TranscriptionsWorker(AsyncQueueWorker[Transcription]):
         """Processes all transcriptions: sends an interrupt if needed
@@ -163,6 +176,10 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
             self.has_associated_unignored_utterance: bool = False
             self.human_backchannels_buffer: List[Transcription] = []
             self.ignore_next_message: bool = False
+            # for speculative generation: the current interim transcript, and how many interim
+            # transcripts in a row have had its text
+            self.interim_transcript_text: Optional[str] = None
+            self.num_stable_interim_transcripts = 0
 
         def should_ignore_utterance(self, transcription: Transcription):
             if self.has_associated_unignored_utterance:
@@ -186,15 +203,11 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
 
             if num_words <= LOW_INTERRUPT_SENSITIVITY_BACKCHANNEL_UTTERANCE_LENGTH_THRESHOLD:
                 return True
-            cleaned = re.sub("[^\w\s]", "", transcription.message).strip().lower()
-            return any(re.fullmatch(regex, cleaned) for regex in BACKCHANNEL_PATTERNS)
+            cleaned = remove_punctuation(transcription.message).strip().lower()
+            return BACKCHANNEL_MATCHER.matches(cleaned)
 
         def _most_recent_transcript_messages(self) -> Iterator[Message]:
-            return (
-                event_log
-                for event_log in reversed(self.conversation.transcript.event_logs)
-                if isinstance(event_log, Message)
-            )
+            return self.conversation.transcript.iter_messages_reversed()
 
         def get_maybe_last_transcript_event_log(self) -> Optional[Message]:
             return next(self._most_recent_transcript_messages(), None)
@@ -227,6 +240,31 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
                 and not (is_first_bot_message and last_message.text.strip() == "")
             )
 
+        def maybe_speculate(self, transcription: Transcription):
+            """Lets the agent start generating a response once the interim transcript is stable"""
+            speculative_generation_config = (
+                self.conversation.agent.get_agent_config().speculative_generation_config
+            )
+            if speculative_generation_config is None or self.ignore_next_message:
+                return
+            interim_transcript_text = normalize_transcript_text(transcription.message)
+            if interim_transcript_text == self.interim_transcript_text:
+                self.num_stable_interim_transcripts += 1
+            else:
+                self.interim_transcript_text = interim_transcript_text
+                self.num_stable_interim_transcripts = 1
+            if (
+                self.num_stable_interim_transcripts
+                != speculative_generation_config.min_stable_interim_transcripts
+            ):
+                return
+            speculative_transcription = transcription.copy()
+            if speculative_transcription.is_interrupt:
+                speculative_transcription.bot_was_in_medias_res = self.is_bot_in_medias_res()
+            self.conversation.agent.speculate(
+                speculative_transcription, conversation_id=self.conversation.id
+            )
+
         async def process(self, transcription: Transcription):
             self.conversation.mark_last_action_timestamp()
             if transcription.message.strip() == "":
@@ -279,7 +317,11 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
 
             transcription.is_interrupt = self.conversation.current_transcription_is_interrupt
             self.conversation.is_human_speaking = not transcription.is_final
+            if not transcription.is_final:
+                self.maybe_speculate(transcription)
             if transcription.is_final:
+                self.interim_transcript_text = None
+                self.num_stable_interim_transcripts = 0
                 self.has_associated_ignored_utterance = False
                 self.has_associated_unignored_utterance = False
                 agent_response_tracker = None
@@ -387,6 +429,22 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
             self.chunk_size = self.conversation._get_synthesizer_chunk_size()
             self.last_agent_response_tracker: Optional[asyncio.Event] = None
             self.is_first_text_chunk = True
+            # input streaming synthesizers already synthesize ahead of playback
+            self.synthesis_lookahead = (
+                0
+                if isinstance(self.conversation.synthesizer, InputStreamingSynthesizer)
+                else self.conversation.synthesizer.get_synthesizer_config().synthesis_lookahead
+            )
+            # outputs of look-ahead synthesis, in the order they have to be sent to the consumer
+            self.lookahead_outputs: asyncio.Queue[
+                Tuple[InterruptibleAgentResponseEvent, asyncio.Future]
+            ] = asyncio.Queue()
+            # everything in lookahead_outputs or being sent, to cancel on interrupts
+            self.pending_lookahead_outputs: List[
+                Tuple[InterruptibleAgentResponseEvent, asyncio.Future]
+            ] = []
+            self.lookahead_slots = asyncio.Semaphore(self.synthesis_lookahead)
+            self.send_lookahead_outputs_task: Optional[asyncio.Task] = None
 
         def send_filler_audio(self, agent_response_tracker: Optional[asyncio.Event]):
             assert self.conversation.filler_audio_worker is not None
@@ -434,13 +492,20 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
                     logger.debug("Sending end of turn")
                     if isinstance(self.conversation.synthesizer, InputStreamingSynthesizer):
                         await self.conversation.synthesizer.handle_end_of_turn()
-                    self.consumer.consume_nonblocking(
+                    end_of_turn_event = (
                         self.interruptible_event_factory.create_interruptible_agent_response_event(
                             (agent_response_message.message, None),
                             is_interruptible=item.is_interruptible,
                             agent_response_tracker=item.agent_response_tracker,
-                        ),
+                        )
                     )
+                    if self.synthesis_lookahead:
+                        # keep the end of turn behind the messages that are still being synthesized
+                        end_of_turn_future: asyncio.Future = asyncio.Future()
+                        end_of_turn_future.set_result(end_of_turn_event)
+                        await self.send_in_order(end_of_turn_event, end_of_turn_future)
+                    else:
+                        self.consumer.consume_nonblocking(end_of_turn_event)
                     self.is_first_text_chunk = True
                     return
                 else:
@@ -484,43 +549,169 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
                         message=agent_response_message.message,
                         chunk_size=self.chunk_size,
                     )
+                elif self.synthesis_lookahead:
+                    logger.debug("Synthesizing speech for message ahead of playback")
+                    await self.synthesize_ahead(
+                        item,
+                        agent_response_message,
+                        create_speech_span=create_speech_span,
+                        synthesis_span=synthesis_span,
+                        ttft_span=ttft_span,
+                    )
                 else:
                     logger.debug("Synthesizing speech for message")
-                    maybe_synthesis_result = await self.conversation.synthesizer.create_speech(
-                        agent_response_message.message,
-                        self.chunk_size,
-                        is_first_text_chunk=self.is_first_text_chunk,
-                        is_sole_text_chunk=agent_response_message.is_sole_text_chunk,
+                    maybe_synthesis_result = await self.create_speech(
+                        agent_response_message, is_first_text_chunk=self.is_first_text_chunk
                     )
-                if create_speech_span:
-                    create_speech_span.finish()
-                # For input streaming synthesizers, subsequent chunks are contained in the same SynthesisResult
-                if isinstance(self.conversation.synthesizer, InputStreamingSynthesizer):
-                    if not self.is_first_text_chunk:
-                        maybe_synthesis_result = None
-                    elif isinstance(agent_response_message.message, LLMToken):
-                        maybe_synthesis_result = (
-                            self.conversation.synthesizer.get_current_utterance_synthesis_result()
+                if not self.synthesis_lookahead:
+                    if create_speech_span:
+                        create_speech_span.finish()
+                    # For input streaming synthesizers, subsequent chunks are contained in the same SynthesisResult
+                    if isinstance(self.conversation.synthesizer, InputStreamingSynthesizer):
+                        if not self.is_first_text_chunk:
+                            maybe_synthesis_result = None
+                        elif isinstance(agent_response_message.message, LLMToken):
+                            maybe_synthesis_result = (
+                                self.conversation.synthesizer.get_current_utterance_synthesis_result()
+                            )
+                    if maybe_synthesis_result is not None:
+                        self.consumer.consume_nonblocking(
+                            self.create_synthesis_result_event(
+                                item,
+                                agent_response_message,
+                                maybe_synthesis_result,
+                                synthesis_span=synthesis_span,
+                                ttft_span=ttft_span,
+                            )
                         )
-                if maybe_synthesis_result is not None:
-                    synthesis_result = maybe_synthesis_result
-                    synthesis_result.is_first = agent_response_message.is_first
-                    if not synthesis_result.cached and synthesis_span:
-                        synthesis_result.synthesis_total_span = synthesis_span
-                        synthesis_result.ttft_span = ttft_span
-                    self.consumer.consume_nonblocking(
-                        self.interruptible_event_factory.create_interruptible_agent_response_event(
-                            (agent_response_message.message, synthesis_result),
-                            is_interruptible=item.is_interruptible,
-                            agent_response_tracker=item.agent_response_tracker,
-                        ),
-                    )
                 self.last_agent_response_tracker = item.agent_response_tracker
                 if not isinstance(agent_response_message.message, SilenceMessage):
                     self.is_first_text_chunk = False
             except asyncio.CancelledError:
                 pass
 
+        def create_speech(
+            self, agent_response_message: AgentResponseMessage, is_first_text_chunk: bool
+        ) -> Awaitable[SynthesisResult]:
+            # end of turn messages are handled before they're synthesized
+            assert isinstance(agent_response_message.message, BaseMessage)
+            return self.conversation.synthesizer.create_speech(
+                agent_response_message.message,
+                self.chunk_size,
+                is_first_text_chunk=is_first_text_chunk,
+                is_sole_text_chunk=agent_response_message.is_sole_text_chunk,
+            )
+
+        def create_synthesis_result_event(
+            self,
+            item: InterruptibleAgentResponseEvent[AgentResponse],
+            agent_response_message: AgentResponseMessage,
+            synthesis_result: SynthesisResult,
+            synthesis_span: Optional[Span],
+            ttft_span: Optional[Span],
+        ) -> InterruptibleAgentResponseEvent[
+            Tuple[Union[BaseMessage, EndOfTurn], Optional[SynthesisResult]]
+        ]:
+            synthesis_result.is_first = agent_response_message.is_first
+            if not synthesis_result.cached and synthesis_span:
+                synthesis_result.synthesis_total_span = synthesis_span
+                synthesis_result.ttft_span = ttft_span
+            return self.interruptible_event_factory.create_interruptible_agent_response_event(
+                (agent_response_message.message, synthesis_result),
+                is_interruptible=item.is_interruptible,
+                agent_response_tracker=item.agent_response_tracker,
+            )
+
+        async def synthesize_ahead(
+            self,
+            item: InterruptibleAgentResponseEvent[AgentResponse],
+            agent_response_message: AgentResponseMessage,
+            create_speech_span: Optional[Span],
+            synthesis_span: Optional[Span],
+            ttft_span: Optional[Span],
+        ):
+            """Starts synthesizing the message and returns without waiting for it, so that up to
+            `synthesis_lookahead` messages are synthesized while the ones before them play.
+            Results are still sent to the consumer in order."""
+
+            is_first_text_chunk = self.is_first_text_chunk
+            # `item` stops being interruptible once `process` returns, so the look-ahead gets its
+            # own event for broadcast_interrupt to interrupt
+            lookahead_event = (
+                self.interruptible_event_factory.create_interruptible_agent_response_event(
+                    agent_response_message,
+                    is_interruptible=item.is_interruptible,
+                    agent_response_tracker=item.agent_response_tracker,
+                )
+            )
+
+            async def synthesize():
+                synthesis_result = await self.create_speech(
+                    agent_response_message, is_first_text_chunk=is_first_text_chunk
+                )
+                if create_speech_span:
+                    create_speech_span.finish()
+                return self.create_synthesis_result_event(
+                    lookahead_event,
+                    agent_response_message,
+                    synthesis_result,
+                    synthesis_span=synthesis_span,
+                    ttft_span=ttft_span,
+                )
+
+            await self.lookahead_slots.acquire()
+            await self.send_in_order(
+                lookahead_event, asyncio_create_task(synthesize()), has_slot=True
+            )
+
+        async def send_in_order(
+            self,
+            event: InterruptibleAgentResponseEvent,
+            output: asyncio.Future,
+            has_slot: bool = False,
+        ):
+            """Queues `output`, which resolves to the event for the consumer, behind the outputs
+            that are already pending. `event` is interrupted if the output is."""
+            if not has_slot:
+                await self.lookahead_slots.acquire()
+            self.lookahead_outputs.put_nowait((event, output))
+            self.pending_lookahead_outputs.append((event, output))
+            if self.send_lookahead_outputs_task is None:
+                self.send_lookahead_outputs_task = asyncio_create_task(
+                    self.send_lookahead_outputs()
+                )
+
+        async def send_lookahead_outputs(self):
+            while True:
+                event, output = await self.lookahead_outputs.get()
+                try:
+                    await asyncio.wait([output])
+                    if output.cancelled() or event.is_interrupted():
+                        continue
+                    if output.exception() is not None:
+                        logger.opt(exception=output.exception()).error(
+                            "Failed to synthesize speech ahead of playback"
+                        )
+                        continue
+                    self.consumer.consume_nonblocking(output.result())
+                finally:
+                    self.pending_lookahead_outputs.remove((event, output))
+                    self.lookahead_slots.release()
+
+        def cancel_current_task(self):
+            # cancel the look-ahead syntheses of everything broadcast_interrupt just interrupted
+            for event, output in self.pending_lookahead_outputs:
+                if event.is_interrupted():
+                    output.cancel()
+            return super().cancel_current_task()
+
+        async def terminate(self):
+            for _, output in self.pending_lookahead_outputs:
+                output.cancel()
+            if self.send_lookahead_outputs_task is not None:
+                self.send_lookahead_outputs_task.cancel()
+            return await super().terminate()
+
     class SynthesisResultsWorker(
         InterruptibleWorker[
             InterruptibleAgentResponseEvent[
@@ -607,7 +798,7 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
         self.synthesizer = synthesizer
         self.synthesis_enabled = True
 
-        self.interruptible_events: queue.Queue[InterruptibleEvent] = queue.Queue()
+        self.interrupt_epoch = InterruptEpoch()
         self.interruptible_event_factory = self.QueueingInterruptibleEventFactory(conversation=self)
         self.synthesis_results_queue: asyncio.Queue[
             InterruptibleAgentResponseEvent[
@@ -688,12 +879,11 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
             self.agent.get_agent_config().allowed_idle_time_seconds or ALLOWED_IDLE_TIME
         )
 
-        self.interrupt_lock = asyncio.Lock()
-
     def create_state_manager(self) -> ConversationStateManager:
         return ConversationStateManager(conversation=self)
 
     async def start(self, mark_ready: Optional[Callable[[], Awaitable[None]]] = None):
+        self.prefetch_predictable_messages()
         self.transcriber.start()
         self.transcriber.streaming_conversation = self
         self.transcriptions_worker.start()
@@ -738,6 +928,34 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
                 self.events_manager.start(),
             )
 
+    def prefetch_predictable_messages(self):
+        """Loads the bot utterances we can predict into the audio cache while the call connects"""
+        agent_config = self.agent.get_agent_config()
+        chunk_size = self._get_synthesizer_chunk_size()
+        # the initial message is synthesized right away, so only load it if it's already cached
+        if agent_config.initial_message:
+            asyncio_create_task(
+                self.synthesizer.prefetch_messages(
+                    [agent_config.initial_message], chunk_size, synthesize_missing=False
+                ),
+            )
+        upcoming_messages: List[BaseMessage] = []
+        if agent_config.num_check_human_present_times > 0:
+            upcoming_messages.extend(
+                BaseMessage(text=text) for text in CHECK_HUMAN_PRESENT_MESSAGE_CHOICES
+            )
+        if agent_config.cut_off_response:
+            upcoming_messages.extend(
+                BaseMessage(text=message.text) for message in agent_config.cut_off_response.messages
+            )
+        first_response_filler_message = getattr(agent_config, "first_response_filler_message", None)
+        if first_response_filler_message:
+            upcoming_messages.append(BotBackchannel(text=first_response_filler_message))
+        if upcoming_messages:
+            asyncio_create_task(
+                self.synthesizer.prefetch_messages(upcoming_messages, chunk_size),
+            )
+
     def set_check_for_idle_paused(self, paused: bool):
         logger.debug(f"Setting idle check paused to {paused}")
         if not paused:
@@ -860,25 +1078,14 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
 
         Returns true if any events were interrupted - which is used as a flag for the agent (is_interrupt)
         """
-        async with self.interrupt_lock:
-            num_interrupts = 0
-            while True:
-                try:
-                    interruptible_event = self.interruptible_events.get_nowait()
-                    if not interruptible_event.is_interrupted():
-                        if interruptible_event.interrupt():
-                            logger.debug(
-                                f"Interrupting event {type(interruptible_event.payload)} {interruptible_event.payload}",
-                            )
-                            num_interrupts += 1
-                except queue.Empty:
-                    break
-            self.output_device.interrupt()
-            self.agent.cancel_current_task()
-            self.agent_responses_worker.cancel_current_task()
-            if self.actions_worker:
-                self.actions_worker.cancel_current_task()
-            return num_interrupts > 0
+        # interrupts every event created so far at once, see InterruptEpoch
+        interrupted_any = self.interrupt_epoch.advance()
+        self.output_device.interrupt()
+        self.agent.cancel_current_task()
+        self.agent_responses_worker.cancel_current_task()
+        if self.actions_worker:
+            self.actions_worker.cancel_current_task()
+        return interrupted_any
 
     def is_interrupt(self, transcription: Transcription):
         return transcription.confidence >= (
@@ -991,15 +1198,15 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
                 "on_interrupt",
                 create_on_interrupt_callback(processed_event),
             )
-            # Prevents the case where we send a chunk after the output device has been interrupted
-            async with self.interrupt_lock:
-                self.output_device.consume_nonblocking(
-                    InterruptibleEvent(
-                        payload=audio_chunk,
-                        is_interruptible=True,
-                        interruption_event=stop_event,
-                    ),
-                )
+            # a chunk sent after an interrupt shares the interrupted stop event, so the output
+            # device drops it
+            self.output_device.consume_nonblocking(
+                InterruptibleEvent(
+                    payload=audio_chunk,
+                    is_interruptible=True,
+                    interruption_event=stop_event,
+                ),
+            )
             audio_chunks.append(audio_chunk)
             processed_events.append(processed_event)
 
@@ -1,47 +1,214 @@
-from typing import Optional
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
 
 from loguru import logger
 
 from vocode.streaming.utils.redis import initialize_redis_bytes
 from vocode.streaming.utils.singleton import Singleton
 
+DEFAULT_LOCAL_AUDIO_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_LOCAL_AUDIO_CACHE_MAX_ENTRY_BYTES = 2 * 1024 * 1024
+DEFAULT_AUDIO_CACHE_NEGATIVE_TTL_SECONDS = 60.0
+# almost every LLM sentence is a miss, so misses are bounded by count as well as by time
+DEFAULT_AUDIO_CACHE_MAX_NEGATIVE_ENTRIES = 10_000
+
+
+@dataclass
+class AudioCacheStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    negative_hits: int = 0
+    evictions: int = 0
+
+
+class LocalAudioCache:
+    """In-process LRU cache of audio bytes, bounded by the total size of the cached audio.
+    Entries set with a TTL expire like their Redis counterparts.
+
+    Also remembers up to `max_misses` misses for `negative_ttl_seconds`, so that phrases that
+    aren't in the remote cache don't cost a round-trip every time they're spoken.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_LOCAL_AUDIO_CACHE_MAX_BYTES,
+        max_entry_bytes: int = DEFAULT_LOCAL_AUDIO_CACHE_MAX_ENTRY_BYTES,
+        negative_ttl_seconds: float = DEFAULT_AUDIO_CACHE_NEGATIVE_TTL_SECONDS,
+        max_misses: int = DEFAULT_AUDIO_CACHE_MAX_NEGATIVE_ENTRIES,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_misses = max_misses
+        self.size_bytes = 0
+        self.evictions = 0
+        self.entries: OrderedDict[str, bytes] = OrderedDict()
+        # only for entries that were set with a TTL
+        self.entries_expire_at: Dict[str, float] = {}
+        # the TTL is the same for every miss, so the oldest misses expire first
+        self.misses_expire_at: OrderedDict[str, float] = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        audio = self.entries.get(key)
+        if audio is None:
+            return None
+        expires_at = self.entries_expire_at.get(key)
+        if expires_at is not None and expires_at < time.monotonic():
+            self.delete(key)
+            return None
+        self.entries.move_to_end(key)
+        return audio
+
+    def set(self, key: str, audio: bytes, ttl: Optional[float] = None):
+        self.misses_expire_at.pop(key, None)
+        self.delete(key)
+        if len(audio) > self.max_entry_bytes:
+            return
+        self.entries[key] = audio
+        if ttl is not None:
+            self.entries_expire_at[key] = time.monotonic() + ttl
+        self.size_bytes += len(audio)
+        while self.size_bytes > self.max_bytes:
+            evicted_key, evicted_audio = self.entries.popitem(last=False)
+            self.entries_expire_at.pop(evicted_key, None)
+            self.size_bytes -= len(evicted_audio)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        audio = self.entries.pop(key, None)
+        if audio is not None:
+            self.size_bytes -= len(audio)
+        self.entries_expire_at.pop(key, None)
+
+    def is_known_miss(self, key: str) -> bool:
+        expires_at = self.misses_expire_at.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del self.misses_expire_at[key]
+            return False
+        return True
+
+    def set_miss(self, key: str):
+        if self.negative_ttl_seconds <= 0 or self.max_misses <= 0:
+            return
+        now = time.monotonic()
+        self.misses_expire_at.pop(key, None)
+        self.misses_expire_at[key] = now + self.negative_ttl_seconds
+        while self.misses_expire_at:
+            oldest_key, expires_at = next(iter(self.misses_expire_at.items()))
+            if expires_at >= now and len(self.misses_expire_at) <= self.max_misses:
+                break
+            del self.misses_expire_at[oldest_key]
+
 
 class AudioCache(Singleton):
+    """Two-tier audio cache: an in-process LocalAudioCache in front of Redis.
+
+    The local tier is sized with VOCODE_LOCAL_AUDIO_CACHE_MAX_BYTES,
+    VOCODE_LOCAL_AUDIO_CACHE_MAX_ENTRY_BYTES, VOCODE_AUDIO_CACHE_NEGATIVE_TTL_SECONDS and
+    VOCODE_AUDIO_CACHE_MAX_NEGATIVE_ENTRIES; setting VOCODE_LOCAL_AUDIO_CACHE_MAX_BYTES to 0
+    disables it.
+    """
+
     def __init__(self):
         self.redis = initialize_redis_bytes()
         self.disabled = False
+        self.local_cache = LocalAudioCache(
+            max_bytes=int(
+                os.environ.get(
+                    "VOCODE_LOCAL_AUDIO_CACHE_MAX_BYTES", DEFAULT_LOCAL_AUDIO_CACHE_MAX_BYTES
+                )
+            ),
+            max_entry_bytes=int(
+                os.environ.get(
+                    "VOCODE_LOCAL_AUDIO_CACHE_MAX_ENTRY_BYTES",
+                    DEFAULT_LOCAL_AUDIO_CACHE_MAX_ENTRY_BYTES,
+                )
+            ),
+            negative_ttl_seconds=float(
+                os.environ.get(
+                    "VOCODE_AUDIO_CACHE_NEGATIVE_TTL_SECONDS",
+                    DEFAULT_AUDIO_CACHE_NEGATIVE_TTL_SECONDS,
+                )
+            ),
+            max_misses=int(
+                os.environ.get(
+                    "VOCODE_AUDIO_CACHE_MAX_NEGATIVE_ENTRIES",
+                    DEFAULT_AUDIO_CACHE_MAX_NEGATIVE_ENTRIES,
+                )
+            ),
+        )
+        self.stats = AudioCacheStats()
+        self.ping_task: Optional[asyncio.Task] = None
 
     @staticmethod
     async def safe_create():
-        if AudioCache in Singleton._instances:
-            return Singleton._instances[AudioCache]
-
         audio_cache = AudioCache()
+        # concurrent callers (e.g. prefetching and the initial message) wait for the same ping,
+        # so nobody uses the cache before we know whether Redis is up
+        if audio_cache.ping_task is None:
+            audio_cache.ping_task = asyncio.ensure_future(audio_cache.ping())
+        await asyncio.shield(audio_cache.ping_task)
+        return audio_cache
+
+    async def ping(self):
         try:
-            await audio_cache.redis.ping()
+            await self.redis.ping()
         except Exception:
             logger.warning("Redis ping failed on startup, disabling audio cache")
-            audio_cache.disabled = True
-        return audio_cache
+            self.disabled = True
 
     def get_audio_key(self, voice_identifier: str, text: str) -> str:
         return f"audio_cache:{voice_identifier}:{text}"
 
+    def get_stats(self) -> AudioCacheStats:
+        self.stats.evictions = self.local_cache.evictions
+        return self.stats
+
     async def get_audio(self, voice_identifier: str, text: str) -> Optional[bytes]:
         audio_key = self.get_audio_key(voice_identifier, text)
         if self.disabled:
             return None
-        return await self.redis.get(audio_key)
+
+        audio = self.local_cache.get(audio_key)
+        if audio is not None:
+            self.stats.local_hits += 1
+            return audio
+        if self.local_cache.is_known_miss(audio_key):
+            self.stats.negative_hits += 1
+            return None
+
+        # the TTL comes in the same round-trip, so the local copy expires with the Redis entry
+        async with self.redis.pipeline(transaction=False) as pipeline:
+            pipeline.get(audio_key)
+            pipeline.pttl(audio_key)
+            audio, ttl_milliseconds = await pipeline.execute()
+        if audio is None:
+            self.stats.misses += 1
+            self.local_cache.set_miss(audio_key)
+            return None
+        self.stats.redis_hits += 1
+        # negative if the entry has no TTL
+        self.local_cache.set(
+            audio_key, audio, ttl=ttl_milliseconds / 1000 if ttl_milliseconds > 0 else None
+        )
+        return audio
 
     async def set_audio(
         self, voice_identifier: str, text: str, audio: bytes, ttl: Optional[int] = None
     ):
-        # TODO: cache eviction
         if self.disabled:
             logger.warning("Audio cache is disabled")
             return
         logger.info(f"Setting audio for {voice_identifier} {text}")
         audio_key = self.get_audio_key(voice_identifier, text)
+        self.local_cache.set(audio_key, audio, ttl=ttl)
         await self.redis.set(audio_key, audio)
         if ttl is not None:
             await self.redis.expire(audio_key, ttl)
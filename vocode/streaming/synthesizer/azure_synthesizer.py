@@ -1,9 +1,9 @@
 import asyncio
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Optional
+from typing import AsyncGenerator, List, Optional, Tuple, Union
 from xml.etree import ElementTree
+from xml.sax.saxutils import unescape
 
 import azure.cognitiveservices.speech as speechsdk
 from loguru import logger
@@ -20,6 +20,9 @@ from vocode.streaming.synthesizer.base_synthesizer import (
     SynthesisResult,
     encode_as_wav,
 )
+from vocode.streaming.synthesizer.word_timeline import WordTimeline
+from vocode.streaming.utils.create_task import asyncio_create_task
+from vocode.streaming.utils.executor_registry import BoundedExecutor, ExecutorRegistry
 
 NAMESPACES = {
     "mstts": "https://www.w3.org/2001/mstts",
@@ -31,27 +34,73 @@ ElementTree.register_namespace("mstts", NAMESPACES["mstts"])
 
 _AZURE_INSIDE_VOICE_REGEX = r"<voice[^>]*>(.*?)<\/voice>"
 
+DEFAULT_AZURE_MAX_BUFFERED_CHUNKS = 4
+
 
 class AzureSynthesizerException(Exception):
     pass
 
 
-class WordBoundaryEventPool:
-    def __init__(self):
-        self.events = []
+class AzureAudioDataStreamReader:
+    """Reads an Azure AudioDataStream without blocking the event loop.
+
+    `read_data` blocks until Azure has more audio, so chunks are read on the executor's worker
+    threads, ahead of the consumer, into a fixed set of `max_buffered_chunks` buffers that are
+    reused for the whole utterance. Reading pauses while all of them hold unconsumed audio.
+    """
 
-    def add(self, event):
-        self.events.append(
-            {
-                "text": event.text,
-                "text_offset": event.text_offset,
-                "audio_offset": (event.audio_offset + 5000) / (10000 * 1000),
-                "boudary_type": event.boundary_type,
-            }
+    def __init__(
+        self,
+        audio_data_stream: speechsdk.AudioDataStream,
+        chunk_size: int,
+        executor: BoundedExecutor,
+        max_buffered_chunks: int = DEFAULT_AZURE_MAX_BUFFERED_CHUNKS,
+    ):
+        self.audio_data_stream = audio_data_stream
+        self.chunk_size = chunk_size
+        self.executor = executor
+        # read_data only accepts bytes, which it fills in place
+        self.free_buffers: asyncio.Queue[bytes] = asyncio.Queue()
+        for _ in range(max_buffered_chunks):
+            self.free_buffers.put_nowait(bytes(chunk_size))
+        self.filled_buffers: asyncio.Queue[Union[Tuple[bytes, int], BaseException]] = (
+            asyncio.Queue()
         )
+        self.read_task: Optional[asyncio.Task] = None
+
+    async def read_chunks(self) -> AsyncGenerator[Tuple[bytes, bool], None]:
+        """Yields (chunk, is_last); the last chunk holds whatever audio didn't fill a whole chunk."""
+        if self.read_task is None:
+            self.read_task = asyncio_create_task(self._read_ahead())
+        while True:
+            item = await self.filled_buffers.get()
+            if isinstance(item, BaseException):
+                raise item
+            buffer, filled_size = item
+            # copy the audio out, the buffer is about to be reused
+            chunk = bytes(memoryview(buffer)[:filled_size])
+            self.free_buffers.put_nowait(buffer)
+            is_last = filled_size < self.chunk_size
+            yield chunk, is_last
+            if is_last:
+                return
+
+    def stop(self):
+        if self.read_task is not None:
+            self.read_task.cancel()
 
-    def get_events_sorted(self):
-        return sorted(self.events, key=lambda event: event["audio_offset"])
+    async def _read_ahead(self):
+        try:
+            while True:
+                buffer = await self.free_buffers.get()
+                filled_size = await self.executor.run(self.audio_data_stream.read_data, buffer)
+                self.filled_buffers.put_nowait((buffer, filled_size))
+                if filled_size < self.chunk_size:
+                    return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.filled_buffers.put_nowait(e)
 
 
 class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
@@ -62,6 +111,7 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         synthesizer_config: AzureSynthesizerConfig,
         azure_speech_key: Optional[str] = None,
         azure_speech_region: Optional[str] = None,
+        executor: Optional[BoundedExecutor] = None,
     ):
         super().__init__(synthesizer_config)
         # Instantiates a client
@@ -110,7 +160,7 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         self.voice_name = self.synthesizer_config.voice_name
         self.pitch = self.synthesizer_config.pitch
         self.rate = self.synthesizer_config.rate
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        self.executor = executor or ExecutorRegistry().get_executor("azure_synthesizer")
 
     @classmethod
     def get_voice_identifier(cls, synthesizer_config: AzureSynthesizerConfig) -> str:
@@ -145,9 +195,7 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
             else:
                 logger.debug(f"Generating filler audio for {filler_phrase.text}")
                 ssml = self.create_ssml(filler_phrase.text)
-                result = await asyncio.get_event_loop().run_in_executor(
-                    self.thread_pool_executor, self.synthesizer.speak_ssml, ssml
-                )
+                result = await self.executor.run(self.synthesizer.speak_ssml, ssml)
                 offset = self.synthesizer_config.sampling_rate * self.OFFSET_MS // 1000
                 audio_data = result.audio_data[offset:]
                 with open(filler_audio_path, "wb") as f:
@@ -173,8 +221,26 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
             return with_mark
         return with_mark + self.add_marks(rest_stripped, index + 1)
 
-    def word_boundary_cb(self, evt, pool):
-        pool.add(evt)
+    def word_boundary_cb(
+        self,
+        evt,
+        word_timeline: WordTimeline,
+        ssml: str,
+        loop: asyncio.AbstractEventLoop,
+    ):
+        # evt.text_offset is where the word starts in the SSML, whose text is the stripped,
+        # escaped message
+        ssml_fragment = ssml[: evt.text_offset].split(">")[-1]
+        text_offset = min(
+            len(word_timeline.text)
+            - len(word_timeline.text.lstrip())
+            + len(unescape(ssml_fragment)),
+            len(word_timeline.text),
+        )
+        start_time = (evt.audio_offset + 5000) / (10000 * 1000)
+        # called on the Speech SDK's thread, but the timeline is read on the event loop
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(word_timeline.add_word, start_time, text_offset)
 
     def create_ssml(self, message: str) -> str:
         voice_language_code = self.synthesizer_config.voice_name[:5]
@@ -217,24 +283,6 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         # connection.open(True)
         pass
 
-    # given the number of seconds the message was allowed to go until, where did we get in the message?
-    def get_message_up_to(
-        self,
-        message: str,
-        ssml: str,
-        seconds: Optional[float],
-        word_boundary_event_pool: WordBoundaryEventPool,
-    ) -> str:
-        if seconds is None:
-            return message
-        events = word_boundary_event_pool.get_events_sorted()
-        for event in events:
-            if event["audio_offset"] > seconds:
-                ssml_fragment = ssml[: event["text_offset"]]
-                # TODO: this is a little hacky, but it works for now
-                return ssml_fragment.split(">")[-1]
-        return message
-
     async def _check_stream_for_errors(self, audio_data_stream: speechsdk.AudioDataStream):
         if (
             audio_data_stream.cancellation_details
@@ -251,8 +299,6 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         is_first_text_chunk: bool = False,
         is_sole_text_chunk: bool = False,
     ) -> SynthesisResult:
-        # offset = int(self.OFFSET_MS * (self.synthesizer_config.sampling_rate / 1000))
-        offset = 0
         logger.debug(f"Synthesizing message: {message}")
 
         # Azure will return no audio for certain strings like "-", "[-", and "!"
@@ -267,36 +313,25 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         async def chunk_generator(
             audio_data_stream: speechsdk.AudioDataStream, chunk_transform=lambda x: x
         ):
-            audio_buffer = bytes(chunk_size)
-            filled_size = await asyncio.get_event_loop().run_in_executor(
-                self.thread_pool_executor,
-                lambda: audio_data_stream.read_data(audio_buffer),
-            )
+            reader = AzureAudioDataStreamReader(audio_data_stream, chunk_size, self.executor)
+            is_first_chunk = True
+            try:
+                async for chunk, is_last in reader.read_chunks():
+                    # a failed synthesis cuts the stream short
+                    if is_first_chunk or is_last:
+                        await self._check_stream_for_errors(audio_data_stream)
+                    is_first_chunk = False
+                    yield SynthesisResult.ChunkResult(chunk_transform(chunk), is_last)
+            finally:
+                reader.stop()
 
-            await self._check_stream_for_errors(audio_data_stream)
-            if filled_size != chunk_size:
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer[offset:]), True)
-                return
-            else:
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer[offset:]), False)
-            while True:
-                audio_buffer = bytes(chunk_size)
-                filled_size = audio_data_stream.read_data(audio_buffer)
-                if filled_size != chunk_size:
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(audio_buffer[: filled_size - offset]), True
-                    )
-                    break
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), False)
-
-        word_boundary_event_pool = WordBoundaryEventPool()
-        self.synthesizer.synthesis_word_boundary.connect(
-            lambda event: self.word_boundary_cb(event, word_boundary_event_pool)
-        )
         ssml = message.ssml if isinstance(message, SSMLMessage) else self.create_ssml(message.text)
-        audio_data_stream = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor, self.synthesize_ssml, ssml
+        word_timeline = WordTimeline(message.text)
+        loop = asyncio.get_running_loop()
+        self.synthesizer.synthesis_word_boundary.connect(
+            lambda event: self.word_boundary_cb(event, word_timeline, ssml, loop)
         )
+        audio_data_stream = await self.executor.run(self.synthesize_ssml, ssml)
         if self.synthesizer_config.should_encode_as_wav:
             output_generator = chunk_generator(
                 audio_data_stream,
@@ -305,9 +340,4 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         else:
             output_generator = chunk_generator(audio_data_stream)
 
-        return SynthesisResult(
-            output_generator,
-            lambda seconds: self.get_message_up_to(
-                message.text, ssml, seconds, word_boundary_event_pool
-            ),
-        )
+        return SynthesisResult(output_generator, word_timeline.get_text_up_to)
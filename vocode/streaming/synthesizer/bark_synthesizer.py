@@ -1,6 +1,5 @@
-import asyncio
 import io
-from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import numpy as np
 from bark import SAMPLE_RATE, generate_audio, preload_models
@@ -10,12 +9,14 @@ from scipy.io.wavfile import write as write_wav
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import BarkSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.utils.executor_registry import BoundedExecutor, ExecutorRegistry
 
 
 class BarkSynthesizer(BaseSynthesizer[BarkSynthesizerConfig]):
     def __init__(
         self,
         synthesizer_config: BarkSynthesizerConfig,
+        executor: Optional[BoundedExecutor] = None,
     ) -> None:
         super().__init__(synthesizer_config)
 
@@ -23,7 +24,10 @@ class BarkSynthesizer(BaseSynthesizer[BarkSynthesizerConfig]):
         self.generate_audio = generate_audio
         logger.info("Loading Bark models")
         preload_models(**self.synthesizer_config.preload_kwargs)
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        # the model is compute-bound, running several generations at once only makes each slower
+        self.executor = executor or ExecutorRegistry().get_executor(
+            "bark_synthesizer", max_workers=1
+        )
 
     async def create_speech(
         self,
@@ -33,8 +37,7 @@ class BarkSynthesizer(BaseSynthesizer[BarkSynthesizerConfig]):
         is_sole_text_chunk: bool = False,
     ) -> SynthesisResult:
         logger.debug("Bark synthesizing audio")
-        audio_array = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor,
+        audio_array = await self.executor.run(
             self.generate_audio,
             message.text,
             **self.synthesizer_config.generate_kwargs,
@@ -1,7 +1,5 @@
 import asyncio
-import audioop
 import io
-import math
 import os
 import wave
 from typing import (
@@ -19,8 +17,6 @@ from typing import (
 
 import aiohttp
 from loguru import logger
-from nltk.tokenize import word_tokenize
-from nltk.tokenize.treebank import TreebankWordDetokenizer
 from sentry_sdk.tracing import Span as SentrySpan
 
 from vocode.streaming.models.agent import FillerAudioConfig
@@ -28,12 +24,14 @@ from vocode.streaming.models.audio import AudioEncoding, SamplingRate
 from vocode.streaming.models.message import BaseMessage, BotBackchannel, SilenceMessage
 from vocode.streaming.models.synthesizer import SynthesizerConfig
 from vocode.streaming.synthesizer.audio_cache import AudioCache
-from vocode.streaming.synthesizer.miniaudio_worker import MiniaudioWorker
+from vocode.streaming.synthesizer.input_streaming_synthesizer import InputStreamingSynthesizer
+from vocode.streaming.synthesizer.mp3_decode_pool import get_default_mp3_decode_pool
+from vocode.streaming.synthesizer.word_timeline import WordTimeline
 from vocode.streaming.telephony.constants import MULAW_SILENCE_BYTE, PCM_SILENCE_BYTE
 from vocode.streaming.utils import convert_wav, get_chunk_size_per_second
 from vocode.streaming.utils.async_requester import AsyncRequestor
+from vocode.streaming.utils.audio_transcoder import AudioTranscoder
 from vocode.streaming.utils.create_task import asyncio_create_task
-from vocode.streaming.utils.worker import QueueConsumer
 
 if TYPE_CHECKING:
     from vocode.streaming.streaming_conversation import StreamingConversation
@@ -314,14 +312,7 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
     def get_message_cutoff_from_voice_speed(
         message: BaseMessage, seconds: Optional[float], words_per_minute: int = 150
     ) -> str:
-
-        if seconds is None:
-            return message.text
-
-        words_per_second = words_per_minute / 60
-        estimated_words_spoken = math.floor(words_per_second * seconds)
-        tokens = word_tokenize(message.text)
-        return TreebankWordDetokenizer().detokenize(tokens[:estimated_words_spoken])
+        return WordTimeline.from_voice_speed(message.text, words_per_minute).get_text_up_to(seconds)
 
     async def get_cached_audio(
         self,
@@ -341,6 +332,48 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
             trailing_silence_seconds = message.trailing_silence_seconds
         return CachedAudio(message, audio_data, self.synthesizer_config, trailing_silence_seconds)
 
+    async def prefetch_messages(
+        self,
+        messages: List[BaseMessage],
+        chunk_size: int,
+        synthesize_missing: bool = True,
+    ):
+        """Loads utterances that are known ahead of time into the audio cache.
+
+        Cached audio is pulled into the in-process tier of the cache; if `synthesize_missing` is set,
+        audio that isn't cached yet is synthesized and stored, so that the first time the message
+        is spoken it comes from the cache. Never raises: prefetching is best effort.
+        """
+        audio_cache = await AudioCache.safe_create()
+        if audio_cache.disabled:
+            return
+        # input streaming synthesizers can't synthesize a standalone message, and wav-encoded
+        # chunks can't be stored as raw audio
+        can_synthesize = synthesize_missing and not (
+            isinstance(self, InputStreamingSynthesizer)
+            or self.synthesizer_config.should_encode_as_wav
+        )
+
+        async def prefetch_message(message: BaseMessage):
+            try:
+                if await self.get_cached_audio(message) is not None or not can_synthesize:
+                    return
+                synthesis_result = await self.create_speech_uncached(
+                    message, chunk_size, is_sole_text_chunk=True
+                )
+                audio = bytearray()
+                async for chunk_result in synthesis_result.chunk_generator:
+                    audio.extend(chunk_result.chunk)
+                await audio_cache.set_audio(
+                    self.get_voice_identifier(self.synthesizer_config),
+                    message.cache_phrase or message.text.strip(),
+                    bytes(audio),
+                )
+            except Exception:
+                logger.exception(f"Failed to prefetch audio for {message.text}")
+
+        await asyncio.gather(*(prefetch_message(message) for message in messages))
+
     async def create_speech_uncached(
         self,
         message: BaseMessage,
@@ -427,59 +460,54 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
         response: aiohttp.ClientResponse,
         chunk_size: int,
     ) -> AsyncGenerator[SynthesisResult.ChunkResult, None]:
-        miniaudio_worker_consumer: QueueConsumer = QueueConsumer()
-        miniaudio_worker = MiniaudioWorker(
-            self.synthesizer_config,
-            chunk_size,
+        # the decoded output is LINEAR16, and chunk_size is expressed in output bytes
+        if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
+            chunk_size *= 2
+        mp3_decode_stream = get_default_mp3_decode_pool().open_stream(
+            output_sample_rate=self.synthesizer_config.sampling_rate,
+            chunk_size=chunk_size,
         )
-        miniaudio_worker.consumer = miniaudio_worker_consumer
-        miniaudio_worker.start()
+        audio_transcoder = self.create_audio_transcoder(self.synthesizer_config.sampling_rate)
         stream_reader = response.content
 
-        # Create a task to send the mp3 chunks to the MiniaudioWorker's input queue in a separate loop
+        # Feed the mp3 chunks to the decode stream as they arrive, in a separate task
         async def send_chunks():
             async for chunk in stream_reader.iter_any():
-                miniaudio_worker.consume_nonblocking(chunk)
-            miniaudio_worker.consume_nonblocking(None)  # sentinel
+                mp3_decode_stream.feed(chunk)
+            mp3_decode_stream.end()
 
+        send_chunks_task = asyncio_create_task(send_chunks())
         try:
-            asyncio_create_task(send_chunks())
-
-            # Await the output queue of the MiniaudioWorker and yield the wav chunks in another loop
             while True:
-                # Get the wav chunk and the flag from the output queue of the MiniaudioWorker
-                wav_chunk, is_last = await miniaudio_worker_consumer.input_queue.get()
+                wav_chunk, is_last = await mp3_decode_stream.output_queue.get()
+                wav_chunk = audio_transcoder.transcode(wav_chunk)
                 if self.synthesizer_config.should_encode_as_wav:
                     wav_chunk = encode_as_wav(wav_chunk, self.synthesizer_config)
 
-                if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-                    wav_chunk = audioop.lin2ulaw(wav_chunk, 2)
-
                 yield SynthesisResult.ChunkResult(wav_chunk, is_last)
-                # If this is the last chunk, break the loop
                 if is_last:
                     break
         except asyncio.CancelledError:
             pass
         finally:
-            await miniaudio_worker.terminate()
+            send_chunks_task.cancel()
+            mp3_decode_stream.close()
 
-    def _resample_chunk(
+    def create_audio_transcoder(
         self,
-        chunk: bytes,
-        current_sample_rate: int,
-        target_sample_rate: int,
-    ) -> bytes:
-        resampled_chunk, _ = audioop.ratecv(
-            chunk,
-            2,
-            1,
-            current_sample_rate,
-            target_sample_rate,
-            None,
+        input_sample_rate: int,
+        input_encoding: AudioEncoding = AudioEncoding.LINEAR16,
+    ) -> AudioTranscoder:
+        """Creates a transcoder from the provider's audio format to the synthesizer's output format.
+
+        Create one per utterance: the transcoder keeps resampling state across the utterance's chunks.
+        """
+        return AudioTranscoder(
+            input_sample_rate=input_sample_rate,
+            output_sample_rate=self.synthesizer_config.sampling_rate,
+            input_encoding=input_encoding,
+            output_encoding=self.synthesizer_config.audio_encoding,
         )
 
-        return resampled_chunk
-
     async def tear_down(self):
         pass
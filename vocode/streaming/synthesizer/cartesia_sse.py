@@ -9,6 +9,7 @@ from vocode.streaming.models.audio import AudioEncoding, SamplingRate
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import CartesiaSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.synthesizer.word_timeline import WordTimeline
 from vocode.streaming.utils.create_task import asyncio_create_task
 
 
@@ -94,7 +95,7 @@ class CartesiaSSE(BaseSynthesizer[CartesiaSynthesizerConfig]):
 
         return SynthesisResult(
             self.chunk_result_generator_from_queue(chunk_queue),
-            lambda seconds: self.get_message_cutoff_from_voice_speed(message, seconds),
+            WordTimeline.from_voice_speed(message.text).get_text_up_to,
         )
 
     async def process_chunks(
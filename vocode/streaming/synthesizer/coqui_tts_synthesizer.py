@@ -1,6 +1,5 @@
-import asyncio
 import io
-from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import numpy as np
 from pydub import AudioSegment
@@ -9,19 +8,24 @@ from TTS.api import TTS
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import CoquiTTSSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.utils.executor_registry import BoundedExecutor, ExecutorRegistry
 
 
 class CoquiTTSSynthesizer(BaseSynthesizer[CoquiTTSSynthesizerConfig]):
     def __init__(
         self,
         synthesizer_config: CoquiTTSSynthesizerConfig,
+        executor: Optional[BoundedExecutor] = None,
     ):
         super().__init__(synthesizer_config)
 
         self.tts = TTS(**synthesizer_config.tts_kwargs)
         self.speaker = synthesizer_config.speaker
         self.language = synthesizer_config.language
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        # the model is compute-bound, running several generations at once only makes each slower
+        self.executor = executor or ExecutorRegistry().get_executor(
+            "coqui_tts_synthesizer", max_workers=1
+        )
 
     async def create_speech(
         self,
@@ -31,8 +35,7 @@ class CoquiTTSSynthesizer(BaseSynthesizer[CoquiTTSSynthesizerConfig]):
         is_sole_text_chunk: bool = False,
     ) -> SynthesisResult:
         tts = self.tts
-        audio_data = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor,
+        audio_data = await self.executor.run(
             tts.tts,
             message.text,
             self.speaker,
@@ -1,5 +1,3 @@
-from typing import Type
-
 from vocode.streaming.models.synthesizer import (
     AzureSynthesizerConfig,
     CartesiaSynthesizerConfig,
@@ -10,16 +8,43 @@ from vocode.streaming.models.synthesizer import (
     SynthesizerConfig,
 )
 from vocode.streaming.synthesizer.abstract_factory import AbstractSynthesizerFactory
-from vocode.streaming.synthesizer.azure_synthesizer import AzureSynthesizer
-from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer
-from vocode.streaming.synthesizer.cartesia_sse import CartesiaSSE
-from vocode.streaming.synthesizer.cartesia_synthesizer import CartesiaSynthesizer
-from vocode.streaming.synthesizer.eleven_labs_synthesizer import ElevenLabsSynthesizer
-from vocode.streaming.synthesizer.eleven_labs_websocket_synthesizer import ElevenLabsWSSynthesizer
-from vocode.streaming.synthesizer.play_ht_synthesizer import PlayHtSynthesizer
-from vocode.streaming.synthesizer.play_ht_synthesizer_v2 import PlayHtSynthesizerV2
-from vocode.streaming.synthesizer.rime_synthesizer import RimeSynthesizer
-from vocode.streaming.synthesizer.stream_elements_synthesizer import StreamElementsSynthesizer
+from vocode.streaming.utils.lazy_registry import LazyClassRegistry
+
+SYNTHESIZER_CLASSES: LazyClassRegistry[SynthesizerConfig] = LazyClassRegistry()
+SYNTHESIZER_CLASSES.register(
+    AzureSynthesizerConfig, "vocode.streaming.synthesizer.azure_synthesizer:AzureSynthesizer"
+)
+SYNTHESIZER_CLASSES.register(
+    CartesiaSynthesizerConfig,
+    lambda synthesizer_config: (
+        "vocode.streaming.synthesizer.cartesia_sse:CartesiaSSE"
+        if synthesizer_config.use_sse
+        else "vocode.streaming.synthesizer.cartesia_synthesizer:CartesiaSynthesizer"
+    ),
+)
+SYNTHESIZER_CLASSES.register(
+    ElevenLabsSynthesizerConfig,
+    lambda synthesizer_config: (
+        "vocode.streaming.synthesizer.eleven_labs_websocket_synthesizer:ElevenLabsWSSynthesizer"
+        if synthesizer_config.experimental_websocket
+        else "vocode.streaming.synthesizer.eleven_labs_synthesizer:ElevenLabsSynthesizer"
+    ),
+)
+SYNTHESIZER_CLASSES.register(
+    PlayHtSynthesizerConfig,
+    lambda synthesizer_config: (
+        "vocode.streaming.synthesizer.play_ht_synthesizer_v2:PlayHtSynthesizerV2"
+        if synthesizer_config.version == "2"
+        else "vocode.streaming.synthesizer.play_ht_synthesizer:PlayHtSynthesizer"
+    ),
+)
+SYNTHESIZER_CLASSES.register(
+    RimeSynthesizerConfig, "vocode.streaming.synthesizer.rime_synthesizer:RimeSynthesizer"
+)
+SYNTHESIZER_CLASSES.register(
+    StreamElementsSynthesizerConfig,
+    "vocode.streaming.synthesizer.stream_elements_synthesizer:StreamElementsSynthesizer",
+)
 
 
 class DefaultSynthesizerFactory(AbstractSynthesizerFactory):
@@ -27,25 +52,7 @@ class DefaultSynthesizerFactory(AbstractSynthesizerFactory):
         self,
         synthesizer_config: SynthesizerConfig,
     ):
-        if isinstance(synthesizer_config, AzureSynthesizerConfig):
-            return AzureSynthesizer(synthesizer_config)
-        elif isinstance(synthesizer_config, CartesiaSynthesizerConfig):
-            if synthesizer_config.use_sse:
-                return CartesiaSSE(synthesizer_config)
-            return CartesiaSynthesizer(synthesizer_config)
-        elif isinstance(synthesizer_config, ElevenLabsSynthesizerConfig):
-            eleven_labs_synthesizer_class_type: Type[BaseSynthesizer] = ElevenLabsSynthesizer
-            if synthesizer_config.experimental_websocket:
-                eleven_labs_synthesizer_class_type = ElevenLabsWSSynthesizer
-            return eleven_labs_synthesizer_class_type(synthesizer_config)
-        elif isinstance(synthesizer_config, PlayHtSynthesizerConfig):
-            if synthesizer_config.version == "2":
-                return PlayHtSynthesizerV2(synthesizer_config)
-            else:
-                return PlayHtSynthesizer(synthesizer_config)
-        elif isinstance(synthesizer_config, RimeSynthesizerConfig):
-            return RimeSynthesizer(synthesizer_config)
-        elif isinstance(synthesizer_config, StreamElementsSynthesizerConfig):
-            return StreamElementsSynthesizer(synthesizer_config)
-        else:
+        synthesizer_class = SYNTHESIZER_CLASSES.get_class(synthesizer_config)
+        if synthesizer_class is None:
             raise Exception("Invalid synthesizer config")
+        return synthesizer_class(synthesizer_config)
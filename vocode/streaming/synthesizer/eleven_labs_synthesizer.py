@@ -10,6 +10,7 @@ from vocode.streaming.models.audio import AudioEncoding, SamplingRate
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import ElevenLabsSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.synthesizer.word_timeline import WordTimeline
 from vocode.streaming.utils.create_task import asyncio_create_task
 
 ELEVEN_LABS_BASE_URL = "https://api.elevenlabs.io/v1/"
@@ -107,7 +108,7 @@ class ElevenLabsSynthesizer(BaseSynthesizer[ElevenLabsSynthesizerConfig]):
 
         return SynthesisResult(
             self.chunk_result_generator_from_queue(chunk_queue),
-            lambda seconds: self.get_message_cutoff_from_voice_speed(message, seconds, 150),
+            WordTimeline.from_voice_speed(message.text, 150).get_text_up_to,
         )
 
     @classmethod
@@ -151,13 +152,10 @@ class ElevenLabsSynthesizer(BaseSynthesizer[ElevenLabsSynthesizerConfig]):
                 raise ElevenlabsException(
                     f"ElevenLabs API returned {stream.status_code} status code and the following details: {error.decode('utf-8')}"
                 )
+            audio_transcoder = self.create_audio_transcoder(self.sample_rate)
             async for chunk in stream.aiter_bytes(chunk_size):
                 if self.upsample:
-                    chunk = self._resample_chunk(
-                        chunk,
-                        self.sample_rate,
-                        self.upsample,
-                    )
+                    chunk = audio_transcoder.transcode(chunk)
                 chunk_queue.put_nowait(chunk)
         except asyncio.CancelledError:
             pass
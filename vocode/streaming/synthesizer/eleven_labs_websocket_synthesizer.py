@@ -1,7 +1,6 @@
 import asyncio
-import audioop
 import base64
-from typing import AsyncGenerator, List, Optional, Tuple
+from typing import AsyncGenerator, Optional
 
 import numpy as np
 import websockets
@@ -14,6 +13,8 @@ from vocode.streaming.models.synthesizer import ElevenLabsSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
 from vocode.streaming.synthesizer.eleven_labs_synthesizer import ElevenLabsSynthesizer
 from vocode.streaming.synthesizer.input_streaming_synthesizer import InputStreamingSynthesizer
+from vocode.streaming.synthesizer.word_timeline import WordTimeline
+from vocode.streaming.utils.audio_transcoder import linear16_to_mulaw, mulaw_to_linear16
 
 NONCE = "071b5f21-3b24-4427-817e-62508007ae60"
 ELEVEN_LABS_BASE_URL = "wss://api.elevenlabs.io/v1/"
@@ -99,7 +100,7 @@ class ElevenLabsWSSynthesizer(
 
         self.text_chunk_queue: asyncio.Queue[Optional[BotBackchannel | LLMToken]] = asyncio.Queue()
         self.voice_packet_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
-        self.current_turn_utterances_by_chunk: List[Tuple[str, float]] = []
+        self.current_turn_word_timeline = WordTimeline()
         self.sample_width = 2 if synthesizer_config.audio_encoding == AudioEncoding.LINEAR16 else 1
 
         self.websocket_listener: asyncio.Task | None = None
@@ -152,12 +153,12 @@ class ElevenLabsWSSynthesizer(
 
     def reduce_chunk_amplitude(self, chunk: bytes, factor: float) -> bytes:
         if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-            chunk = audioop.ulaw2lin(chunk, 2)
+            chunk = mulaw_to_linear16(chunk)
         pcm = np.frombuffer(chunk, dtype=np.int16)
         pcm = (pcm * factor).astype(np.int16)
         pcm_bytes = pcm.tobytes()
         if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-            return audioop.lin2ulaw(pcm_bytes, 2)
+            return linear16_to_mulaw(pcm_bytes)
         else:
             return pcm_bytes
 
@@ -215,6 +216,7 @@ class ElevenLabsWSSynthesizer(
 
                 first_message = True
                 buffer = bytearray()
+                audio_transcoder = self.create_audio_transcoder(self.sample_rate)
                 while True:
                     message = await ws.recv()
                     if "audio" not in message:
@@ -227,16 +229,12 @@ class ElevenLabsWSSynthesizer(
                         )
 
                         if self.upsample:
-                            decoded = self._resample_chunk(
-                                decoded,
-                                self.sample_rate,
-                                self.upsample,
-                            )
+                            decoded = audio_transcoder.transcode(decoded)
                             seconds = len(decoded) / (self.sample_width * self.sample_rate)
 
                         if response.alignment:
                             utterance_chunk = "".join(response.alignment.chars) + " "
-                            self.current_turn_utterances_by_chunk.append((utterance_chunk, seconds))
+                            self.current_turn_word_timeline.append_text(utterance_chunk, seconds)
                         # For backchannels, send them all as one chunk (so it can't be interrupted) and reduce the volume
                         # so that in the case of a false endpoint, the backchannel is not too loud.
                         if first_message and backchannelled:
@@ -330,14 +328,7 @@ class ElevenLabsWSSynthesizer(
         )
 
     def get_current_message_so_far(self, seconds: Optional[float]) -> str:
-        seconds_idx = 0.0
-        buffer = ""
-        for utterance, duration in self.current_turn_utterances_by_chunk:
-            if seconds is not None and seconds_idx > seconds:
-                return buffer
-            buffer += utterance
-            seconds_idx += duration
-        return buffer
+        return self.current_turn_word_timeline.get_text_up_to(seconds)
 
     @classmethod
     def get_voice_identifier(cls, synthesizer_config: ElevenLabsSynthesizerConfig):
@@ -346,7 +337,7 @@ class ElevenLabsWSSynthesizer(
     async def handle_end_of_turn(self):
         self.end_of_turn = True
         await self.text_chunk_queue.put(None)
-        self.current_turn_utterances_by_chunk = []
+        self.current_turn_word_timeline = WordTimeline()
 
     async def cancel_websocket_tasks(self):
         self._cleanup_websocket_tasks()
@@ -1,8 +1,6 @@
-import asyncio
 import io
 import wave
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any
+from typing import Any, Optional
 
 import google.auth
 from google.cloud import texttospeech_v1beta1 as tts  # type: ignore
@@ -10,12 +8,14 @@ from google.cloud import texttospeech_v1beta1 as tts  # type: ignore
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import GoogleSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.utils.executor_registry import BoundedExecutor, ExecutorRegistry
 
 
 class GoogleSynthesizer(BaseSynthesizer[GoogleSynthesizerConfig]):
     def __init__(
         self,
         synthesizer_config: GoogleSynthesizerConfig,
+        executor: Optional[BoundedExecutor] = None,
     ):
         super().__init__(synthesizer_config)
 
@@ -39,7 +39,7 @@ class GoogleSynthesizer(BaseSynthesizer[GoogleSynthesizerConfig]):
             pitch=synthesizer_config.pitch,
             effects_profile_id=["telephony-class-application"],
         )
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        self.executor = executor or ExecutorRegistry().get_executor("google_synthesizer")
 
     def synthesize(self, message: str) -> Any:
         synthesis_input = tts.SynthesisInput(text=message)
@@ -64,9 +64,7 @@ class GoogleSynthesizer(BaseSynthesizer[GoogleSynthesizerConfig]):
         is_sole_text_chunk: bool = False,
     ) -> SynthesisResult:
         response: tts.SynthesizeSpeechResponse = (  # type: ignore
-            await asyncio.get_event_loop().run_in_executor(
-                self.thread_pool_executor, self.synthesize, message.text
-            )
+            await self.executor.run(self.synthesize, message.text)
         )
         output_sample_rate = response.audio_config.sample_rate_hertz
 
@@ -1,6 +1,5 @@
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from typing import Optional
 
 from gtts import gTTS
 from pydub import AudioSegment
@@ -8,16 +7,18 @@ from pydub import AudioSegment
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import GTTSSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.utils.executor_registry import BoundedExecutor, ExecutorRegistry
 
 
 class GTTSSynthesizer(BaseSynthesizer):
     def __init__(
         self,
         synthesizer_config: GTTSSynthesizerConfig,
+        executor: Optional[BoundedExecutor] = None,
     ):
         super().__init__(synthesizer_config)
 
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        self.executor = executor or ExecutorRegistry().get_executor("gtts_synthesizer")
 
     async def create_speech(
         self,
@@ -32,7 +33,7 @@ class GTTSSynthesizer(BaseSynthesizer):
             tts = gTTS(message.text)
             tts.write_to_fp(audio_file)
 
-        await asyncio.get_event_loop().run_in_executor(self.thread_pool_executor, thread)
+        await self.executor.run(thread)
         audio_file.seek(0)
         # TODO: probably needs to be in a thread
         audio_segment: AudioSegment = AudioSegment.from_mp3(audio_file)  # type: ignore
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import miniaudio
+from loguru import logger
+
+from vocode.streaming.utils.mp3_helper import IncrementalMP3Decoder
+
+DEFAULT_MP3_DECODE_POOL_MAX_WORKERS = 4
+
+
+@dataclass
+class MP3DecodePoolStats:
+    max_workers: int
+    num_open_streams: int = 0
+    # decode jobs waiting for a worker thread
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    num_decode_jobs: int = 0
+    total_queue_wait_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+    total_decode_seconds: float = 0.0
+    max_decode_seconds: float = 0.0
+
+    @property
+    def average_queue_wait_seconds(self) -> float:
+        return self.total_queue_wait_seconds / self.num_decode_jobs if self.num_decode_jobs else 0.0
+
+    @property
+    def average_decode_seconds(self) -> float:
+        return self.total_decode_seconds / self.num_decode_jobs if self.num_decode_jobs else 0.0
+
+
+class MP3DecodeStream:
+    """An utterance's MP3 stream, decoded on an MP3DecodePool's worker threads.
+
+    Call `feed` and `end` from the event loop, and read `(chunk, is_last)` tuples from
+    `output_queue`: LINEAR16 chunks of `chunk_size` bytes at `output_sample_rate`, the same output
+    as MiniaudioWorker. At most one decode job per stream is queued or running at a time, so chunks
+    are decoded and emitted in order.
+    """
+
+    def __init__(self, pool: MP3DecodePool, output_sample_rate: int, chunk_size: int):
+        self.pool = pool
+        self.chunk_size = chunk_size
+        self.output_queue: asyncio.Queue[Tuple[bytes, bool]] = asyncio.Queue()
+        self.decoder = IncrementalMP3Decoder(output_sample_rate)
+        self.closed = False
+        self._loop = asyncio.get_running_loop()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._failed = False
+        self._sent_last_chunk = False
+        # decoded audio that doesn't fill a chunk yet, only touched by the decode job
+        self._output_buffer = bytearray()
+
+    def feed(self, chunk: bytes):
+        if self.closed or self._failed:
+            return
+        self.decoder.feed(chunk)
+        self._schedule()
+
+    def end(self):
+        self.decoder.end()
+        self._schedule()
+
+    def close(self):
+        """Stops decoding, e.g. when the utterance is interrupted. Idempotent."""
+        if self.closed:
+            return
+        self.closed = True
+        self.pool._on_stream_closed()
+
+    def _has_work(self) -> bool:
+        if self.closed or self._sent_last_chunk:
+            return False
+        if self.decoder.ended:
+            return True
+        return not self._failed and self.decoder.num_decodable_frames() > 0
+
+    def _schedule(self):
+        with self._lock:
+            if self._scheduled or not self._has_work():
+                return
+            self._scheduled = True
+        self.pool._submit(self)
+
+    def _decode(self):
+        """Runs on a worker thread."""
+        try:
+            if not self.closed:
+                self._decode_available()
+        finally:
+            with self._lock:
+                self._scheduled = False
+            # pick up input that arrived while this job was running
+            self._schedule()
+
+    def _decode_available(self):
+        if not self._failed:
+            try:
+                self._output_buffer += self.decoder.decode_available()
+            except miniaudio.DecodeError as e:
+                logger.exception(f"MP3 decode error: {e}")
+                self._failed = True
+        num_full_chunks = len(self._output_buffer) // self.chunk_size
+        for i in range(num_full_chunks):
+            self._emit(
+                bytes(self._output_buffer[i * self.chunk_size : (i + 1) * self.chunk_size]), False
+            )
+        del self._output_buffer[: num_full_chunks * self.chunk_size]
+        if self.decoder.ended and (self.decoder.finished or self._failed):
+            self._emit(bytes(self._output_buffer), True)
+            self._output_buffer.clear()
+            self._sent_last_chunk = True
+
+    def _emit(self, chunk: bytes, is_last: bool):
+        try:
+            self._loop.call_soon_threadsafe(self.output_queue.put_nowait, (chunk, is_last))
+        except RuntimeError:
+            # the event loop is closed, nobody is listening anymore
+            self.closed = True
+
+
+class MP3DecodePool:
+    """Decodes streamed MP3 for many concurrent utterances on a fixed number of worker threads.
+
+    Streams are decoded incrementally as their MP3 arrives, so a worker thread is only busy while
+    there's audio to decode, never while a stream waits on the network. `get_stats` reports the
+    queue depth and how long decode jobs wait for and spend on a worker thread, for sizing
+    `max_workers` against the number of concurrent calls.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MP3_DECODE_POOL_MAX_WORKERS):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mp3_decode")
+        self.stats = MP3DecodePoolStats(max_workers=max_workers)
+        self._stats_lock = threading.Lock()
+
+    def open_stream(self, output_sample_rate: int, chunk_size: int) -> MP3DecodeStream:
+        """Must be called from the event loop that consumes the stream's output."""
+        with self._stats_lock:
+            self.stats.num_open_streams += 1
+        return MP3DecodeStream(self, output_sample_rate, chunk_size)
+
+    def get_stats(self) -> MP3DecodePoolStats:
+        with self._stats_lock:
+            return MP3DecodePoolStats(**self.stats.__dict__)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_stream_closed(self):
+        with self._stats_lock:
+            self.stats.num_open_streams -= 1
+
+    def _submit(self, stream: MP3DecodeStream):
+        with self._stats_lock:
+            self.stats.queue_depth += 1
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.stats.queue_depth)
+        self.executor.submit(self._run_decode_job, stream, time.monotonic())
+
+    def _run_decode_job(self, stream: MP3DecodeStream, submitted_at: float):
+        started_at = time.monotonic()
+        queue_wait_seconds = started_at - submitted_at
+        with self._stats_lock:
+            self.stats.queue_depth -= 1
+        try:
+            stream._decode()
+        finally:
+            decode_seconds = time.monotonic() - started_at
+            with self._stats_lock:
+                self.stats.num_decode_jobs += 1
+                self.stats.total_queue_wait_seconds += queue_wait_seconds
+                self.stats.max_queue_wait_seconds = max(
+                    self.stats.max_queue_wait_seconds, queue_wait_seconds
+                )
+                self.stats.total_decode_seconds += decode_seconds
+                self.stats.max_decode_seconds = max(self.stats.max_decode_seconds, decode_seconds)
+
+
+_default_mp3_decode_pool: Optional[MP3DecodePool] = None
+
+
+def get_default_mp3_decode_pool() -> MP3DecodePool:
+    """The process-wide pool, sized with VOCODE_MP3_DECODE_POOL_MAX_WORKERS."""
+    global _default_mp3_decode_pool
+    if _default_mp3_decode_pool is None:
+        _default_mp3_decode_pool = MP3DecodePool(
+            max_workers=int(
+                os.environ.get(
+                    "VOCODE_MP3_DECODE_POOL_MAX_WORKERS", DEFAULT_MP3_DECODE_POOL_MAX_WORKERS
+                )
+            )
+        )
+    return _default_mp3_decode_pool
@@ -8,6 +8,7 @@ from vocode.streaming.models.audio import AudioEncoding
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import PlayHtSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.synthesizer.word_timeline import WordTimeline
 
 TTS_ENDPOINT = "https://play.ht/api/v2/tts/stream"
 
@@ -104,14 +105,14 @@ class PlayHtSynthesizer(BaseSynthesizer[PlayHtSynthesizerConfig]):
                     self.experimental_mp3_streaming_output_generator(
                         response, chunk_size
                     ),  # should be wav
-                    lambda seconds: self.get_message_cutoff_from_voice_speed(
-                        message, seconds, self.words_per_minute
-                    ),
+                    WordTimeline.from_voice_speed(
+                        message.text, self.words_per_minute
+                    ).get_text_up_to,
                 )
             else:
                 return SynthesisResult(
                     self._streaming_chunk_generator(response, chunk_size, output_format),
-                    lambda seconds: self.get_message_cutoff_from_voice_speed(message, seconds, 150),
+                    WordTimeline.from_voice_speed(message.text, 150).get_text_up_to,
                 )
 
         raise Exception("Max retries reached for Play.ht API")
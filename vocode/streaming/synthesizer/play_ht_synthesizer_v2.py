@@ -1,5 +1,4 @@
 import asyncio
-import audioop
 import os
 from typing import AsyncGenerator, AsyncIterator, Optional
 
@@ -17,7 +16,9 @@ from vocode.streaming.synthesizer.play_ht_synthesizer import (
     PlayHtSynthesizer as VocodePlayHtSynthesizer,
 )
 from vocode.streaming.synthesizer.synthesizer_utils import split_text
+from vocode.streaming.synthesizer.word_timeline import WordTimeline
 from vocode.streaming.utils import generate_from_async_iter_with_lookahead, generate_with_is_last
+from vocode.streaming.utils.audio_transcoder import mulaw_to_linear16
 from vocode.streaming.utils.create_task import asyncio_create_task
 
 PLAY_HT_ON_PREM_ADDR = os.environ.get("VOCODE_PLAYHT_ON_PREM_ADDR", None)
@@ -100,17 +101,13 @@ class PlayHtSynthesizerV2(VocodePlayHtSynthesizer):
 
         return SynthesisResult(
             self.chunk_result_generator_from_queue(chunk_queue),
-            lambda seconds: self.get_message_cutoff_from_voice_speed(
-                message,
-                seconds,
-                self.words_per_minute,
-            ),
+            WordTimeline.from_voice_speed(message.text, self.words_per_minute).get_text_up_to,
         )
 
     def _contains_voice_experimental(self, chunk: bytes):
         pcm = np.frombuffer(
             (
-                audioop.ulaw2lin(chunk, 2)
+                mulaw_to_linear16(chunk)
                 if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW
                 else chunk
             ),
@@ -123,39 +120,23 @@ class PlayHtSynthesizerV2(VocodePlayHtSynthesizer):
         for buffer_idx in range(0, len(buffer) - chunk_size, chunk_size):
             yield buffer_idx, buffer[buffer_idx : buffer_idx + chunk_size]
 
-    async def _downsample_from_24khz(self, chunk: bytes) -> bytes:
-        if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-            return await self._downsample_mulaw(chunk)
-        elif self.synthesizer_config.audio_encoding == AudioEncoding.LINEAR16:
-            return await self._downsample_pcm(chunk)
-        else:
-            raise Exception(f"Unsupported audio format: {self.synthesizer_config.audio_encoding}")
-
-    async def _downsample_pcm(self, chunk: bytes) -> bytes:
-        downsampled_chunk, _ = audioop.ratecv(
-            chunk,
-            2,
-            1,
-            24000,
-            self.synthesizer_config.sampling_rate,
-            None,
-        )
-
-        return downsampled_chunk
-
-    async def _downsample_mulaw(self, chunk: bytes) -> bytes:
-        pcm_data = audioop.ulaw2lin(chunk, 2)
-        downsampled_pcm_data = await self._downsample_pcm(pcm_data)
-        downsampled_chunk = audioop.lin2ulaw(downsampled_pcm_data, 2)
-        return downsampled_chunk
-
     async def downsample_async_generator(self, async_gen: AsyncGenerator[bytes, None]):
+        if self.synthesizer_config.sampling_rate >= 24000:
+            async for play_ht_chunk in async_gen:
+                yield play_ht_chunk
+            return
+        audio_transcoder = self.create_audio_transcoder(
+            24000, input_encoding=self.synthesizer_config.audio_encoding
+        )
+        is_first_chunk = True
         async for play_ht_chunk in async_gen:
-            if self.synthesizer_config.sampling_rate >= 24000:
+            # the first LINEAR16 chunk is the wav header, which is skipped by the caller and
+            # shouldn't leak into the resampler state
+            if is_first_chunk and self.synthesizer_config.audio_encoding == AudioEncoding.LINEAR16:
                 yield play_ht_chunk
             else:
-                downsampled_chunk = await self._downsample_from_24khz(play_ht_chunk)
-                yield downsampled_chunk
+                yield audio_transcoder.transcode(play_ht_chunk)
+            is_first_chunk = False
 
     async def _cut_leading_trailing_silence(
         self,
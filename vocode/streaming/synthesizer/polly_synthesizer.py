@@ -1,6 +1,4 @@
-import asyncio
 import json
-from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 import boto3
@@ -12,12 +10,15 @@ from vocode.streaming.synthesizer.base_synthesizer import (
     SynthesisResult,
     encode_as_wav,
 )
+from vocode.streaming.synthesizer.word_timeline import WordTimeline
+from vocode.streaming.utils.executor_registry import BoundedExecutor, ExecutorRegistry
 
 
 class PollySynthesizer(BaseSynthesizer[PollySynthesizerConfig]):
     def __init__(
         self,
         synthesizer_config: PollySynthesizerConfig,
+        executor: Optional[BoundedExecutor] = None,
     ):
         super().__init__(synthesizer_config)
 
@@ -34,7 +35,7 @@ class PollySynthesizer(BaseSynthesizer[PollySynthesizerConfig]):
         self.client = client
         self.language_code = synthesizer_config.language_code
         self.voice_id = synthesizer_config.voice_id
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        self.executor = executor or ExecutorRegistry().get_executor("polly_synthesizer")
 
     def synthesize(self, message: str) -> Any:
         # Perform the text-to-speech request on the text input with the selected
@@ -59,21 +60,6 @@ class PollySynthesizer(BaseSynthesizer[PollySynthesizerConfig]):
             SpeechMarkTypes=["word"],
         )
 
-    # given the number of seconds the message was allowed to go until, where did we get in the message?
-    def get_message_up_to(
-        self,
-        message: str,
-        seconds: Optional[float],
-        word_events,
-    ) -> str:
-        if seconds is None:
-            return message
-        for event in word_events:
-            # time field is in ms
-            if event["time"] > seconds * 1000:
-                return message[: event["start"]]
-        return message
-
     async def create_speech(
         self,
         message: BaseMessage,
@@ -81,23 +67,19 @@ class PollySynthesizer(BaseSynthesizer[PollySynthesizerConfig]):
         is_first_text_chunk: bool = False,
         is_sole_text_chunk: bool = False,
     ) -> SynthesisResult:
-        audio_response = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor, self.synthesize, message.text
-        )
+        audio_response = await self.executor.run(self.synthesize, message.text)
         audio_stream = audio_response.get("AudioStream")
 
-        speech_marks_response = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor, self.get_speech_marks, message.text
-        )
-        word_events = [
-            json.loads(v)
-            for v in speech_marks_response.get("AudioStream").read().decode().split()
-            if v
-        ]
+        speech_marks_response = await self.executor.run(self.get_speech_marks, message.text)
+        word_timeline = WordTimeline(message.text)
+        for v in speech_marks_response.get("AudioStream").read().decode().split():
+            if v:
+                word_event = json.loads(v)
+                # time field is in ms
+                word_timeline.add_word(word_event["time"] / 1000, word_event["start"])
 
         async def chunk_generator(audio_data_stream, chunk_transform=lambda x: x):
-            audio_buffer = await asyncio.get_event_loop().run_in_executor(
-                self.thread_pool_executor,
+            audio_buffer = await self.executor.run(
                 lambda: audio_stream.read(chunk_size),
             )
             if len(audio_buffer) != chunk_size:
@@ -122,11 +104,4 @@ class PollySynthesizer(BaseSynthesizer[PollySynthesizerConfig]):
         else:
             output_generator = chunk_generator(audio_stream)
 
-        return SynthesisResult(
-            output_generator,
-            lambda seconds: self.get_message_up_to(
-                message.text,
-                seconds,
-                word_events,
-            ),
-        )
+        return SynthesisResult(output_generator, word_timeline.get_text_up_to)
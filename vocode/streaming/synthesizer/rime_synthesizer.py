@@ -1,5 +1,4 @@
 import asyncio
-import audioop
 import base64
 import io
 import json
@@ -9,7 +8,6 @@ import aiohttp
 from loguru import logger
 
 from vocode import getenv
-from vocode.streaming.models.audio import AudioEncoding
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import (
     RIME_DEFAULT_REDUCE_LATENCY,
@@ -83,8 +81,7 @@ class RimeSynthesizer(BaseSynthesizer[RimeSynthesizerConfig]):
             audio_content = data.get("audioContent")
             output_bytes = base64.b64decode(audio_content)[WAV_HEADER_LENGTH:]
 
-            if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-                output_bytes = audioop.lin2ulaw(output_bytes, 2)
+            output_bytes = self.create_audio_transcoder(self.sampling_rate).transcode(output_bytes)
 
             return SynthesisResult(
                 self._chunk_generator(output_bytes, chunk_size),
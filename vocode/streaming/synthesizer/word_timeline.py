@@ -0,0 +1,67 @@
+import re
+from bisect import bisect_right, insort
+from typing import List, Optional
+
+# words, including contractions, and runs of punctuation, which the words-per-minute estimates
+# count as words like NLTK's word_tokenize does
+_TOKEN_REGEX = re.compile(r"\w+(?:['’]\w+)*|[^\w\s]+")
+
+
+class WordTimeline:
+    """When each word of an utterance starts playing, for looking up how much of the utterance
+    was spoken as its audio plays.
+
+    Synthesizers add words as they learn their timings, and `get_text_up_to` is called every time
+    a chunk of audio is played: it bisects the start times and returns the text before the first
+    word that hadn't started, reusing the string from the previous call when no new word has
+    started since.
+    """
+
+    def __init__(self, text: str = ""):
+        self.text = text
+        self.start_times: List[float] = []
+        # where each word starts in `text`
+        self.text_offsets: List[int] = []
+        self.end_time = 0.0
+        self.last_text_offset: Optional[int] = None
+        self.last_text_up_to = ""
+
+    @classmethod
+    def from_voice_speed(cls, text: str, words_per_minute: int = 150) -> "WordTimeline":
+        """Estimates the timings by assuming every token takes the same time to say."""
+        timeline = cls(text)
+        # a token only counts as spoken once it's done, so the text up to the end of each token
+        # is what's been spoken until the next one is done
+        previous_token_end = 0
+        for idx, match in enumerate(_TOKEN_REGEX.finditer(text)):
+            timeline.add_word((idx + 1) * 60 / words_per_minute, previous_token_end)
+            previous_token_end = match.end()
+        return timeline
+
+    def add_word(self, start_time: float, text_offset: int):
+        if not self.start_times or start_time >= self.start_times[-1]:
+            # offsets first, so a lookup never finds a start time without its offset
+            self.text_offsets.append(text_offset)
+            self.start_times.append(start_time)
+            return
+        idx = bisect_right(self.start_times, start_time)
+        self.text_offsets.insert(idx, text_offset)
+        insort(self.start_times, start_time)
+
+    def append_text(self, text: str, duration: float):
+        """Adds a chunk of text that starts playing once the text before it has played."""
+        self.add_word(self.end_time, len(self.text))
+        self.text += text
+        self.end_time += duration
+
+    def get_text_up_to(self, seconds: Optional[float]) -> str:
+        """Returns the text before the first word that starts after `seconds`, or all of the text
+        if `seconds` is None or every word has started."""
+        if seconds is None:
+            return self.text
+        idx = bisect_right(self.start_times, seconds)
+        text_offset = self.text_offsets[idx] if idx < len(self.text_offsets) else len(self.text)
+        if text_offset != self.last_text_offset:
+            self.last_text_offset = text_offset
+            self.last_text_up_to = self.text[:text_offset]
+        return self.last_text_up_to
@@ -5,6 +5,8 @@ DEFAULT_SAMPLING_RATE: int = SamplingRate.RATE_8000.value
 DEFAULT_AUDIO_ENCODING = AudioEncoding.MULAW
 DEFAULT_CHUNK_SIZE = 20 * 160
 MULAW_SILENCE_BYTE = b"\xff"
+# number of 20ms inbound media frames coalesced into one chunk of audio for the transcriber
+DEFAULT_TWILIO_INBOUND_FRAMES_PER_CHUNK = 5
 
 VONAGE_SAMPLING_RATE: int = SamplingRate.RATE_16000.value
 VONAGE_AUDIO_ENCODING = AudioEncoding.LINEAR16
@@ -22,9 +22,14 @@ from vocode.streaming.output_device.twilio_output_device import (
 from vocode.streaming.synthesizer.abstract_factory import AbstractSynthesizerFactory
 from vocode.streaming.telephony.client.twilio_client import TwilioClient
 from vocode.streaming.telephony.config_manager.base_config_manager import BaseConfigManager
+from vocode.streaming.telephony.constants import DEFAULT_TWILIO_INBOUND_FRAMES_PER_CHUNK
 from vocode.streaming.telephony.conversation.abstract_phone_conversation import (
     AbstractPhoneConversation,
 )
+from vocode.streaming.telephony.twilio_media_stream import (
+    TwilioInboundAudioBuffer,
+    parse_inbound_media_payload,
+)
 from vocode.streaming.transcriber.abstract_factory import AbstractTranscriberFactory
 from vocode.streaming.utils.async_requester import AsyncRequestor
 from vocode.streaming.utils.events_manager import EventsManager
@@ -58,6 +63,7 @@ class TwilioPhoneConversation(AbstractPhoneConversation[TwilioOutputDevice]):
         record_call: bool = False,
         speed_coefficient: float = 2.0,
         noise_suppression: bool = False,  # is currently a no-op
+        inbound_frames_per_chunk: int = DEFAULT_TWILIO_INBOUND_FRAMES_PER_CHUNK,
     ):
         super().__init__(
             direction=direction,
@@ -86,6 +92,9 @@ class TwilioPhoneConversation(AbstractPhoneConversation[TwilioOutputDevice]):
         )
         self.twilio_sid = twilio_sid
         self.record_call = record_call
+        self.inbound_audio_buffer = TwilioInboundAudioBuffer(
+            frames_per_chunk=inbound_frames_per_chunk
+        )
 
     def create_state_manager(self) -> TwilioPhoneConversationStateManager:
         return TwilioPhoneConversationStateManager(self)
@@ -113,6 +122,8 @@ class TwilioPhoneConversation(AbstractPhoneConversation[TwilioOutputDevice]):
 
     async def _wait_for_twilio_start(self, ws: WebSocket):
         assert isinstance(self.output_device, TwilioOutputDevice)
+        # dial the transcriber while Twilio sets up the media stream
+        self.transcriber.preconnect()
         while True:
             message = await ws.receive_text()
             if not message:
@@ -130,20 +141,33 @@ class TwilioPhoneConversation(AbstractPhoneConversation[TwilioOutputDevice]):
         if message is None:
             return TwilioPhoneConversationWebsocketAction.CLOSE_WEBSOCKET
 
+        # media messages make up almost all of the traffic, so they skip json.loads
+        frame = parse_inbound_media_payload(message)
+        if frame is not None:
+            self._receive_inbound_frame(frame)
+            return None
+
         data = json.loads(message)
         if data["event"] == "media":
             media = data["media"]
-            chunk = base64.b64decode(media["payload"])
-            self.receive_audio(chunk)
+            self._receive_inbound_frame(base64.b64decode(media["payload"]))
         if data["event"] == "mark":
             chunk_id = data["mark"]["name"]
             self.output_device.enqueue_mark_message(ChunkFinishedMarkMessage(chunk_id=chunk_id))
         elif data["event"] == "stop":
             logger.debug(f"Media WS: Received event 'stop': {message}")
             logger.debug("Stopping...")
+            chunk = self.inbound_audio_buffer.flush()
+            if chunk is not None:
+                self.receive_audio(chunk)
             return TwilioPhoneConversationWebsocketAction.CLOSE_WEBSOCKET
         return None
 
+    def _receive_inbound_frame(self, frame: bytes):
+        chunk = self.inbound_audio_buffer.add_frame(frame)
+        if chunk is not None:
+            self.receive_audio(chunk)
+
     async def start_call_recording(self, call_sid: str) -> Optional[dict]:
         try:
             url = f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_config.account_sid}/Calls/{call_sid}/Recordings.json"
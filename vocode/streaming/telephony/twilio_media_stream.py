@@ -0,0 +1,95 @@
+import json
+from typing import Optional
+
+try:
+    # optional SIMD-accelerated drop-in replacement for base64
+    from pybase64 import b64decode, b64encode
+except ImportError:
+    from base64 import b64decode, b64encode
+
+# Twilio sends compact JSON with the event name first, e.g.
+# {"event":"media","sequenceNumber":"3","media":{"track":"inbound","chunk":"1","timestamp":"5","payload":"..."},"streamSid":"..."}
+_INBOUND_MEDIA_MESSAGE_PREFIX = '{"event":"media",'
+_PAYLOAD_KEY = '"payload":"'
+
+
+class TwilioMediaStreamMessageEncoder:
+    """Renders outbound Twilio Media Streams messages.
+
+    The JSON around the payload is pre-rendered once per stream with the streamSid baked in, so
+    framing a chunk of audio is a base64 encode and a string concatenation instead of building and
+    serializing a dict.
+    """
+
+    def __init__(self, stream_sid: Optional[str]):
+        stream_sid_json = json.dumps(stream_sid)
+        self._media_message_prefix = (
+            '{"event": "media", "streamSid": ' + stream_sid_json + ', "media": {"payload": "'
+        )
+        self._media_message_suffix = '"}}'
+        self._mark_message_prefix = (
+            '{"event": "mark", "streamSid": ' + stream_sid_json + ', "mark": {"name": '
+        )
+        self._mark_message_suffix = "}}"
+        self.clear_message = '{"event": "clear", "streamSid": ' + stream_sid_json + "}"
+
+    def media_message(self, chunk: bytes) -> str:
+        # base64 output never needs escaping inside a JSON string
+        return (
+            self._media_message_prefix
+            + b64encode(chunk).decode("ascii")
+            + self._media_message_suffix
+        )
+
+    def mark_message(self, name: str) -> str:
+        return self._mark_message_prefix + json.dumps(name) + self._mark_message_suffix
+
+
+def parse_inbound_media_payload(message: str) -> Optional[bytes]:
+    """Returns the decoded audio of an inbound media message without parsing the rest of its JSON.
+
+    Returns None if message isn't a media message in the compact form Twilio sends, in which case
+    it should be parsed with json.loads.
+    """
+    if not message.startswith(_INBOUND_MEDIA_MESSAGE_PREFIX):
+        return None
+    payload_start = message.find(_PAYLOAD_KEY, len(_INBOUND_MEDIA_MESSAGE_PREFIX))
+    if payload_start == -1:
+        return None
+    payload_start += len(_PAYLOAD_KEY)
+    payload_end = message.find('"', payload_start)
+    # base64 never needs escaping, so an escape sequence means this isn't a plain payload
+    if payload_end == -1 or message.find("\\", payload_start, payload_end) != -1:
+        return None
+    return b64decode(message[payload_start:payload_end])
+
+
+class TwilioInboundAudioBuffer:
+    """Coalesces inbound 20ms media frames into larger chunks before they're sent to the transcriber.
+
+    Frames are decoded into one reusable buffer, and a chunk is emitted every `frames_per_chunk`
+    frames, which cuts the per-frame overhead of the transcription pipeline at the cost of up to
+    `frames_per_chunk - 1` frames of latency.
+    """
+
+    def __init__(self, frames_per_chunk: int):
+        self.frames_per_chunk = frames_per_chunk
+        self._buffer = bytearray()
+        self._num_buffered_frames = 0
+
+    def add_frame(self, frame: bytes) -> Optional[bytes]:
+        if self.frames_per_chunk <= 1:
+            return frame
+        self._buffer += frame
+        self._num_buffered_frames += 1
+        if self._num_buffered_frames < self.frames_per_chunk:
+            return None
+        return self.flush()
+
+    def flush(self) -> Optional[bytes]:
+        if not self._buffer:
+            return None
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        self._num_buffered_frames = 0
+        return chunk
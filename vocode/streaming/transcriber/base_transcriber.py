@@ -41,6 +41,11 @@ class AbstractTranscriber(Generic[TranscriberConfigType], AbstractWorker[bytes])
     async def ready(self):
         return True
 
+    def preconnect(self):
+        """Starts connecting to the transcription service before audio is sent, e.g. while a phone
+        call is being set up. No-op unless the transcriber keeps a connection."""
+        pass
+
     def create_silent_chunk(self, chunk_size, sample_width=2):
         linear_audio = b"\0" * chunk_size
         if self.get_transcriber_config().audio_encoding == AudioEncoding.LINEAR16:
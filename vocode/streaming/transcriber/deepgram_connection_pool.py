@@ -0,0 +1,151 @@
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import websockets
+from loguru import logger
+from websockets.client import WebSocketClientProtocol
+
+from vocode.streaming.utils.create_task import asyncio_create_task
+
+DEFAULT_MAX_IDLE_CONNECTIONS_PER_KEY = 2
+# Deepgram closes streams that haven't received audio or a KeepAlive for ~10 seconds
+DEFAULT_KEEPALIVE_INTERVAL_SECONDS = 5.0
+DEFAULT_MAX_IDLE_SECONDS = 60.0
+
+KEEPALIVE_MESSAGE = json.dumps({"type": "KeepAlive"})
+
+ConnectionKey = Tuple[str, str]
+
+
+class DeepgramConnectionPool:
+    """Pre-dials Deepgram streaming websockets, so that transcribers don't pay for DNS, TLS and
+    the websocket handshake when a conversation starts.
+
+    Connections are keyed by the listen URL (which encodes the whole transcriber config) and the
+    Authorization header. Each Deepgram stream is single-use, so acquired connections are never
+    returned to the pool: `prewarm` dials new ones, and idle connections are kept open with KeepAlive
+    messages for up to `max_idle_seconds`.
+
+    Share one pool between conversations (e.g. via DefaultTranscriberFactory) and call `prewarm`
+    ahead of expected calls, or rely on DeepgramTranscriber.preconnect for per-call pre-dialing.
+    """
+
+    def __init__(
+        self,
+        max_idle_connections_per_key: int = DEFAULT_MAX_IDLE_CONNECTIONS_PER_KEY,
+        keepalive_interval_seconds: float = DEFAULT_KEEPALIVE_INTERVAL_SECONDS,
+        max_idle_seconds: float = DEFAULT_MAX_IDLE_SECONDS,
+    ):
+        self.max_idle_connections_per_key = max_idle_connections_per_key
+        self.keepalive_interval_seconds = keepalive_interval_seconds
+        self.max_idle_seconds = max_idle_seconds
+        # key -> (connection, time it was connected)
+        self.idle_connections: Dict[ConnectionKey, Deque[Tuple[WebSocketClientProtocol, float]]] = (
+            {}
+        )
+        self.pending_connections: Dict[ConnectionKey, List[asyncio.Task]] = {}
+        self.keepalive_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def get_connection_key(url: str, extra_headers: Dict[str, str]) -> ConnectionKey:
+        return url, extra_headers.get("Authorization", "")
+
+    def num_idle_connections(self, url: str, extra_headers: Dict[str, str]) -> int:
+        key = self.get_connection_key(url, extra_headers)
+        return len(self.idle_connections.get(key, ()))
+
+    def prewarm(self, url: str, extra_headers: Dict[str, str], num_connections: int = 1):
+        """Dials connections in the background, up to max_idle_connections_per_key."""
+        key = self.get_connection_key(url, extra_headers)
+        pending_connections = self.pending_connections.setdefault(key, [])
+        num_connections = min(
+            num_connections,
+            self.max_idle_connections_per_key
+            - len(self.idle_connections.get(key, ()))
+            - len(pending_connections),
+        )
+        for _ in range(num_connections):
+            pending_connections.append(
+                asyncio_create_task(self._connect_and_park(key, url, extra_headers))
+            )
+        if self.keepalive_task is None:
+            self.keepalive_task = asyncio_create_task(self._keep_alive())
+
+    async def acquire(self, url: str, extra_headers: Dict[str, str]) -> WebSocketClientProtocol:
+        """Returns an open connection, preferring idle and in-flight pre-dialed ones. The caller
+        owns (and must close) the connection."""
+        key = self.get_connection_key(url, extra_headers)
+        while True:
+            connection = self._pop_idle_connection(key)
+            if connection is not None:
+                return connection
+            pending_connections = self.pending_connections.get(key)
+            if not pending_connections:
+                break
+            await asyncio.wait(pending_connections, return_when=asyncio.FIRST_COMPLETED)
+        return await websockets.connect(url, extra_headers=extra_headers)
+
+    async def close(self):
+        if self.keepalive_task is not None:
+            self.keepalive_task.cancel()
+            self.keepalive_task = None
+        for pending_connections in self.pending_connections.values():
+            for task in pending_connections:
+                task.cancel()
+        self.pending_connections.clear()
+        idle_connections = [
+            connection
+            for connections in self.idle_connections.values()
+            for connection, _ in connections
+        ]
+        self.idle_connections.clear()
+        await asyncio.gather(
+            *(connection.close() for connection in idle_connections), return_exceptions=True
+        )
+
+    def _pop_idle_connection(self, key: ConnectionKey) -> Optional[WebSocketClientProtocol]:
+        idle_connections = self.idle_connections.get(key)
+        while idle_connections:
+            connection, connected_at = idle_connections.popleft()
+            if connection.open and time.monotonic() - connected_at < self.max_idle_seconds:
+                return connection
+            asyncio_create_task(connection.close())
+        return None
+
+    async def _connect_and_park(self, key: ConnectionKey, url: str, extra_headers: Dict[str, str]):
+        current_task = asyncio.current_task()
+        try:
+            connection = await websockets.connect(url, extra_headers=extra_headers)
+            self.idle_connections.setdefault(key, deque()).append((connection, time.monotonic()))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to pre-dial Deepgram: {e}")
+        finally:
+            pending_connections = self.pending_connections.get(key, [])
+            if current_task in pending_connections:
+                pending_connections.remove(current_task)
+
+    async def _keep_alive(self):
+        while True:
+            await asyncio.sleep(self.keepalive_interval_seconds)
+            now = time.monotonic()
+            # connections can be acquired (and keys added) while KeepAlives are being sent
+            for idle_connections in list(self.idle_connections.values()):
+                for idle_connection in list(idle_connections):
+                    if idle_connection not in idle_connections:
+                        continue
+                    connection, connected_at = idle_connection
+                    if not connection.open or now - connected_at >= self.max_idle_seconds:
+                        idle_connections.remove(idle_connection)
+                        asyncio_create_task(connection.close())
+                        continue
+                    try:
+                        await connection.send(KEEPALIVE_MESSAGE)
+                    except Exception:
+                        logger.debug("Dropping idle Deepgram connection that failed a KeepAlive")
+                        if idle_connection in idle_connections:
+                            idle_connections.remove(idle_connection)
@@ -1,7 +1,8 @@
 import asyncio
 import json
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple, Union
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlencode
 
 import sentry_sdk
@@ -21,6 +22,8 @@ from vocode.streaming.models.transcriber import (
     Transcription,
 )
 from vocode.streaming.transcriber.base_transcriber import BaseAsyncTranscriber
+from vocode.streaming.transcriber.deepgram_connection_pool import DeepgramConnectionPool
+from vocode.streaming.utils.create_task import asyncio_create_task
 from vocode.utils.sentry_utils import CustomSentrySpans, sentry_configured, sentry_create_span
 
 PUNCTUATION_TERMINATORS = [".", "!", "?"]
@@ -58,17 +61,51 @@ class DeepgramUtteranceEnd(BaseModel):
         return "DeepgramUtteranceEnd()"
 
 
-class DeepgramTranscriptionResult(BaseModel):
-    class TranscriptionChoice(BaseModel):
-        transcript: str
-        confidence: float
-        words: List[dict]
+class DeepgramTranscriptionResult:
+    """A Deepgram `Results` message.
 
-    is_final: bool
-    speech_final: bool
-    top_choice: TranscriptionChoice
-    start: float
-    duration: float
+    Decoded straight from the parsed JSON, without validating it into a pydantic model: this runs
+    for every interim result of every call. The words of the top choice aren't copied, and are only
+    read when they're needed (e.g. to compute time silent).
+    """
+
+    class TranscriptionChoice:
+        __slots__ = ("transcript", "confidence", "_alternative")
+
+        def __init__(self, alternative: dict):
+            self.transcript: str = alternative["transcript"]
+            self.confidence: float = alternative["confidence"]
+            self._alternative = alternative
+
+        @property
+        def words(self) -> List[dict]:
+            return self._alternative.get("words", [])
+
+    __slots__ = ("is_final", "speech_final", "top_choice", "start", "duration")
+
+    def __init__(
+        self,
+        is_final: bool,
+        speech_final: bool,
+        top_choice: TranscriptionChoice,
+        start: float,
+        duration: float,
+    ):
+        self.is_final = is_final
+        self.speech_final = speech_final
+        self.top_choice = top_choice
+        self.start = start
+        self.duration = duration
+
+    @classmethod
+    def from_results_message(cls, data: dict) -> "DeepgramTranscriptionResult":
+        return cls(
+            is_final=data["is_final"],
+            speech_final=data["speech_final"],
+            top_choice=cls.TranscriptionChoice(data["channel"]["alternatives"][0]),
+            start=data["start"],
+            duration=data["duration"],
+        )
 
     def __str__(self):
         return f"DeepgramTranscriptionResult(transcript={self.top_choice.transcript}, is_final={self.is_final}, speech_final={self.speech_final})"
@@ -78,6 +115,7 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
     def __init__(
         self,
         transcriber_config: DeepgramTranscriberConfig,
+        connection_pool: Optional[DeepgramConnectionPool] = None,
     ):
         super().__init__(transcriber_config)
         self.api_key = self.transcriber_config.api_key or getenv("DEEPGRAM_API_KEY")
@@ -106,6 +144,10 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
 
         self.is_first_transcription = True
 
+        self.connection_pool = connection_pool
+        # (url, connect task) of the connection dialed by preconnect
+        self.preconnect_task: Optional[Tuple[str, asyncio.Task[WebSocketClientProtocol]]] = None
+
     def _get_speed_coefficient(self):
         return self.speed_manager.get_speed_coefficient() if self.speed_manager else 1.0
 
@@ -168,6 +210,63 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
         url_params.update(extra_params)
         return f"{self.ws_url}/v1/listen?{urlencode(url_params, doseq=True)}"
 
+    def get_extra_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Token {self.api_key}"}
+
+    def preconnect(self):
+        """Starts dialing Deepgram, so that the connection is ready by the time audio is sent."""
+        if self.preconnect_task is not None:
+            return
+        deepgram_url = self.get_deepgram_url()
+        self.preconnect_task = (
+            deepgram_url,
+            asyncio_create_task(self._open_connection(deepgram_url)),
+        )
+
+    async def _open_connection(self, deepgram_url: str) -> WebSocketClientProtocol:
+        logger.info(f"Connecting to Deepgram at {deepgram_url}")
+        if self.connection_pool is not None:
+            return await self.connection_pool.acquire(deepgram_url, self.get_extra_headers())
+        return await websockets.connect(deepgram_url, extra_headers=self.get_extra_headers())
+
+    async def _take_preconnected_connection(
+        self, deepgram_url: str
+    ) -> Optional[WebSocketClientProtocol]:
+        if self.preconnect_task is None:
+            return None
+        preconnect_url, preconnect_task = self.preconnect_task
+        if preconnect_url != deepgram_url:
+            # the config (e.g. the speed coefficient) changed since preconnect
+            self._discard_preconnected_connection()
+            return None
+        self.preconnect_task = None
+        try:
+            return await preconnect_task
+        except Exception as e:
+            logger.warning(f"Failed to preconnect to Deepgram, reconnecting: {e}")
+            return None
+
+    def _discard_preconnected_connection(self):
+        if self.preconnect_task is None:
+            return
+        _, preconnect_task = self.preconnect_task
+        self.preconnect_task = None
+        if not preconnect_task.done():
+            preconnect_task.cancel()
+        elif not preconnect_task.cancelled() and preconnect_task.exception() is None:
+            asyncio_create_task(preconnect_task.result().close())
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[WebSocketClientProtocol]:
+        deepgram_url = self.get_deepgram_url()
+        ws = await self._take_preconnected_connection(deepgram_url) or await self._open_connection(
+            deepgram_url
+        )
+        try:
+            yield ws
+        finally:
+            await ws.close()
+
     async def _run_loop(self):
         restarts = 0
         while not self._ended and restarts < NUM_RESTARTS:
@@ -192,6 +291,7 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
         terminate_msg = json.dumps({"type": "CloseStream"}).encode("utf-8")
         self.consume_nonblocking(terminate_msg)  # todo (dow-107): typing
         self._ended = True
+        self._discard_preconnected_connection()
         await super().terminate()
 
     def get_input_sample_width(self):
@@ -389,12 +489,8 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
         self.audio_cursor = 0.0
         self.start_ts = now()
 
-        extra_headers = {"Authorization": f"Token {self.api_key}"}
-        deepgram_url = self.get_deepgram_url()
-        logger.info(f"Connecting to Deepgram at {deepgram_url}")
-
         try:
-            async with websockets.connect(deepgram_url, extra_headers=extra_headers) as ws:
+            async with self._connect() as ws:
                 self.connected_ts = now()
 
                 async def sender(
@@ -444,12 +540,8 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
                         deepgram_response: Union[DeepgramUtteranceEnd, DeepgramTranscriptionResult]
 
                         if data["type"] == "Results":
-                            deepgram_response = DeepgramTranscriptionResult(
-                                is_final=data["is_final"],
-                                speech_final=data["speech_final"],
-                                top_choice=data["channel"]["alternatives"][0],
-                                duration=data["duration"],
-                                start=data["start"],
+                            deepgram_response = DeepgramTranscriptionResult.from_results_message(
+                                data
                             )
                         elif data["type"] == "UtteranceEnd":
                             deepgram_response = DeepgramUtteranceEnd()
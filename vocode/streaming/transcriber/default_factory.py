@@ -1,3 +1,5 @@
+from typing import Optional
+
 from vocode.streaming.models.transcriber import (
     AssemblyAITranscriberConfig,
     AzureTranscriberConfig,
@@ -8,30 +10,45 @@ from vocode.streaming.models.transcriber import (
     TranscriberConfig,
 )
 from vocode.streaming.transcriber.abstract_factory import AbstractTranscriberFactory
-from vocode.streaming.transcriber.assembly_ai_transcriber import AssemblyAITranscriber
-from vocode.streaming.transcriber.azure_transcriber import AzureTranscriber
-from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
-from vocode.streaming.transcriber.gladia_transcriber import GladiaTranscriber
-from vocode.streaming.transcriber.google_transcriber import GoogleTranscriber
-from vocode.streaming.transcriber.rev_ai_transcriber import RevAITranscriber
+from vocode.streaming.transcriber.deepgram_connection_pool import DeepgramConnectionPool
+from vocode.streaming.utils.lazy_registry import LazyClassRegistry
+
+TRANSCRIBER_CLASSES: LazyClassRegistry[TranscriberConfig] = LazyClassRegistry()
+TRANSCRIBER_CLASSES.register(
+    DeepgramTranscriberConfig,
+    "vocode.streaming.transcriber.deepgram_transcriber:DeepgramTranscriber",
+)
+TRANSCRIBER_CLASSES.register(
+    GoogleTranscriberConfig, "vocode.streaming.transcriber.google_transcriber:GoogleTranscriber"
+)
+TRANSCRIBER_CLASSES.register(
+    AssemblyAITranscriberConfig,
+    "vocode.streaming.transcriber.assembly_ai_transcriber:AssemblyAITranscriber",
+)
+TRANSCRIBER_CLASSES.register(
+    RevAITranscriberConfig, "vocode.streaming.transcriber.rev_ai_transcriber:RevAITranscriber"
+)
+TRANSCRIBER_CLASSES.register(
+    AzureTranscriberConfig, "vocode.streaming.transcriber.azure_transcriber:AzureTranscriber"
+)
+TRANSCRIBER_CLASSES.register(
+    GladiaTranscriberConfig, "vocode.streaming.transcriber.gladia_transcriber:GladiaTranscriber"
+)
 
 
 class DefaultTranscriberFactory(AbstractTranscriberFactory):
+    def __init__(self, deepgram_connection_pool: Optional[DeepgramConnectionPool] = None):
+        self.deepgram_connection_pool = deepgram_connection_pool
+
     def create_transcriber(
         self,
         transcriber_config: TranscriberConfig,
     ):
-        if isinstance(transcriber_config, DeepgramTranscriberConfig):
-            return DeepgramTranscriber(transcriber_config)
-        elif isinstance(transcriber_config, GoogleTranscriberConfig):
-            return GoogleTranscriber(transcriber_config)
-        elif isinstance(transcriber_config, AssemblyAITranscriberConfig):
-            return AssemblyAITranscriber(transcriber_config)
-        elif isinstance(transcriber_config, RevAITranscriberConfig):
-            return RevAITranscriber(transcriber_config)
-        elif isinstance(transcriber_config, AzureTranscriberConfig):
-            return AzureTranscriber(transcriber_config)
-        elif isinstance(transcriber_config, GladiaTranscriberConfig):
-            return GladiaTranscriber(transcriber_config)
-        else:
+        transcriber_class = TRANSCRIBER_CLASSES.get_class(transcriber_config)
+        if transcriber_class is None:
             raise Exception("Invalid transcriber config")
+        if isinstance(transcriber_config, DeepgramTranscriberConfig):
+            return transcriber_class(
+                transcriber_config, connection_pool=self.deepgram_connection_pool
+            )
+        return transcriber_class(transcriber_config)
@@ -2,7 +2,6 @@ import ctypes
 import io
 import pathlib
 import wave
-from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from pydub import AudioSegment
@@ -49,7 +48,6 @@ class WhisperCPPTranscriber(BaseThreadAsyncTranscriber[WhisperCPPTranscriberConf
         self.params.print_realtime = False
         self.params.print_progress = False
         self.params.single_segment = True
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
 
     def create_new_buffer(self):
         buffer = io.BytesIO()
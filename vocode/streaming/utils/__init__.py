@@ -1,5 +1,4 @@
 import asyncio
-import audioop
 import random
 import secrets
 import wave
@@ -7,6 +6,7 @@ from string import ascii_letters, digits
 from typing import Any, AsyncGenerator, AsyncIterator, Callable, List, Tuple, TypeVar
 
 from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.utils.audio_transcoder import AudioTranscoder
 
 custom_alphabet = ascii_letters + digits + ".-_"
 
@@ -28,14 +28,14 @@ def convert_linear_audio(
     output_encoding=AudioEncoding.LINEAR16,
     output_sample_width=2,
 ):
-    # downsample
-    if input_sample_rate != output_sample_rate:
-        raw_wav, _ = audioop.ratecv(raw_wav, 2, 1, input_sample_rate, output_sample_rate, None)
-
-    if output_encoding == AudioEncoding.LINEAR16:
-        return raw_wav
-    elif output_encoding == AudioEncoding.MULAW:
-        return audioop.lin2ulaw(raw_wav, output_sample_width)
+    # AudioTranscoder only handles 16-bit linear audio
+    if output_sample_width != 2:
+        raise ValueError(f"Unsupported sample width {output_sample_width}, only 2 is supported")
+    return AudioTranscoder(
+        input_sample_rate=input_sample_rate,
+        output_sample_rate=output_sample_rate,
+        output_encoding=output_encoding,
+    ).transcode(raw_wav)
 
 
 def convert_wav(
@@ -0,0 +1,176 @@
+import os
+from enum import Enum
+from typing import Optional
+
+import numpy as np
+
+from vocode.streaming.models.audio import AudioEncoding
+
+try:
+    import audioop
+except ImportError:  # audioop was removed from the standard library in Python 3.13
+    audioop = None  # type: ignore
+
+
+class AudioTranscoderBackend(str, Enum):
+    AUDIOOP = "audioop"
+    NUMPY = "numpy"
+
+
+DEFAULT_AUDIO_TRANSCODER_BACKEND = AudioTranscoderBackend(
+    os.environ.get(
+        "VOCODE_AUDIO_TRANSCODER_BACKEND",
+        AudioTranscoderBackend.AUDIOOP if audioop is not None else AudioTranscoderBackend.NUMPY,
+    )
+)
+
+# G.711 mu-law constants, matching the tables used by audioop
+_MULAW_BIAS = 0x84
+_MULAW_CLIP = 32635
+
+
+def _build_mulaw_decode_table() -> np.ndarray:
+    u_val = ~np.arange(256, dtype=np.int32) & 0xFF
+    t = (((u_val & 0x0F) << 3) + _MULAW_BIAS) << ((u_val & 0x70) >> 4)
+    return np.where(u_val & 0x80, _MULAW_BIAS - t, t - _MULAW_BIAS).astype(np.int16)
+
+
+def _build_mulaw_encode_table() -> np.ndarray:
+    """Maps every int16 sample (offset by 32768) to its mu-law byte"""
+    pcm = np.arange(-32768, 32768, dtype=np.int32) >> 2
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(pcm), _MULAW_CLIP >> 2) + (_MULAW_BIAS >> 2)
+    segment_ends = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+    segment = np.searchsorted(segment_ends, magnitude)
+    u_val = np.where(
+        segment >= 8,
+        0x7F,
+        (segment << 4) | ((magnitude >> (np.minimum(segment, 7) + 1)) & 0x0F),
+    )
+    return (u_val ^ mask).astype(np.uint8)
+
+
+_MULAW_DECODE_TABLE = _build_mulaw_decode_table()
+_MULAW_ENCODE_TABLE = _build_mulaw_encode_table()
+
+
+def mulaw_to_linear16(chunk: bytes) -> bytes:
+    return _MULAW_DECODE_TABLE[np.frombuffer(chunk, dtype=np.uint8)].tobytes()
+
+
+def linear16_to_mulaw(chunk: bytes) -> bytes:
+    pcm = np.frombuffer(chunk, dtype=np.int16)
+    return _MULAW_ENCODE_TABLE[pcm.astype(np.int32) + 32768].tobytes()
+
+
+class AudioTranscoder:
+    """Converts a stream of mono audio chunks between encodings and sampling rates.
+
+    Decoding, resampling and encoding happen in one pass per chunk, and the resampler state is
+    carried over between chunks, so chunk boundaries don't introduce clicks. Use one transcoder
+    per audio stream (e.g. per utterance) and call `reset` before reusing it for another stream.
+
+    The AUDIOOP backend relies on audioop.ratecv; the NUMPY backend is a vectorized linear
+    interpolation resampler that writes into reusable buffers and doesn't need audioop, which
+    is deprecated.
+    """
+
+    def __init__(
+        self,
+        input_sample_rate: int,
+        output_sample_rate: int,
+        input_encoding: AudioEncoding = AudioEncoding.LINEAR16,
+        output_encoding: AudioEncoding = AudioEncoding.LINEAR16,
+        backend: AudioTranscoderBackend = DEFAULT_AUDIO_TRANSCODER_BACKEND,
+    ):
+        if backend == AudioTranscoderBackend.AUDIOOP and audioop is None:
+            raise ValueError("audioop is not available, use the numpy backend instead")
+        self.input_sample_rate = input_sample_rate
+        self.output_sample_rate = output_sample_rate
+        self.input_encoding = input_encoding
+        self.output_encoding = output_encoding
+        self.backend = backend
+        self._input_samples = np.empty(0, dtype=np.float32)
+        self._output_samples = np.empty(0, dtype=np.float32)
+        self.reset()
+
+    @property
+    def is_passthrough(self) -> bool:
+        return (
+            self.input_sample_rate == self.output_sample_rate
+            and self.input_encoding == self.output_encoding
+        )
+
+    def reset(self):
+        self._ratecv_state = None
+        # the last input sample of the previous chunk, at index 0 of the next interpolation window
+        self._carried_sample: Optional[float] = None
+        # position of the next output sample, relative to the start of the next interpolation window
+        self._position = 0.0
+
+    def transcode(self, chunk: bytes) -> bytes:
+        if self.is_passthrough or not chunk:
+            return chunk
+        if self.backend == AudioTranscoderBackend.AUDIOOP:
+            return self._transcode_audioop(chunk)
+        return self._transcode_numpy(chunk)
+
+    def _transcode_audioop(self, chunk: bytes) -> bytes:
+        if self.input_encoding == AudioEncoding.MULAW:
+            chunk = audioop.ulaw2lin(chunk, 2)
+        if self.input_sample_rate != self.output_sample_rate:
+            chunk, self._ratecv_state = audioop.ratecv(
+                chunk,
+                2,
+                1,
+                self.input_sample_rate,
+                self.output_sample_rate,
+                self._ratecv_state,
+            )
+        if self.output_encoding == AudioEncoding.MULAW:
+            chunk = audioop.lin2ulaw(chunk, 2)
+        return chunk
+
+    def _transcode_numpy(self, chunk: bytes) -> bytes:
+        if self.input_encoding == AudioEncoding.MULAW:
+            pcm = _MULAW_DECODE_TABLE[np.frombuffer(chunk, dtype=np.uint8)]
+        else:
+            pcm = np.frombuffer(chunk, dtype=np.int16)
+
+        if self.input_sample_rate != self.output_sample_rate:
+            pcm = self._resample_numpy(pcm)
+
+        if self.output_encoding == AudioEncoding.MULAW:
+            return _MULAW_ENCODE_TABLE[pcm.astype(np.int32) + 32768].tobytes()
+        return pcm.astype(np.int16, copy=False).tobytes()
+
+    def _resample_numpy(self, pcm: np.ndarray) -> np.ndarray:
+        offset = 0 if self._carried_sample is None else 1
+        window_length = len(pcm) + offset
+        if len(self._input_samples) < window_length:
+            self._input_samples = np.empty(window_length, dtype=np.float32)
+        window = self._input_samples[:window_length]
+        if self._carried_sample is not None:
+            window[0] = self._carried_sample
+        window[offset:] = pcm
+
+        step = self.input_sample_rate / self.output_sample_rate
+        # interpolate every output position strictly before the last sample of the window,
+        # which is carried over to the next chunk
+        last_index = window_length - 1
+        num_output_samples = max(int(np.ceil((last_index - self._position) / step)), 0)
+        if len(self._output_samples) < num_output_samples:
+            self._output_samples = np.empty(num_output_samples, dtype=np.float32)
+        positions = self._output_samples[:num_output_samples]
+        np.multiply(np.arange(num_output_samples, dtype=np.float32), step, out=positions)
+        positions += self._position
+        indices = positions.astype(np.int32)
+        # guard against float rounding pushing the last position onto the carried sample
+        np.minimum(indices, last_index - 1, out=indices)
+        positions -= indices
+        # positions now holds the fractional part of each output position
+        output = window[indices] * (1 - positions) + window[indices + 1] * positions
+
+        self._position += num_output_samples * step - last_index
+        self._carried_sample = float(window[last_index])
+        return np.round(output).astype(np.int16)
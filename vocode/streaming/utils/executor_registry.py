@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Tuple, TypeVar
+
+from vocode.streaming.utils.singleton import Singleton
+
+DEFAULT_EXECUTOR_MAX_WORKERS = 16
+DEFAULT_EXECUTOR_MAX_QUEUE_SIZE = 256
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExecutorStats:
+    name: str
+    max_workers: int
+    max_queue_size: int
+    num_running: int = 0
+    num_queued: int = 0
+    # callers waiting for the queue to have room
+    num_waiting: int = 0
+    max_num_queued: int = 0
+    num_completed: int = 0
+    # how many calls had to wait because the queue was full
+    num_backpressured: int = 0
+    total_queue_wait_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+
+    @property
+    def saturation(self) -> float:
+        """The fraction of the worker threads that are busy."""
+        return self.num_running / self.max_workers
+
+    @property
+    def average_queue_wait_seconds(self) -> float:
+        return self.total_queue_wait_seconds / self.num_completed if self.num_completed else 0.0
+
+
+class BoundedExecutor:
+    """A thread pool for blocking calls that bounds how much work can queue up behind it.
+
+    At most `max_workers` calls run at once and `max_queue_size` more are queued; further `run`
+    calls wait (without blocking the event loop) until there's room.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue_size: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.stats = ExecutorStats(
+            name=name, max_workers=max_workers, max_queue_size=max_queue_size
+        )
+        self._lock = threading.Lock()
+        self._num_admitted = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        await self._acquire_slot()
+        with self._lock:
+            self.stats.num_queued += 1
+            self.stats.max_num_queued = max(self.stats.max_num_queued, self.stats.num_queued)
+        try:
+            future = self.executor.submit(
+                self._run_tracked, functools.partial(fn, *args, **kwargs), time.monotonic()
+            )
+        except BaseException:
+            with self._lock:
+                self.stats.num_queued -= 1
+            self._release_slot()
+            raise
+        future.add_done_callback(self._on_done)
+        # cancelling the caller cancels the call too, if it hasn't started yet
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(**self.stats.__dict__)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_tracked(self, fn: Callable[[], T], submitted_at: float) -> T:
+        queue_wait_seconds = time.monotonic() - submitted_at
+        with self._lock:
+            self.stats.num_queued -= 1
+            self.stats.num_running += 1
+            self.stats.total_queue_wait_seconds += queue_wait_seconds
+            self.stats.max_queue_wait_seconds = max(
+                self.stats.max_queue_wait_seconds, queue_wait_seconds
+            )
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self.stats.num_running -= 1
+                self.stats.num_completed += 1
+
+    def _on_done(self, future: Future):
+        if future.cancelled():
+            with self._lock:
+                self.stats.num_queued -= 1
+        self._release_slot()
+
+    async def _acquire_slot(self):
+        with self._lock:
+            if self._num_admitted < self.max_workers + self.max_queue_size:
+                self._num_admitted += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+            self.stats.num_waiting += 1
+            self.stats.num_backpressured += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                is_waiting = (loop, waiter) in self._waiters
+                if is_waiting:
+                    self._waiters.remove((loop, waiter))
+                    self.stats.num_waiting -= 1
+            if not is_waiting:
+                # the slot was handed over to us as we were cancelled
+                self._release_slot()
+            raise
+
+    def _release_slot(self):
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                self.stats.num_waiting -= 1
+                try:
+                    # the slot is handed over, so _num_admitted stays the same
+                    loop.call_soon_threadsafe(_set_result_if_pending, waiter)
+                    return
+                except RuntimeError:
+                    # the waiter's event loop is closed
+                    continue
+            self._num_admitted -= 1
+
+
+def _set_result_if_pending(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class ExecutorRegistry(Singleton):
+    """Process-wide, named thread pools for the blocking SDK calls of synthesizers, transcribers
+    and agents, so that the number of threads doesn't grow with the number of conversations.
+
+    Pools are created on first use. Their sizes can be overridden per pool with
+    VOCODE_<NAME>_EXECUTOR_MAX_WORKERS and VOCODE_<NAME>_EXECUTOR_MAX_QUEUE_SIZE, e.g.
+    VOCODE_AZURE_SYNTHESIZER_EXECUTOR_MAX_WORKERS.
+    """
+
+    def __init__(self):
+        self.executors: Dict[str, BoundedExecutor] = {}
+        self._lock = threading.Lock()
+
+    def get_executor(
+        self,
+        name: str,
+        max_workers: int = DEFAULT_EXECUTOR_MAX_WORKERS,
+        max_queue_size: int = DEFAULT_EXECUTOR_MAX_QUEUE_SIZE,
+    ) -> BoundedExecutor:
+        """Returns the pool called `name`; the sizes only apply when it's created."""
+        with self._lock:
+            executor = self.executors.get(name)
+            if executor is None:
+                env_var_prefix = f"VOCODE_{name.upper()}_EXECUTOR"
+                executor = BoundedExecutor(
+                    name,
+                    max_workers=int(os.environ.get(f"{env_var_prefix}_MAX_WORKERS", max_workers)),
+                    max_queue_size=int(
+                        os.environ.get(f"{env_var_prefix}_MAX_QUEUE_SIZE", max_queue_size)
+                    ),
+                )
+                self.executors[name] = executor
+            return executor
+
+    def get_stats(self) -> Dict[str, ExecutorStats]:
+        with self._lock:
+            executors = list(self.executors.values())
+        return {executor.name: executor.get_stats() for executor in executors}
+
+    def shutdown(self):
+        with self._lock:
+            executors = list(self.executors.values())
+            self.executors.clear()
+        for executor in executors:
+            executor.shutdown()
@@ -0,0 +1,37 @@
+import importlib
+from typing import Any, Callable, Dict, Generic, Optional, Type, TypeVar, Union
+
+ConfigType = TypeVar("ConfigType")
+
+# "package.module:ClassName", or a function of the config that returns one, for config types that
+# are implemented by more than one class
+ClassPath = Union[str, Callable[[Any], str]]
+
+
+def import_class(class_path: str) -> Type:
+    module_name, _, class_name = class_path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class LazyClassRegistry(Generic[ConfigType]):
+    """Maps config types to the classes they configure, by import path.
+
+    A class's module, and the provider SDK it wraps, is only imported when a config of its type is
+    first used, so a process that uses one provider doesn't pay for importing the others. Configs
+    of a subclass of a registered config type use the class of the closest registered type.
+    """
+
+    def __init__(self) -> None:
+        self.class_paths: Dict[type, ClassPath] = {}
+
+    def register(self, config_type: Type[ConfigType], class_path: ClassPath):
+        self.class_paths[config_type] = class_path
+
+    def get_class(self, config: ConfigType) -> Optional[Type]:
+        for config_type in type(config).__mro__:
+            class_path = self.class_paths.get(config_type)
+            if class_path is not None:
+                if callable(class_path):
+                    class_path = class_path(config)
+                return import_class(class_path)
+        return None
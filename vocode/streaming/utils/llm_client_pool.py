@@ -0,0 +1,133 @@
+import asyncio
+import importlib.util
+import os
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, MutableMapping, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from vocode.streaming.utils.singleton import Singleton
+
+DEFAULT_LLM_HTTP_MAX_CONNECTIONS = 100
+DEFAULT_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+# long enough that consecutive turns, and consecutive calls, find the connection warm
+DEFAULT_LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+# base URL, API key and API version
+HTTPClientKey = Tuple[str, str, Optional[str]]
+
+
+@dataclass
+class LLMClientPoolStats:
+    num_clients: int = 0
+    num_client_reuses: int = 0
+    num_requests: int = 0
+    # requests that couldn't reuse a keep-alive connection
+    num_connections_opened: int = 0
+    num_tls_handshakes: int = 0
+
+
+class LLMClientPool(Singleton):
+    """Shares HTTP connection pools between the LLM clients of every conversation in the process.
+
+    The OpenAI, Anthropic and Groq SDKs each create their own httpx client, so every agent paid for
+    DNS, TCP and TLS on its first request. Agents instead pass the client returned by
+    `get_http_client` to their SDK client, and requests with the same base URL, API key and API
+    version share one pool of keep-alive connections.
+
+    The pool is sized with VOCODE_LLM_HTTP_MAX_CONNECTIONS, VOCODE_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS
+    and VOCODE_LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS. Setting VOCODE_LLM_HTTP2 multiplexes requests
+    over HTTP/2 connections, if h2 is installed (`pip install httpx[http2]`).
+
+    httpx connections belong to the event loop they were opened on, so each loop has its own
+    clients.
+    """
+
+    def __init__(self):
+        self.limits = httpx.Limits(
+            max_connections=int(
+                os.environ.get("VOCODE_LLM_HTTP_MAX_CONNECTIONS", DEFAULT_LLM_HTTP_MAX_CONNECTIONS)
+            ),
+            max_keepalive_connections=int(
+                os.environ.get(
+                    "VOCODE_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+                    DEFAULT_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                )
+            ),
+            keepalive_expiry=float(
+                os.environ.get(
+                    "VOCODE_LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS",
+                    DEFAULT_LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                )
+            ),
+        )
+        self.http2 = os.environ.get("VOCODE_LLM_HTTP2", "").lower() in ("1", "true")
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("VOCODE_LLM_HTTP2 is set but h2 isn't installed, using HTTP/1.1")
+            self.http2 = False
+        self.http_clients_by_loop: MutableMapping[
+            asyncio.AbstractEventLoop, Dict[HTTPClientKey, httpx.AsyncClient]
+        ] = weakref.WeakKeyDictionary()
+        # for clients created outside of an event loop
+        self.http_clients_without_loop: Dict[HTTPClientKey, httpx.AsyncClient] = {}
+        self.stats = LLMClientPoolStats()
+
+    def _get_http_clients(self) -> Dict[HTTPClientKey, httpx.AsyncClient]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self.http_clients_without_loop
+        return self.http_clients_by_loop.setdefault(loop, {})
+
+    def get_http_client(
+        self, base_url: str, api_key: Optional[str], api_version: Optional[str] = None
+    ) -> httpx.AsyncClient:
+        http_clients = self._get_http_clients()
+        key = (base_url.rstrip("/"), api_key or "", api_version)
+        http_client = http_clients.get(key)
+        if http_client is None or http_client.is_closed:
+            http_client = http_clients[key] = httpx.AsyncClient(
+                limits=self.limits,
+                http2=self.http2,
+                follow_redirects=True,
+                event_hooks={"request": [self._on_request]},
+            )
+            self.stats.num_clients += 1
+        else:
+            self.stats.num_client_reuses += 1
+        return http_client
+
+    async def prewarm(
+        self, base_url: str, api_key: Optional[str], api_version: Optional[str] = None
+    ):
+        """Opens a connection to `base_url` ahead of the first request, e.g. while a call is
+        ringing. Any response will do, so the request isn't authenticated."""
+        http_client = self.get_http_client(base_url, api_key, api_version)
+        try:
+            await http_client.head(base_url)
+        except httpx.HTTPError as e:
+            logger.warning(f"Error prewarming LLM connection to {base_url}: {e}")
+
+    async def _on_request(self, request: httpx.Request):
+        self.stats.num_requests += 1
+        # httpcore reports when it opens connections through the trace extension
+        if "trace" not in request.extensions:
+            request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.num_connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.stats.num_tls_handshakes += 1
+
+    def get_stats(self) -> LLMClientPoolStats:
+        return self.stats
+
+    async def close(self):
+        """Closes the clients of the running event loop, e.g. when the server shuts down."""
+        http_clients = self._get_http_clients()
+        for http_client in http_clients.values():
+            await http_client.aclose()
+        http_clients.clear()
@@ -1,5 +1,8 @@
+import array
 import io
+import threading
 import wave
+from typing import Generator, NamedTuple, Optional, Union
 
 import miniaudio
 
@@ -19,3 +22,199 @@ def decode_mp3(mp3_bytes: bytes) -> io.BytesIO:
         wave_obj.writeframes(wav_chunk.samples)
     output_bytes_io.seek(0)
     return output_bytes_io
+
+
+class MP3FrameHeader(NamedTuple):
+    frame_length: int
+    sample_rate: int
+    samples_per_frame: int
+
+
+_MPEG1_LAYER3_BITRATES_KBPS = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_MPEG2_LAYER3_BITRATES_KBPS = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+_MPEG1_SAMPLE_RATES = (44100, 48000, 32000)
+_ID3V2_HEADER_LENGTH = 10
+
+
+def parse_mp3_frame_header(
+    data: Union[bytes, bytearray], offset: int = 0
+) -> Optional[MP3FrameHeader]:
+    """Parses the MPEG audio layer III frame header at `offset`, or returns None if there isn't one.
+
+    Free-format streams (no bitrate in the header) aren't supported.
+    """
+    if len(data) - offset < 4 or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    version_bits = (data[offset + 1] >> 3) & 0x03
+    layer_bits = (data[offset + 1] >> 1) & 0x03
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 0x03
+    # version 0b01 is reserved, layer 0b01 is layer III
+    if version_bits == 0b01 or layer_bits != 0b01:
+        return None
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    padding = (data[offset + 2] >> 1) & 0x01
+    if version_bits == 0b11:
+        bitrate = _MPEG1_LAYER3_BITRATES_KBPS[bitrate_index] * 1000
+        sample_rate = _MPEG1_SAMPLE_RATES[sample_rate_index]
+        samples_per_frame = 1152
+    else:
+        bitrate = _MPEG2_LAYER3_BITRATES_KBPS[bitrate_index] * 1000
+        # MPEG 2 halves the sample rate, MPEG 2.5 quarters it
+        sample_rate = _MPEG1_SAMPLE_RATES[sample_rate_index] // (2 if version_bits == 0b10 else 4)
+        samples_per_frame = 576
+    frame_length = samples_per_frame // 8 * bitrate // sample_rate + padding
+    return MP3FrameHeader(frame_length, sample_rate, samples_per_frame)
+
+
+def _get_id3v2_tag_length(header: Union[bytes, bytearray]) -> int:
+    # the tag size is a 28 bit "syncsafe" integer that excludes the header and optional footer
+    size = 0
+    for byte in header[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    has_footer = header[5] & 0x10
+    return _ID3V2_HEADER_LENGTH + size + (_ID3V2_HEADER_LENGTH if has_footer else 0)
+
+
+class _BufferedMP3Source(miniaudio.StreamableSource):
+    def __init__(self, decoder: "IncrementalMP3Decoder"):
+        self.decoder = decoder
+
+    def read(self, num_bytes: int) -> Union[bytes, memoryview]:
+        with self.decoder._lock:
+            data = bytes(self.decoder._pending[:num_bytes])
+            del self.decoder._pending[:num_bytes]
+        return data
+
+
+class IncrementalMP3Decoder:
+    """Incrementally decodes an MP3 stream into mono LINEAR16 PCM at `output_sample_rate`, keeping
+    its frame and resampler state across chunks, so every MP3 byte is decoded and resampled once.
+
+    miniaudio pulls its input and takes an empty read as the end of the stream, so a pull-based
+    decoder has to block its thread until more MP3 arrives. Instead, this parses frame headers as
+    chunks are fed in and only asks miniaudio for as much audio as the complete frames received so
+    far can produce, holding back `lookahead_frames` frames that the decoder may read ahead into.
+    So `decode_available` never waits for input.
+
+    `feed` and `end` may be called from another thread than `decode_available`, but
+    `decode_available` itself must not be called concurrently.
+    """
+
+    # the most frames miniaudio's stream generator can return at once
+    MAX_FRAMES_PER_READ = 16384
+
+    def __init__(self, output_sample_rate: int, lookahead_frames: int = 3):
+        self.output_sample_rate = output_sample_rate
+        self.lookahead_frames = lookahead_frames
+        self.ended = False
+        self.finished = False
+        self._lock = threading.Lock()
+        # MP3 bytes that the decoder hasn't read yet
+        self._pending = bytearray()
+        # MP3 bytes that haven't been parsed into complete frames yet
+        self._unparsed = bytearray()
+        self._bytes_to_skip = 0
+        self._num_frames = 0
+        self._input_sample_rate: Optional[int] = None
+        self._samples_per_frame = 0
+        self._num_output_frames = 0
+        self._frames: Optional[Generator[array.array, int, None]] = None
+
+    def feed(self, chunk: bytes):
+        with self._lock:
+            self._pending += chunk
+            self._unparsed += chunk
+            self._parse_frames()
+
+    def end(self):
+        with self._lock:
+            self.ended = True
+
+    def num_decodable_frames(self) -> int:
+        """The number of output frames that can be decoded without waiting for more input."""
+        with self._lock:
+            return self._num_decodable_frames()
+
+    def decode_available(self) -> bytes:
+        """Decodes as much LINEAR16 audio as the MP3 received so far allows."""
+        output = bytearray()
+        while not self.finished:
+            with self._lock:
+                num_frames = self._num_decodable_frames()
+                is_empty = self._num_frames == 0 and not self._pending
+            if num_frames <= 0:
+                break
+            if self._frames is None:
+                if is_empty:
+                    # the stream ended without any audio
+                    self.finished = True
+                    break
+                self._frames = miniaudio.stream_any(
+                    _BufferedMP3Source(self),
+                    source_format=miniaudio.FileFormat.MP3,
+                    output_format=miniaudio.SampleFormat.SIGNED16,
+                    nchannels=1,
+                    sample_rate=self.output_sample_rate,
+                )
+            try:
+                samples = self._frames.send(min(num_frames, self.MAX_FRAMES_PER_READ))
+            except StopIteration:
+                self.finished = True
+                break
+            self._num_output_frames += len(samples)
+            output += samples.tobytes()
+        return bytes(output)
+
+    def _num_decodable_frames(self) -> int:
+        if self.ended:
+            return self.MAX_FRAMES_PER_READ
+        if self._input_sample_rate is None:
+            return 0
+        num_safe_input_frames = (self._num_frames - self.lookahead_frames) * self._samples_per_frame
+        if num_safe_input_frames <= 0:
+            return 0
+        return (
+            num_safe_input_frames * self.output_sample_rate // self._input_sample_rate
+            - self._num_output_frames
+        )
+
+    def _parse_frames(self):
+        data = self._unparsed
+        offset = 0
+        while True:
+            if self._bytes_to_skip:
+                num_skipped = min(self._bytes_to_skip, len(data) - offset)
+                offset += num_skipped
+                self._bytes_to_skip -= num_skipped
+                if self._bytes_to_skip:
+                    break
+            if len(data) - offset < 4:
+                break
+            if self._input_sample_rate is None and data.startswith(b"ID3", offset):
+                if len(data) - offset < _ID3V2_HEADER_LENGTH:
+                    break
+                self._bytes_to_skip = _get_id3v2_tag_length(
+                    data[offset : offset + _ID3V2_HEADER_LENGTH]
+                )
+                continue
+            header = parse_mp3_frame_header(data, offset)
+            if header is None:
+                # resynchronize on the next possible frame header
+                next_sync = data.find(b"\xff", offset + 1)
+                offset = len(data) if next_sync == -1 else next_sync
+                continue
+            if len(data) - offset < header.frame_length:
+                break
+            if self._input_sample_rate is None:
+                self._input_sample_rate = header.sample_rate
+                self._samples_per_frame = header.samples_per_frame
+                # a leading Xing/Info frame only holds stream metadata
+                frame = data[offset : offset + header.frame_length]
+                if b"Xing" in frame or b"Info" in frame:
+                    offset += header.frame_length
+                    continue
+            self._num_frames += 1
+            offset += header.frame_length
+        del data[:offset]
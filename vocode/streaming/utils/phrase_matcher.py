@@ -0,0 +1,181 @@
+import re
+from collections import deque
+from enum import Enum
+from typing import Dict, Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+PhraseValue = TypeVar("PhraseValue")
+
+_PUNCTUATION_REGEX = re.compile(r"[^\w\s]")
+
+# below this many phrases, checking the phrases one by one with `in` is faster than walking the
+# automaton one character at a time in Python
+MIN_PHRASES_FOR_AUTOMATON = 16
+
+
+def remove_punctuation(text: str) -> str:
+    return _PUNCTUATION_REGEX.sub("", text)
+
+
+class PhraseMatchType(str, Enum):
+    # the phrase appears anywhere in the text
+    CONTAINS = "contains"
+    # the phrase appears in the text and isn't part of a longer word
+    WORD_BOUNDARY = "word_boundary"
+    # the phrase is the whole text
+    EXACT = "exact"
+
+
+class AhoCorasickAutomaton:
+    """Finds every occurrence of any number of phrases in one pass over the text."""
+
+    def __init__(self, phrases: Sequence[str]):
+        self.transitions: List[Dict[str, int]] = [{}]
+        # the (phrase index, phrase length) of every phrase that ends in each state, including
+        # the phrases of its failure states, sorted by phrase index
+        self.outputs: List[List[Tuple[int, int]]] = [[]]
+        for idx, phrase in enumerate(phrases):
+            state = 0
+            for char in phrase:
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions[state][char] = next_state
+                    self.transitions.append({})
+                    self.outputs.append([])
+                state = next_state
+            self.outputs[state].append((idx, len(phrase)))
+
+        self.failures = [0] * len(self.transitions)
+        states = deque(self.transitions[0].values())
+        while states:
+            state = states.popleft()
+            for char, next_state in self.transitions[state].items():
+                failure = self.failures[state]
+                while failure and char not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                failure = self.transitions[failure].get(char, 0)
+                self.failures[next_state] = failure if failure != next_state else 0
+                # states are visited breadth-first, so the outputs of the failure state are done
+                self.outputs[next_state] = sorted(
+                    self.outputs[next_state] + self.outputs[self.failures[next_state]]
+                )
+                states.append(next_state)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, List[Tuple[int, int]]]]:
+        """Yields the end index of every match, with the outputs of the phrases that end there."""
+        transitions = self.transitions
+        failures = self.failures
+        outputs = self.outputs
+        state = 0
+        for end, char in enumerate(text):
+            state_transitions = transitions[state]
+            while state and char not in state_transitions:
+                state = failures[state]
+                state_transitions = transitions[state]
+            state = state_transitions.get(char, 0)
+            if outputs[state]:
+                yield end, outputs[state]
+
+
+class PhraseMatcher(Generic[PhraseValue]):
+    """Matches text against any number of phrases; built once and reused for every text.
+
+    When several phrases match, the value of the phrase that comes first in `phrases` wins,
+    wherever in the text the phrases are. Many literal phrases are found with an Aho-Corasick
+    automaton, in one pass over the text however many phrases there are, and regex phrases are
+    precompiled.
+    """
+
+    def __init__(
+        self,
+        phrases: Sequence[Tuple[str, PhraseValue]],
+        match_type: PhraseMatchType = PhraseMatchType.CONTAINS,
+        is_regex: bool = False,
+    ):
+        self.match_type = match_type
+        self.phrases = [phrase for phrase, _ in phrases]
+        self.values: List[PhraseValue] = [value for _, value in phrases]
+
+        self.exact_indices: Dict[str, int] = {}
+        self.exact_regex: Optional[re.Pattern] = None
+        self.phrase_indices_by_group: Dict[int, int] = {}
+        self.regexes: List[re.Pattern] = []
+        self.automaton: Optional[AhoCorasickAutomaton] = None
+        if match_type == PhraseMatchType.EXACT:
+            if is_regex:
+                self._compile_exact_regex()
+            else:
+                for idx, phrase in enumerate(self.phrases):
+                    self.exact_indices.setdefault(phrase, idx)
+        elif (
+            not is_regex
+            and len(self.phrases) >= MIN_PHRASES_FOR_AUTOMATON
+            # the automaton only reports phrases that end at some character
+            and all(self.phrases)
+        ):
+            self.automaton = AhoCorasickAutomaton(self.phrases)
+        elif is_regex or match_type == PhraseMatchType.WORD_BOUNDARY:
+            patterns = self.phrases if is_regex else [re.escape(phrase) for phrase in self.phrases]
+            if match_type == PhraseMatchType.WORD_BOUNDARY:
+                patterns = [rf"(?<!\w)(?:{pattern})(?!\w)" for pattern in patterns]
+            self.regexes = [re.compile(pattern) for pattern in patterns]
+
+    def _compile_exact_regex(self):
+        if not self.phrases:
+            return
+        # each phrase is its own group in one alternation, and the group that matched tells which
+        # phrase it was; phrases can have groups of their own, which shift the numbers of the
+        # groups after them
+        group_number = 1
+        for idx, phrase in enumerate(self.phrases):
+            self.phrase_indices_by_group[group_number] = idx
+            group_number += 1 + re.compile(phrase).groups
+        self.exact_regex = re.compile("|".join(f"({phrase})" for phrase in self.phrases))
+
+    def _search_index(self, text: str, stop_at_first_match: bool) -> Optional[int]:
+        if self.match_type == PhraseMatchType.EXACT:
+            if self.exact_regex is not None:
+                match = self.exact_regex.fullmatch(text)
+                # every phrase is a group, so a match always has a last group
+                if match is None or match.lastindex is None:
+                    return None
+                return self.phrase_indices_by_group[match.lastindex]
+            return self.exact_indices.get(text)
+        if self.automaton is not None:
+            return self._search_index_with_automaton(self.automaton, text, stop_at_first_match)
+        if self.regexes:
+            return next((idx for idx, regex in enumerate(self.regexes) if regex.search(text)), None)
+        return next((idx for idx, phrase in enumerate(self.phrases) if phrase in text), None)
+
+    def _search_index_with_automaton(
+        self, automaton: AhoCorasickAutomaton, text: str, stop_at_first_match: bool
+    ) -> Optional[int]:
+        first_index: Optional[int] = None
+        for end, outputs in automaton.iter_matches(text):
+            for idx, length in outputs:
+                if first_index is not None and idx >= first_index:
+                    break
+                if self.match_type == PhraseMatchType.WORD_BOUNDARY and (
+                    _is_word_char_at(text, end - length) or _is_word_char_at(text, end + 1)
+                ):
+                    continue
+                first_index = idx
+                break
+            if first_index == 0 or (first_index is not None and stop_at_first_match):
+                break
+        return first_index
+
+    def matches(self, text: str) -> bool:
+        return self._search_index(text, stop_at_first_match=True) is not None
+
+    def search(self, text: str) -> Optional[PhraseValue]:
+        """Returns the value of the first phrase in `phrases` that matches the text."""
+        idx = self._search_index(text, stop_at_first_match=False)
+        return self.values[idx] if idx is not None else None
+
+
+def _is_word_char_at(text: str, idx: int) -> bool:
+    """Like `\\w` for the character at `idx`, if there is one."""
+    if idx < 0 or idx >= len(text):
+        return False
+    return text[idx].isalnum() or text[idx] == "_"
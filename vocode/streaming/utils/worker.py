@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import asyncio
 import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+from typing import Any, Dict, Generic, Optional, TypeVar
 
 import janus
 from loguru import logger
@@ -129,6 +130,89 @@ class AsyncQueueWorker(AsyncWorker[WorkerInputType]):
 Payload = TypeVar("Payload")
 
 
+class InterruptEpoch:
+    """Counts the conversation's interrupts, so broadcast_interrupt doesn't have to visit every
+    event it interrupts.
+
+    Each event created by the conversation gets an EpochInterruptionEvent stamped with the epoch
+    it was created in. `advance` starts a new epoch, which interrupts every event of the earlier
+    ones that was still interruptible at the time, in O(1): see EpochInterruptionEvent.is_set.
+    """
+
+    def __init__(self):
+        self.value = 0
+        # created in this epoch, still interruptible and not interrupted yet
+        self.num_interruptible_events = 0
+        # of the agent responses created in this epoch, tracked weakly since nothing else waits
+        # on a tracker that's been garbage collected
+        self.agent_response_trackers: weakref.WeakSet[asyncio.Event] = weakref.WeakSet()
+
+    def create_interruption_event(self, is_interruptible: bool) -> EpochInterruptionEvent:
+        if is_interruptible:
+            self.num_interruptible_events += 1
+        return EpochInterruptionEvent(self, is_interruptible)
+
+    def track_agent_response(self, agent_response_tracker: asyncio.Event):
+        self.agent_response_trackers.add(agent_response_tracker)
+
+    def advance(self) -> bool:
+        """Interrupts every event created so far. Returns True if any of them was interruptible
+        and not interrupted yet."""
+        interrupted_any = self.num_interruptible_events > 0
+        self.value += 1
+        self.num_interruptible_events = 0
+        # like interrupt(), which sets the tracker whether or not the event is interruptible
+        agent_response_trackers = self.agent_response_trackers
+        self.agent_response_trackers = weakref.WeakSet()
+        for agent_response_tracker in agent_response_trackers:
+            agent_response_tracker.set()
+        return interrupted_any
+
+
+class EpochInterruptionEvent(threading.Event):
+    """The interruption event of an event created in an InterruptEpoch.
+
+    It counts as set once the epoch it was created in has ended, unless its event had become
+    uninterruptible by then. Output chunks share the interruption event of the message they were
+    synthesized from, so only that event can mark it uninterruptible. Like the other interruption
+    events, it's meant to be polled: `wait` doesn't see epochs ending.
+    """
+
+    def __init__(self, interrupt_epoch: InterruptEpoch, is_interruptible: bool):
+        super().__init__()
+        self.interrupt_epoch = interrupt_epoch
+        self.epoch = interrupt_epoch.value
+        self.uninterruptible_since: Optional[int] = None if is_interruptible else self.epoch
+        self.has_owner = False
+
+    def _is_pending(self) -> bool:
+        return (
+            self.interrupt_epoch.value == self.epoch
+            and self.uninterruptible_since is None
+            and not super().is_set()
+        )
+
+    def mark_uninterruptible(self):
+        if self.uninterruptible_since is not None:
+            return
+        if self._is_pending():
+            self.interrupt_epoch.num_interruptible_events -= 1
+        self.uninterruptible_since = self.interrupt_epoch.value
+
+    def set(self):
+        if self._is_pending():
+            self.interrupt_epoch.num_interruptible_events -= 1
+        super().set()
+
+    def is_set(self) -> bool:
+        if super().is_set():
+            return True
+        # interrupted by the end of its epoch if it was still interruptible then
+        return self.interrupt_epoch.value > self.epoch and (
+            self.uninterruptible_since is None or self.uninterruptible_since > self.epoch
+        )
+
+
 class InterruptibleEvent(Generic[Payload]):
     def __init__(
         self,
@@ -137,9 +221,31 @@ class InterruptibleEvent(Generic[Payload]):
         interruption_event: Optional[threading.Event] = None,
     ):
         self.interruption_event = interruption_event or threading.Event()
-        self.is_interruptible = is_interruptible
+        self._is_interruptible = is_interruptible
+        # events that share an interruption event, e.g. output chunks, don't own it
+        self.owns_interruption_event = False
+        if (
+            isinstance(self.interruption_event, EpochInterruptionEvent)
+            and not self.interruption_event.has_owner
+        ):
+            self.interruption_event.has_owner = True
+            self.owns_interruption_event = True
         self.payload = payload
 
+    @property
+    def is_interruptible(self) -> bool:
+        return self._is_interruptible
+
+    @is_interruptible.setter
+    def is_interruptible(self, is_interruptible: bool):
+        if (
+            not is_interruptible
+            and self.owns_interruption_event
+            and isinstance(self.interruption_event, EpochInterruptionEvent)
+        ):
+            self.interruption_event.mark_uninterruptible()
+        self._is_interruptible = is_interruptible
+
     def interrupt(self) -> bool:
         """
         Returns True if the event was interruptible and is now interrupted.
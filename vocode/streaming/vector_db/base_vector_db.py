@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, Union
 
@@ -5,6 +6,7 @@ import aiohttp
 from openai import AsyncAzureOpenAI, AsyncOpenAI
 
 from vocode.streaming.models.agent import AZURE_OPENAI_DEFAULT_API_VERSION
+from vocode.streaming.vector_db.embeddings import EmbeddingBatcher, EmbeddingCache
 
 if TYPE_CHECKING:
     from langchain.docstore.document import Document
@@ -44,13 +46,38 @@ class VectorDB:
     async def create_openai_embedding(
         self, text, model=DEFAULT_OPENAI_EMBEDDING_MODEL
     ) -> List[float]:
-        params = {
-            "input": text,
-        }
+        return (await self.create_openai_embeddings([text], model=model))[0]
 
-        params["model"] = self.engine if self.engine else model
-
-        return (await self.openai_client.embeddings.create(**params)).data[0].embedding
+    async def create_openai_embeddings(
+        self, texts: List[str], model=DEFAULT_OPENAI_EMBEDDING_MODEL
+    ) -> List[List[float]]:
+        """Embeds the texts that aren't cached, batched with the concurrent embedding requests of
+        every other conversation."""
+        model = self.engine if self.engine else model
+        embedding_cache = EmbeddingCache()
+        embeddings = await embedding_cache.get_embeddings(model, texts)
+        missing_texts = list(
+            dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None)
+        )
+        if missing_texts:
+            embedding_batcher = EmbeddingBatcher()
+            created_embeddings = dict(
+                zip(
+                    missing_texts,
+                    await asyncio.gather(
+                        *(
+                            embedding_batcher.create_embedding(self.openai_client, model, text)
+                            for text in missing_texts
+                        )
+                    ),
+                )
+            )
+            await embedding_cache.set_embeddings(model, created_embeddings)
+            embeddings = [
+                embedding if embedding is not None else created_embeddings[text]
+                for text, embedding in zip(texts, embeddings)
+            ]
+        return [embedding for embedding in embeddings if embedding is not None]
 
     async def add_texts(
         self,
@@ -0,0 +1,228 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from loguru import logger
+from openai import AsyncAzureOpenAI, AsyncOpenAI
+
+from vocode.streaming.utils.create_task import asyncio_create_task
+from vocode.streaming.utils.redis import initialize_redis_bytes
+from vocode.streaming.utils.singleton import Singleton
+
+DEFAULT_LOCAL_EMBEDDING_CACHE_MAX_ENTRIES = 10000
+DEFAULT_EMBEDDING_CACHE_REDIS_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_EMBEDDING_BATCH_WINDOW_SECONDS = 0.005
+DEFAULT_EMBEDDING_MAX_BATCH_SIZE = 256
+
+Embedding = List[float]
+
+
+@dataclass
+class EmbeddingCacheStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class LocalEmbeddingCache:
+    """In-process LRU cache of embeddings, bounded by the number of cached embeddings."""
+
+    def __init__(self, max_entries: int = DEFAULT_LOCAL_EMBEDDING_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.entries: OrderedDict[str, Embedding] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Embedding]:
+        embedding = self.entries.get(key)
+        if embedding is not None:
+            self.entries.move_to_end(key)
+        return embedding
+
+    def set(self, key: str, embedding: Embedding):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = embedding
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+class EmbeddingCache(Singleton):
+    """Caches embeddings by model and a hash of the text, in process and optionally in Redis.
+
+    Short utterances like "yes" or "what's your name?" come up in every call, and the same text
+    always gets the same embedding from the same model. The local tier is sized with
+    VOCODE_LOCAL_EMBEDDING_CACHE_MAX_ENTRIES; setting VOCODE_EMBEDDING_CACHE_USE_REDIS shares
+    embeddings between processes through Redis, for VOCODE_EMBEDDING_CACHE_REDIS_TTL_SECONDS.
+    """
+
+    def __init__(self):
+        self.local_cache = LocalEmbeddingCache(
+            max_entries=int(
+                os.environ.get(
+                    "VOCODE_LOCAL_EMBEDDING_CACHE_MAX_ENTRIES",
+                    DEFAULT_LOCAL_EMBEDDING_CACHE_MAX_ENTRIES,
+                )
+            )
+        )
+        self.redis = (
+            initialize_redis_bytes()
+            if os.environ.get("VOCODE_EMBEDDING_CACHE_USE_REDIS", "").lower() in ("1", "true")
+            else None
+        )
+        self.redis_ttl_seconds = int(
+            os.environ.get(
+                "VOCODE_EMBEDDING_CACHE_REDIS_TTL_SECONDS",
+                DEFAULT_EMBEDDING_CACHE_REDIS_TTL_SECONDS,
+            )
+        )
+        self.stats = EmbeddingCacheStats()
+
+    def get_embedding_key(self, model: str, text: str) -> str:
+        return f"embedding_cache:{model}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+    def get_stats(self) -> EmbeddingCacheStats:
+        self.stats.evictions = self.local_cache.evictions
+        return self.stats
+
+    async def get_embeddings(self, model: str, texts: Sequence[str]) -> List[Optional[Embedding]]:
+        keys = [self.get_embedding_key(model, text) for text in texts]
+        embeddings = [self.local_cache.get(key) for key in keys]
+        missing_indices = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        self.stats.local_hits += len(texts) - len(missing_indices)
+        if missing_indices and self.redis is not None:
+            try:
+                values = await self.redis.mget([keys[idx] for idx in missing_indices])
+            except Exception as e:
+                # the cache is an optimization, so a Redis outage only costs the embedding requests
+                logger.warning(f"Error reading embeddings from Redis: {e}")
+                values = [None] * len(missing_indices)
+            for idx, value in zip(missing_indices, values):
+                if value is not None:
+                    embedding = np.frombuffer(value, dtype=np.float32).tolist()
+                    embeddings[idx] = embedding
+                    self.local_cache.set(keys[idx], embedding)
+                    self.stats.redis_hits += 1
+        self.stats.misses += sum(embedding is None for embedding in embeddings)
+        return embeddings
+
+    async def set_embeddings(self, model: str, embeddings_by_text: Dict[str, Embedding]):
+        if not embeddings_by_text:
+            return
+        keys_and_embeddings = [
+            (self.get_embedding_key(model, text), embedding)
+            for text, embedding in embeddings_by_text.items()
+        ]
+        for key, embedding in keys_and_embeddings:
+            self.local_cache.set(key, embedding)
+        if self.redis is None:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipeline:
+                for key, embedding in keys_and_embeddings:
+                    pipeline.set(
+                        key,
+                        np.asarray(embedding, dtype=np.float32).tobytes(),
+                        ex=self.redis_ttl_seconds,
+                    )
+                await pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Error writing embeddings to Redis: {e}")
+
+
+@dataclass
+class EmbeddingBatcherStats:
+    num_requests: int = 0
+    num_embedded_texts: int = 0
+    # texts that were already in a pending batch
+    num_coalesced_texts: int = 0
+
+
+@dataclass
+class _EmbeddingBatch:
+    openai_client: Union[AsyncOpenAI, AsyncAzureOpenAI]
+    model: str
+    futures_by_text: Dict[str, asyncio.Future] = field(default_factory=dict)
+    timer_task: Optional[asyncio.Task] = None
+
+
+class EmbeddingBatcher(Singleton):
+    """Coalesces the embedding requests of every conversation in the process into batched
+    requests.
+
+    The first text for an endpoint, API key and model opens a batch, which is sent after
+    VOCODE_EMBEDDING_BATCH_WINDOW_SECONDS or as soon as it has VOCODE_EMBEDDING_MAX_BATCH_SIZE
+    texts, with whichever conversation's client opened it. Identical texts in a batch are only
+    embedded once.
+    """
+
+    def __init__(self):
+        self.window_seconds = float(
+            os.environ.get(
+                "VOCODE_EMBEDDING_BATCH_WINDOW_SECONDS", DEFAULT_EMBEDDING_BATCH_WINDOW_SECONDS
+            )
+        )
+        self.max_batch_size = int(
+            os.environ.get("VOCODE_EMBEDDING_MAX_BATCH_SIZE", DEFAULT_EMBEDDING_MAX_BATCH_SIZE)
+        )
+        self.batches: Dict[Tuple[str, str, str], _EmbeddingBatch] = {}
+        self.stats = EmbeddingBatcherStats()
+
+    async def create_embedding(
+        self, openai_client: Union[AsyncOpenAI, AsyncAzureOpenAI], model: str, text: str
+    ) -> Embedding:
+        batch_key = (str(openai_client.base_url), openai_client.api_key, model)
+        batch = self.batches.get(batch_key)
+        if batch is None:
+            batch = self.batches[batch_key] = _EmbeddingBatch(openai_client, model)
+            batch.timer_task = asyncio_create_task(self._send_after_window(batch_key, batch))
+        future = batch.futures_by_text.get(text)
+        if future is None:
+            future = batch.futures_by_text[text] = asyncio.get_running_loop().create_future()
+            if len(batch.futures_by_text) >= self.max_batch_size:
+                self._close_batch(batch_key, batch)
+                asyncio_create_task(self._send(batch))
+        else:
+            self.stats.num_coalesced_texts += 1
+        # other conversations may be waiting for the same embedding
+        return await asyncio.shield(future)
+
+    def _close_batch(self, batch_key: Tuple[str, str, str], batch: _EmbeddingBatch):
+        if self.batches.get(batch_key) is batch:
+            del self.batches[batch_key]
+        if batch.timer_task is not None and batch.timer_task is not asyncio.current_task():
+            batch.timer_task.cancel()
+
+    async def _send_after_window(self, batch_key: Tuple[str, str, str], batch: _EmbeddingBatch):
+        await asyncio.sleep(self.window_seconds)
+        self._close_batch(batch_key, batch)
+        await self._send(batch)
+
+    async def _send(self, batch: _EmbeddingBatch):
+        texts = list(batch.futures_by_text)
+        self.stats.num_requests += 1
+        self.stats.num_embedded_texts += len(texts)
+        error: BaseException = ValueError("No embedding was returned for the text")
+        try:
+            response = await batch.openai_client.embeddings.create(input=texts, model=batch.model)
+            for data in response.data:
+                future = batch.futures_by_text[texts[data.index]]
+                if not future.done():
+                    future.set_result(data.embedding)
+        except asyncio.CancelledError as e:
+            error = e
+            raise
+        except Exception as e:
+            # raised to the callers waiting for the batch, since nothing awaits the batch's task
+            error = e
+        finally:
+            # nobody waits forever, whether the request failed or was cancelled
+            for future in batch.futures_by_text.values():
+                if not future.done():
+                    future.set_exception(error)
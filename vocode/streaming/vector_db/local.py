@@ -0,0 +1,83 @@
+import asyncio
+import uuid
+from typing import Iterable, List, Optional, Tuple
+
+from langchain.docstore.document import Document
+
+from vocode.streaming.models.vector_db import LocalVectorDBConfig
+from vocode.streaming.vector_db.base_vector_db import VectorDB
+from vocode.streaming.vector_db.local_index import get_local_vector_index
+
+
+class LocalVectorDB(VectorDB):
+    """Searches an index kept in this process instead of a remote vector database, so retrieval
+    only costs the embedding request."""
+
+    def __init__(self, config: LocalVectorDBConfig, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.config = config
+        self.index = get_local_vector_index(self.config.path)
+
+    async def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        namespace: Optional[str] = None,
+    ) -> List[str]:
+        """Embeds the texts, adds them to the index in one batch, rebuilds the IVF lists if the
+        config asks for them and saves the index.
+
+        Args:
+            texts: Iterable of strings to add to the index.
+            metadatas: Optional list of metadatas associated with the texts.
+            ids: Optional list of ids to associate with the texts.
+            namespace: Optional namespace to add the texts to.
+
+        Returns:
+            List of ids from adding the texts into the index.
+        """
+        texts = list(texts)
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        embeddings = await self.create_openai_embeddings(texts, model=self.config.embeddings_model)
+        self.index.add(embeddings, texts, ids, metadatas=metadatas, namespace=namespace or "")
+        await asyncio.to_thread(self._build_ivf_and_save)
+        return ids
+
+    def _build_ivf_and_save(self):
+        if self.config.ivf_num_lists and len(self.index) >= self.config.ivf_num_lists:
+            self.index.build_ivf(self.config.ivf_num_lists)
+        self.index.save()
+
+    async def similarity_search_with_score(
+        self,
+        query: str,
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Return the documents most similar to query, along with their cosine similarities.
+
+        Args:
+            query: Text to look up documents similar to.
+            filter: Dictionary of metadata values to filter on, see `matches_filter`
+            namespace: Namespace to search in. Default will search in '' namespace.
+
+        Returns:
+            List of Documents most similar to the query and score for each
+        """
+        embedding = await self.create_openai_embedding(query, model=self.config.embeddings_model)
+        return [
+            (
+                Document(
+                    page_content=self.index.texts[row], metadata=dict(self.index.metadatas[row])
+                ),
+                score,
+            )
+            for row, score in self.index.search(
+                embedding,
+                self.config.top_k,
+                filter=filter,
+                namespace=namespace or "",
+                num_probes=self.config.ivf_num_probes,
+            )
+        ]